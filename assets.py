@@ -0,0 +1,178 @@
+# =====================================================================
+# 🖼️ ASSETS
+# =====================================================================
+# Where the pictures live and how they get onto the canvas.
+#
+#   • ASSET_FILES maps every gif_key to a file shipped next to the
+#     scripts; paths are resolved relative to this package, so the app
+#     runs from any checkout on any machine.
+#   • Nothing is touched at import: a file is checked the first time
+#     its key is asked for, and a turtle shape is registered the first
+#     time a body uses it.
+#   • Turtle image shapes ignore shapesize(), so resized bodies need
+#     resized pictures. SpriteCache decodes and scales them with Pillow
+#     in a background thread pool, one variant per size bucket, and
+#     keeps the most recently used variants (LRU). Tk images can only
+#     be created on the main thread, so finished variants are queued
+#     and turned into shapes by poll(), called from the animation loop.
+# =====================================================================
+
+import base64
+import io
+import math
+import os
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The GIFs bundled next to the scripts, by gif_key
+ASSET_FILES = {
+    "sun": "sun-no-bg.gif",
+    "mercury": "mercury no bg.gif",
+    "venus": "venus no bg.gif",
+    "earth": "earth-no-bg.gif",
+    "mars": "mars no bg.gif",
+    "jupiter": "jupiter nobg.gif",
+    "saturn": "saturn no bg.gif",
+    "uranus": "uranus no bg.gif",
+    "neptune": "nepton no bg.gif",
+    "moon": "moon no bg.gif",
+    "background": "background.gif",
+}
+
+# Size buckets grow geometrically: scales within ~5% share one picture
+BUCKET_RATIO = 1.1
+
+_exists = {}
+
+
+def asset_path(key, asset_dir=ASSET_DIR):
+    """Absolute path of an asset, or None if the key is unknown or the file is missing"""
+    name = ASSET_FILES.get(key)
+    if name is None:
+        return None
+    path = os.path.join(asset_dir, name)
+    if path not in _exists:
+        _exists[path] = os.path.isfile(path)
+    return path if _exists[path] else None
+
+
+def size_bucket(scale):
+    """Integer bucket for a scale factor, and the scale that bucket is drawn at"""
+    bucket = round(math.log(max(scale, 1e-3), BUCKET_RATIO))
+    return bucket, BUCKET_RATIO ** bucket
+
+
+def _scaled_png(path, scale):
+    """Decode and resize a picture (runs in a worker thread); returns PNG bytes"""
+    from PIL import Image
+
+    with Image.open(path) as im:
+        im = im.convert("RGBA")
+        size = (max(1, round(im.width * scale)), max(1, round(im.height * scale)))
+        im = im.resize(size, Image.LANCZOS)
+    buf = io.BytesIO()
+    im.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+class SpriteCache:
+    """Lazily registered turtle shapes for assets, with scaled variants built off the main thread"""
+
+    def __init__(self, screen, max_variants=32, workers=2, asset_dir=ASSET_DIR):
+        self.screen = screen
+        self.asset_dir = asset_dir
+        self.max_variants = max_variants
+        self.variants = OrderedDict()     # (key, bucket) -> shape name, oldest first
+        self.users = {}                   # shape name -> bodies currently wearing it
+        self._pending = {}                # (key, bucket) -> callbacks waiting for it
+        self._done = queue.Queue()
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="sprites")
+
+    def base_shape(self, key):
+        """Shape name of the asset at its native size (registered on first use), or None"""
+        path = asset_path(key, self.asset_dir)
+        if path is None:
+            return None
+        if path not in self.screen._shapes:
+            self.screen.register_shape(path)
+        return path
+
+    def request(self, key, scale, callback):
+        """Ask for the asset drawn at scale; callback(shape_name) runs on the main thread once ready
+
+        Scale 1 (and anything in its bucket) is the native picture and
+        is answered straight away; other sizes come back via poll().
+        """
+        bucket, bucket_scale = size_bucket(scale)
+        if bucket == 0:
+            callback(self.base_shape(key))
+            return
+        name = self.variants.get((key, bucket))
+        if name is not None:
+            self.variants.move_to_end((key, bucket))
+            callback(name)
+            return
+        path = asset_path(key, self.asset_dir)
+        if path is None:
+            callback(None)
+            return
+        waiting = self._pending.setdefault((key, bucket), [])
+        waiting.append(callback)
+        if len(waiting) == 1:
+            future = self._pool.submit(_scaled_png, path, bucket_scale)
+            future.add_done_callback(lambda f, k=(key, bucket): self._done.put((k, f)))
+
+    def poll(self):
+        """Turn finished variants into shapes and call their waiters (main thread only)
+
+        Returns how many variants arrived, so the caller knows to redraw.
+        """
+        import tkinter as tk
+        import turtle
+
+        arrived = 0
+        while True:
+            try:
+                (key, bucket), future = self._done.get_nowait()
+            except queue.Empty:
+                return arrived
+            arrived += 1
+            callbacks = self._pending.pop((key, bucket), [])
+            try:
+                data = base64.b64encode(future.result()).decode("ascii")
+            except Exception as e:
+                print(f"⚠️ Could not scale {key}: {e}")
+                for callback in callbacks:
+                    callback(self.base_shape(key))
+                continue
+            name = f"{key}@{bucket}"
+            self.screen.register_shape(name, turtle.Shape("image", tk.PhotoImage(data=data)))
+            self.variants[(key, bucket)] = name
+            self._evict()
+            for callback in callbacks:
+                callback(name)
+
+    def wear(self, new, old=None):
+        """Record that a body switched from shape old to shape new (keeps worn shapes from eviction)"""
+        if old is not None and old in self.users:
+            self.users[old] -= 1
+        if new is not None:
+            self.users[new] = self.users.get(new, 0) + 1
+
+    def _evict(self):
+        # Drop the least recently used variants nobody is wearing
+        for entry in list(self.variants):
+            if len(self.variants) <= self.max_variants:
+                break
+            name = self.variants[entry]
+            if self.users.get(name, 0) > 0:
+                continue
+            del self.variants[entry]
+            self.users.pop(name, None)
+            self.screen._shapes.pop(name, None)
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,293 @@
+# =====================================================================
+# 📊 BENCHMARKS
+# =====================================================================
+# Runs the animation loop without user input for a fixed number of
+# ticks and reports where the frame time goes, so changes to moving
+# bodies, trails, labels or stars can be compared across commits.
+#
+#   • Sweeps body counts (the solar system plus an asteroid belt) with
+#     trails and labels switched on and off.
+#   • Times every phase of a frame separately: physics, trails, labels,
+#     bodies, stars, and the Tk update (or the Pillow render).
+#   • Reports p50/p99 frame times and the peak resident memory of a
+#     fresh process running the same configuration (POSIX only), and
+#     writes everything to a JSON file; --compare prints the change
+#     against an older results file.
+#
+# Backends: "tk" runs solarSystem1's own frame path (step_physics(),
+# render_frame() and the Tk update, with the app's stage timings) on a
+# real window (needs a display; use xvfb-run on CI); "pillow" renders
+# with offscreen_render instead. "auto" picks tk when a display is
+# available. Belt bodies are unnamed dots without trails, as in the app.
+#
+#   python benchmark.py --ticks 300 --out bench.json
+#   python benchmark.py --compare bench.json
+# =====================================================================
+
+import gc
+import json
+import platform
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+try:
+    import resource           # peak RSS; not on Windows
+except ImportError:
+    resource = None
+
+from assets import ASSET_DIR
+from offscreen_render import SceneRenderer
+from orbit_engine import OrbitEngine, add_asteroid_belt
+from perf_hud import FrameStats
+from sim_clock import SimulationClock
+from solar_data import SOLAR_BODIES, planet_info
+from trails import TrailBuffer
+
+BODY_COUNTS = (len(SOLAR_BODIES), 100, 1000, 10000)
+TWINKLE_EVERY = 20        # the app twinkles every 300 ms, i.e. every 20th 15 ms tick
+TRAIL_POINTS = 533        # 8 s of trail, as in the app
+
+
+# Like the app's belt and catalogue bodies: no name, so no label, and no trail
+ASTEROID_SPEC = {"name": None, "gif_key": None, "size": 0.05, "color": "gray", "size_label": None, "trail": False}
+
+
+def build_scene(bodies, seed=1):
+    """Engine and body specs for a scene with the given number of bodies (at least the solar system)"""
+    engine = OrbitEngine.from_specs(SOLAR_BODIES, info=planet_info)
+    extra = max(0, bodies - engine.count)
+    if extra:
+        add_asteroid_belt(engine, extra, seed=seed)
+    return engine, list(SOLAR_BODIES) + [ASTEROID_SPEC] * extra
+
+
+def summary(stats):
+    """Mean per-stage and frame-time percentiles (ms) of the frames in a FrameStats"""
+    count = min(stats.count, stats.window)
+    frame_ms = stats.frame_times[:count] * 1000
+    return {
+        "phases_ms": {name: float(buf[:count].mean() * 1000) for name, buf in sorted(stats.stages.items())},
+        "frame_ms": {
+            "mean": float(frame_ms.mean()),
+            "p50": float(np.percentile(frame_ms, 50)),
+            "p99": float(np.percentile(frame_ms, 99)),
+            "max": float(frame_ms.max()),
+        },
+    }
+
+
+class _Ticks:
+    """Time source for the app's SimulationClock: one physics step per frame, exactly"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TkBackend:
+    """solarSystem1's real frame path: its scene, step_physics(), render_frame() and the Tk update"""
+
+    name = "tk"
+
+    def __init__(self, bodies, trails, labels, ticks):
+        import solarSystem1 as app
+
+        self.app = app
+        if app.win is not None:
+            app.win.clearscreen()       # the previous case's turtles and canvas items
+        app.check_assets()
+        app.setup_window()
+        app.BELT_BODIES = max(0, bodies - len(SOLAR_BODIES))
+        app.build_scene()
+        app.setup_stars()
+        app.perf = FrameStats(window=ticks)
+        self.ticks = _Ticks()
+        app.clock = SimulationClock(step=1.0, time_source=self.ticks)
+        app.running = True
+        if app.show_trails != trails:
+            app.show_trails = trails
+            app.trails.set_visible(trails)
+        app.show_labels = labels
+        app.name_labels.set_visible(labels)
+        app.size_labels.set_visible(labels)
+        self.count = app.engine.count
+
+    def frame(self, tick):
+        app = self.app
+        self.ticks.now += 1.0
+        app.step_physics()               # starts the frame: physics, trails, close approaches
+        app.render_frame(app.clock.alpha)
+        app.win.update()
+        app.perf.mark("update")
+        if tick % TWINKLE_EVERY == 0:
+            app.twinkle()
+            app.perf.mark("stars")
+        app.perf.end()
+
+    def stats(self):
+        return self.app.perf
+
+    def close(self):
+        # The window is kept for the next case; only the app's timers go
+        for task in list(self.app.scheduler.tasks):
+            self.app.scheduler.cancel(task)
+
+
+class PillowBackend:
+    """Offscreen rendering of the same scene, for machines without a display"""
+
+    name = "pillow"
+
+    def __init__(self, bodies, trails, labels, ticks):
+        self.engine, specs = build_scene(bodies)
+        self.count = self.engine.count
+        self.renderer = SceneRenderer(specs, self.engine.parent, labels=labels)
+        # The app only keeps trails for the planets' rows
+        self.planets = len(SOLAR_BODIES)
+        self.trails = TrailBuffer(self.planets, TRAIL_POINTS) if trails else None
+        self.perf = FrameStats(window=ticks)
+
+    def frame(self, tick):
+        perf = self.perf
+        perf.begin()
+        self.engine.step()
+        perf.mark("physics")
+        trails = None
+        if self.trails is not None:
+            self.trails.push(self.engine.positions[:self.planets])
+            trails = self.trails.ordered()
+            perf.mark("trails")
+        self.renderer.render(self.engine.positions, trails)
+        perf.mark("render")
+        perf.end()
+
+    def stats(self):
+        return self.perf
+
+    def close(self):
+        pass
+
+
+BACKENDS = {"tk": TkBackend, "pillow": PillowBackend}
+
+
+def has_display():
+    try:
+        import tkinter as tk
+        tk.Tk().destroy()
+        return True
+    except Exception:
+        return False
+
+
+def run_case(backend, bodies, trails, labels, ticks):
+    """Time ticks frames of one configuration"""
+    case = BACKENDS[backend](bodies, trails, labels, ticks)
+    gc.collect()
+    try:
+        for tick in range(ticks):
+            case.frame(tick)
+    finally:
+        case.close()
+    result = {"bodies": case.count, "trails": trails, "labels": labels}
+    result.update(summary(case.stats()))
+    return result
+
+
+def _peak_rss_child(backend, bodies, trails, labels, ticks):
+    run_case(backend, bodies, trails, labels, ticks)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def peak_memory(backend, bodies, trails, labels, ticks):
+    """Peak resident memory (MB) of a fresh process building and running one configuration
+
+    Unlike tracemalloc this includes NumPy, Pillow and Tk buffers. The
+    figure covers the whole interpreter, imports included. None where
+    the platform has no getrusage().
+    """
+    if resource is None:
+        return None
+    with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(_peak_rss_child, backend, bodies, trails, labels, ticks).result()
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=ASSET_DIR, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(backend="auto", counts=BODY_COUNTS, ticks=300, memory_ticks=30, progress=print):
+    """Run every configuration and return the results as a JSON-ready dict"""
+    if backend == "auto":
+        backend = "tk" if has_display() else "pillow"
+    results = []
+    for bodies in counts:
+        for trails in (False, True):
+            for labels in (False, True):
+                case = run_case(backend, bodies, trails, labels, ticks)
+                case["peak_rss_mb"] = peak_memory(backend, bodies, trails, labels, memory_ticks)
+                results.append(case)
+                peak = case["peak_rss_mb"]
+                progress(f"  {case['bodies']:>6} bodies  trails={'on ' if trails else 'off'} "
+                         f"labels={'on ' if labels else 'off'}  "
+                         f"p50 {case['frame_ms']['p50']:8.2f} ms  p99 {case['frame_ms']['p99']:8.2f} ms  "
+                         + (f"peak RSS {peak:7.1f} MB" if peak is not None else "peak RSS n/a"))
+    return {
+        "commit": _git_commit(),
+        "backend": backend,
+        "ticks": ticks,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(old, new):
+    """Lines comparing p50/p99 of matching configurations in two results dicts"""
+    key = lambda r: (r["bodies"], r["trails"], r["labels"])
+    before = {key(r): r for r in old["results"]}
+    lines = [f"📊 {old.get('commit')} → {new.get('commit')} ({new['backend']})"]
+    for r in new["results"]:
+        o = before.get(key(r))
+        if o is None:
+            continue
+        p50 = r["frame_ms"]["p50"] / o["frame_ms"]["p50"] - 1
+        p99 = r["frame_ms"]["p99"] / o["frame_ms"]["p99"] - 1
+        lines.append(f"  {r['bodies']:>6} bodies  trails={'on ' if r['trails'] else 'off'} "
+                     f"labels={'on ' if r['labels'] else 'off'}  p50 {p50:+7.1%}  p99 {p99:+7.1%}")
+    return lines
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the animation loop without user input")
+    parser.add_argument("--backend", choices=("auto", "tk", "pillow"), default="auto")
+    parser.add_argument("--bodies", type=int, nargs="+", default=list(BODY_COUNTS))
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--memory-ticks", type=int, default=30, help="ticks run in the peak-memory process")
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="older results file to compare against")
+    args = parser.parse_args()
+
+    print(f"📊 Benchmarking {args.ticks} ticks per configuration...")
+    report = run_suite(args.backend, args.bodies, args.ticks, args.memory_ticks)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results written to {args.out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print("\n".join(compare(json.load(f), report)))
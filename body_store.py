@@ -0,0 +1,176 @@
+# =====================================================================
+# 🗂️ BODY STORE
+# =====================================================================
+# Compact registry of everything that can be drawn or clicked.
+#
+# A Turtle per body costs kilobytes (its own __dict__, undo buffer and
+# canvas items) even when the body is off screen or too small to see.
+# Here the descriptive data lives in arrays, one row per body, next to
+# the orbit engine's arrays (radius, speed, angle, parent):
+#
+#   • names and size labels in object arrays (one str per body)
+#   • gif/info keys and colours as small integer codes into shared
+#     tables, since thousands of minor bodies share a handful of them
+#   • sizes as float32
+#
+# Drawing goes through HandlePool, which lends a turtle to a body only
+# while it is on screen and takes it back when it leaves, so the number
+# of turtles follows what is visible, not the size of the catalogue.
+# =====================================================================
+
+import numpy as np
+
+
+class _Codes:
+    """Interned strings: each distinct value gets a small integer code"""
+
+    __slots__ = ("values", "_index")
+
+    def __init__(self):
+        self.values = []
+        self._index = {}
+
+    def code(self, value):
+        if value not in self._index:
+            self._index[value] = len(self.values)
+            self.values.append(value)
+        return self._index[value]
+
+
+class Body:
+    """Lightweight handle on one row of a BodyStore (or a stand-alone body such as the Sun)"""
+
+    __slots__ = ("index", "name", "info_key")
+
+    def __init__(self, index, name, info_key):
+        self.index = index
+        self.name = name
+        self.info_key = info_key
+
+
+class BodyStore:
+    """Struct-of-arrays storage for body names, keys, colours and sizes"""
+
+    __slots__ = ("count", "names", "size_labels", "sizes", "base_sizes", "trail",
+                 "_gif", "_info", "_color", "gif_codes", "info_codes", "palette")
+
+    def __init__(self, capacity=16):
+        self.count = 0
+        self.gif_codes = _Codes()
+        self.info_codes = _Codes()
+        self.palette = _Codes()
+        self.names = np.empty(capacity, dtype=object)
+        self.size_labels = np.empty(capacity, dtype=object)
+        self.sizes = np.zeros(capacity, dtype=np.float32)
+        self.base_sizes = np.zeros(capacity, dtype=np.float32)
+        self.trail = np.zeros(capacity, dtype=bool)
+        self._gif = np.zeros(capacity, dtype=np.uint16)
+        self._info = np.zeros(capacity, dtype=np.uint16)
+        self._color = np.zeros(capacity, dtype=np.uint16)
+
+    def _reserve(self, extra):
+        need = self.count + extra
+        capacity = len(self.sizes)
+        if need <= capacity:
+            return
+        capacity = max(need, capacity * 2)
+        for field in ("names", "size_labels", "sizes", "base_sizes", "trail", "_gif", "_info", "_color"):
+            old = getattr(self, field)
+            new = np.empty(capacity, dtype=old.dtype) if old.dtype == object else np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, field, new)
+
+    def add(self, name, info_key=None, gif_key=None, size=0.1, color="white", size_label=None, trail=True):
+        """Append one body and return its index"""
+        return self.add_many([name], info_key, gif_key, size, color, [size_label], trail)
+
+    def add_many(self, names, info_key=None, gif_key=None, size=0.1, color="white", size_labels=None, trail=True):
+        """Append bodies sharing keys, colour and size (e.g. a catalogue of minor bodies); returns the first index"""
+        n = len(names)
+        self._reserve(n)
+        first, last = self.count, self.count + n
+        self.names[first:last] = names
+        self.size_labels[first:last] = size_labels if size_labels is not None else None
+        self.sizes[first:last] = size
+        self.base_sizes[first:last] = size
+        self.trail[first:last] = trail
+        self._gif[first:last] = self.gif_codes.code(gif_key)
+        self._info[first:last] = self.info_codes.code(info_key)
+        self._color[first:last] = self.palette.code(color)
+        self.count = last
+        return first
+
+    @classmethod
+    def from_specs(cls, specs):
+        """Store for SOLAR_BODIES-style dicts"""
+        store = cls(len(specs))
+        for spec in specs:
+            store.add(spec["name"], spec.get("info_key", spec["gif_key"]), spec["gif_key"], spec["size"],
+                      spec["color"], spec.get("size_label"), spec.get("trail", True))
+        return store
+
+    # ---- per-body lookups ----
+    def gif_key(self, i):
+        return self.gif_codes.values[self._gif[i]]
+
+    def info_key(self, i):
+        return self.info_codes.values[self._info[i]] or (self.names[i] or "").lower()
+
+    def color(self, i):
+        return self.palette.values[self._color[i]]
+
+    def view(self, i):
+        """A Body for row i (for click handling and info panels)"""
+        return Body(int(i), self.names[i], self.info_key(i))
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the store, including the strings"""
+        n = self.count
+        arrays = sum(getattr(self, f)[:n].nbytes for f in ("names", "size_labels", "sizes", "base_sizes",
+                                                           "trail", "_gif", "_info", "_color"))
+        strings = sum(len(s) + 49 for s in self.names[:n] if s) + sum(len(s) + 49 for s in self.size_labels[:n] if s)
+        return arrays + strings
+
+
+class HandlePool:
+    """Render handles (turtles) lent to bodies only while they are drawn
+
+    make() builds a new handle; dress(handle, i) sets it up for body i
+    (shape, colour, size). Released handles are hidden and reused.
+    """
+
+    __slots__ = ("make", "dress", "owned", "free")
+
+    def __init__(self, make, dress):
+        self.make = make
+        self.dress = dress
+        self.owned = {}      # body index -> handle
+        self.free = []
+
+    def get(self, i):
+        """The handle drawing body i, lending one if it has none"""
+        handle = self.owned.get(i)
+        if handle is None:
+            handle = self.free.pop() if self.free else self.make()
+            self.dress(handle, i)
+            self.owned[i] = handle
+        return handle
+
+    def peek(self, i):
+        """Body i's handle, or None if it isn't drawn"""
+        return self.owned.get(i)
+
+    def release(self, i):
+        """Hide body i's handle and keep it for the next body that needs one"""
+        handle = self.owned.pop(i, None)
+        if handle is not None:
+            handle.hideturtle()
+            self.free.append(handle)
+
+    def release_all(self):
+        for i in list(self.owned):
+            self.release(i)
+
+    def __len__(self):
+        return len(self.owned) + len(self.free)
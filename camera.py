@@ -0,0 +1,77 @@
+# =====================================================================
+# 🎥 CAMERA
+# =====================================================================
+# View transform for the solar system app.
+#
+# Zoom and pan are a single transform applied when drawing:
+#
+#     screen = (world - center) * zoom
+#
+# The simulation never sees it, so zooming no longer rescales orbit
+# radii, resets angles or wipes trails. Zoom changes glide towards a
+# target over a few frames, and can be anchored on a screen point (the
+# mouse cursor) so the thing under the cursor stays put.
+# =====================================================================
+
+import numpy as np
+
+
+class Camera:
+    """World-to-screen transform with smooth zoom and pan"""
+
+    def __init__(self, zoom=1.0, center=(0.0, 0.0), min_zoom=0.05, max_zoom=40.0, smoothing=0.25):
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.smoothing = smoothing      # fraction of the remaining zoom covered each frame
+        self._home = (zoom, tuple(center))
+        self.reset()
+
+    def reset(self):
+        """Jump straight back to the starting view"""
+        self.zoom = self.target_zoom = self._home[0]
+        self.center = np.array(self._home[1], dtype=float)
+        self._anchor_screen = None
+        self._anchor_world = None
+
+    # ---- transforms ----
+    def to_screen(self, world):
+        """Project (N, 2) world positions (or one point) to screen coordinates"""
+        return (np.asarray(world, dtype=float) - self.center) * self.zoom
+
+    def to_world(self, screen):
+        """Inverse of to_screen"""
+        return np.asarray(screen, dtype=float) / self.zoom + self.center
+
+    # ---- controls ----
+    def zoom_by(self, factor, anchor=None):
+        """Start a smooth zoom; anchor is a screen point that should stay fixed"""
+        self.target_zoom = float(np.clip(self.target_zoom * factor, self.min_zoom, self.max_zoom))
+        if anchor is None:
+            anchor = (0.0, 0.0)
+        self._anchor_screen = np.asarray(anchor, dtype=float)
+        self._anchor_world = self.to_world(anchor)
+
+    def pan_by(self, dx, dy):
+        """Move the view by a screen-space offset"""
+        self.center -= np.array([dx, dy], dtype=float) / self.zoom
+        if self._anchor_world is not None:
+            self._anchor_world = self.to_world(self._anchor_screen)
+
+    @property
+    def moving(self):
+        return abs(self.target_zoom - self.zoom) > 1e-4 * self.target_zoom
+
+    def update(self):
+        """Advance the zoom animation one frame; returns True while it is still moving"""
+        if self._anchor_world is None:
+            return False
+        still_moving = self.moving
+        if still_moving:
+            self.zoom += (self.target_zoom - self.zoom) * self.smoothing
+        else:
+            self.zoom = self.target_zoom
+        # Keep the anchored world point under the same screen point
+        self.center = self._anchor_world - self._anchor_screen / self.zoom
+        if not still_moving:
+            self._anchor_screen = self._anchor_world = None
+        return still_moving
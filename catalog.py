@@ -0,0 +1,491 @@
+# =====================================================================
+# 📚 MINOR-BODY CATALOGUES
+# =====================================================================
+# Loads asteroids and comets from local catalogue files, for catalogues
+# far too big to write out by hand like the tables in solar_data.py.
+#
+#   • Four formats: CSV with a header row (e.g. a JPL small-body
+#     database export), JSON lines (one object per body), a JSON array
+#     of such objects and the fixed-width orbital-element records of
+#     MPCORB.DAT. Gzipped files are read as they are.
+#   • Files are streamed in chunks of lines (of array elements for JSON
+#     arrays). Each chunk is parsed column by column with NumPy,
+#     filtered and sampled, and only the rows kept survive it, so memory
+#     follows the rows kept, not the file size.
+#   • A kept row is its orbital elements (float32), its name (bytes)
+#     and the byte offset of its line or array element. The full record
+#     (observations, diameter, albedo...) is read back from the file
+#     only when the body is clicked, as a planet_info-style dict.
+#
+#   python catalog.py MPCORB.DAT --sample 0.1 --max-a 6
+# =====================================================================
+
+import codecs
+import csv
+import gzip
+import json
+import os
+import re
+from itertools import zip_longest
+
+import numpy as np
+
+from kepler import TICKS_PER_DAY, mean_motion
+from solar_data import SOLAR_BODIES
+
+CHUNK_ROWS = 50_000
+
+# Orbital elements kept per row: semi-major axis (AU), eccentricity,
+# inclination, longitude of the ascending node, argument of perihelion,
+# mean anomaly (degrees) and absolute magnitude
+COLUMNS = ("a", "e", "i", "node", "peri", "M", "H")
+
+# Column names accepted for each field in CSV headers and JSON keys (lowercase)
+ALIASES = {
+    "name": ("full_name", "name", "readable_des", "designation", "pdes", "des"),
+    "a": ("a", "semimajor_axis", "semi_major_axis"),
+    "e": ("e", "eccentricity", "ecc"),
+    "i": ("i", "inclination", "incl"),
+    "node": ("om", "node", "longitude_of_ascending_node", "raan"),
+    "peri": ("w", "peri", "argument_of_perihelion", "arg_perihelion"),
+    "M": ("ma", "m", "mean_anomaly"),
+    "H": ("h", "absolute_magnitude"),
+    "q": ("q", "perihelion_distance"),
+    "diameter": ("diameter",),
+    "albedo": ("albedo",),
+    "kind": ("kind",),
+}
+
+# MPCORB.DAT record layout: field -> (first column, last column + 1)
+MPC_FIELDS = {
+    "designation": (0, 7), "h": (8, 13), "g": (14, 19), "epoch": (20, 25),
+    "ma": (26, 35), "w": (37, 46), "om": (48, 57), "i": (59, 68), "e": (70, 79),
+    "n": (80, 91), "a": (92, 103), "u": (105, 106), "reference": (107, 116),
+    "observations": (117, 122), "oppositions": (123, 126), "arc": (127, 136),
+    "rms": (137, 141), "computer": (150, 160), "name": (166, 194), "last_observed": (194, 202),
+}
+MPC_WIDTH = 202
+MPC_MIN_WIDTH = 103      # a record must at least reach the semi-major axis
+
+# Circular orbits use the belt's speed law: Earth's 0.035 rad/tick at 1 AU
+EARTH_SPEED = 0.035
+DEFAULT_ALBEDO = 0.14    # for diameters estimated from H
+MIN_RADIUS = 60.0        # drawn orbits never dip inside the Sun's picture
+
+
+def guess_format(path):
+    """"csv", "jsonl", "json" (an array) or "mpc" from a file name"""
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if name.endswith(".json"):
+        return "json"
+    return "mpc"
+
+
+def _open(path):
+    return gzip.open(path, "rb") if path.lower().endswith(".gz") else open(path, "rb")
+
+
+def _floats(values):
+    """Float64 array from an array of number strings; blanks (and junk) become NaN"""
+    values = np.char.strip(values)
+    values = np.where(np.char.str_len(values) == 0, values.dtype.type("nan"), values)
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        return np.array([_float(v) for v in values])
+
+
+def _float(value):
+    if value is None or value == "":
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _lookup(record, field):
+    """First value among a field's aliases in a record with lowercase keys, or None"""
+    for key in ALIASES[field]:
+        value = record.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _fill_a(columns):
+    # Comet tables often give the perihelion distance instead of a
+    q, e = columns.pop("q"), columns["e"]
+    missing = np.isnan(columns["a"]) & (e < 1)
+    columns["a"] = np.where(missing, q / (1 - np.where(missing, e, 0.0)), columns["a"])
+    return columns
+
+
+# ---- chunk parsers: (lines, offsets, state) -> (columns, names, offsets) ----
+def _parse_mpc(lines, offsets, state):
+    # MPCORB.DAT opens with a text preamble that ends in a line of dashes;
+    # files without one (e.g. the NEA extracts) start with records
+    if not state.get("started"):
+        for k, line in enumerate(lines):
+            if line.startswith(b"-----"):
+                lines, offsets = lines[k + 1:], offsets[k + 1:]
+                state["started"] = True
+                break
+            if len(line.rstrip()) >= MPC_MIN_WIDTH and np.isfinite(_float(line[92:103])):
+                lines, offsets = lines[k:], offsets[k:]
+                state["started"] = True
+                break
+        else:
+            return None
+    keep = [k for k, line in enumerate(lines) if len(line.rstrip()) >= MPC_MIN_WIDTH]
+    table = np.array([lines[k].rstrip(b"\r\n") for k in keep], dtype=f"S{MPC_WIDTH}")
+    table = table.view(np.uint8).reshape(len(keep), MPC_WIDTH)
+
+    def field(key):
+        start, end = MPC_FIELDS[key]
+        return np.ascontiguousarray(table[:, start:end]).view(f"S{end - start}").ravel()
+
+    columns = {"a": field("a"), "e": field("e"), "i": field("i"), "node": field("om"),
+               "peri": field("w"), "M": field("ma"), "H": field("h")}
+    columns = {name: _floats(values) for name, values in columns.items()}
+    names = np.char.strip(field("name"))
+    names = np.where(np.char.str_len(names) == 0, np.char.strip(field("designation")), names)
+    return columns, names, offsets[keep]
+
+
+def _parse_csv(lines, offsets, state):
+    rows = list(csv.reader(line.decode("utf-8", "replace") for line in lines))
+    if "fields" not in state:
+        header = [h.strip().lower() for h in rows[0]]
+        state["fields"] = {field: next((header.index(a) for a in aliases if a in header), None)
+                           for field, aliases in ALIASES.items()}
+        rows, offsets = rows[1:], offsets[1:]
+    index = state["fields"]
+    # One pass turns rows into columns (short rows padded with blanks);
+    # float() on each cell beats NumPy's string-to-float cast here
+    cells = list(zip_longest(*rows, fillvalue=""))
+
+    def column(field):
+        k = index[field]
+        if k is None or k >= len(cells):
+            return np.full(len(rows), np.nan)
+        return np.fromiter(map(_float, cells[k]), np.float64, len(rows))
+
+    columns = _fill_a({field: column(field) for field in COLUMNS + ("q",)})
+    k = index["name"]
+    names = [name.strip() for name in cells[k]] if k is not None and k < len(cells) else [""] * len(rows)
+    return columns, np.char.encode(np.array(names or [""])[:len(rows)], "utf-8"), offsets
+
+
+def _parse_jsonl(lines, offsets, state):
+    return _parse_json([json.loads(line) for line in lines], offsets, state)
+
+
+def _parse_json(records, offsets, state):
+    # Objects may leave fields out, so look at every key in the chunk
+    present = {key.lower(): key for key in set().union(*records)}
+    keys = {field: next((present[a] for a in aliases if a in present), None) for field, aliases in ALIASES.items()}
+
+    def column(field):
+        key = keys[field]
+        if key is None:
+            return np.full(len(records), np.nan)
+        values = [r.get(key) for r in records]
+        try:
+            return np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            return np.fromiter(map(_float, values), np.float64, len(values))
+
+    columns = _fill_a({field: column(field) for field in COLUMNS + ("q",)})
+    key = keys["name"]
+    names = [str(r.get(key) or "").strip() if key is not None else "" for r in records]
+    return columns, np.char.encode(np.array(names or [""])[:len(records)], "utf-8"), offsets
+
+
+_PARSERS = {"mpc": _parse_mpc, "csv": _parse_csv, "jsonl": _parse_jsonl, "json": _parse_json}
+
+_JSON_GAP = re.compile(r"[\s,]*")
+
+
+def _json_array(f, block=1 << 20):
+    """Yield (byte offset, object) for each element of a top-level JSON array, a block at a time"""
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    text, at, start = "", 0, 0        # start is the byte offset of text[at]
+
+    def more():
+        nonlocal text, at
+        data = f.read(block)
+        text = text[at:] + utf8.decode(data, final=not data)
+        at = 0
+        return bool(data)
+
+    def skip(pattern):
+        nonlocal at, start
+        end = pattern.match(text, at).end()
+        start += len(text[at:end].encode("utf-8"))
+        at = end
+
+    more()
+    skip(re.compile(r"\ufeff?\s*"))      # a byte-order mark counts towards the offsets
+    if text[at:at + 1] != "[":
+        raise ValueError("a .json catalogue must be an array of objects (use .jsonl for JSON lines)")
+    at, start = at + 1, start + 1
+    while True:
+        skip(_JSON_GAP)
+        if at == len(text):
+            if not more():
+                raise ValueError("the JSON array is not closed")
+            continue
+        if text[at] == "]":
+            return
+        try:
+            record, end = decoder.raw_decode(text, at)
+        except json.JSONDecodeError:
+            if more():            # the element runs on into the next block
+                continue
+            raise
+        yield start, record
+        start += len(text[at:end].encode("utf-8"))
+        at = end
+
+
+def _read_json_value(f, block=1 << 16):
+    """The JSON value starting at f's position, read a block at a time"""
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    text = ""
+    while True:
+        data = f.read(block)
+        text += utf8.decode(data, final=not data)
+        try:
+            return decoder.raw_decode(text)[0]
+        except json.JSONDecodeError:
+            if not data:
+                raise
+
+
+def read_chunks(path, fmt=None, chunk_rows=CHUNK_ROWS):
+    """Yield (columns, names, offsets) for successive chunks of a catalogue file
+
+    columns maps each of COLUMNS to a float64 array (NaN where the file
+    has no value); names is a bytes array; offsets are the byte offsets
+    of the rows' lines, for reading a record back later.
+    """
+    fmt = fmt or guess_format(path)
+    parse = _PARSERS[fmt]
+    state = {}
+    if fmt == "json":
+        with _open(path) as f:
+            records, offsets = [], []
+            for offset, record in _json_array(f):
+                records.append(record)
+                offsets.append(offset)
+                if len(records) >= chunk_rows:
+                    yield parse(records, np.array(offsets, dtype=np.int64), state)
+                    records, offsets = [], []
+            if records:
+                yield parse(records, np.array(offsets, dtype=np.int64), state)
+        return
+    with _open(path) as f:
+        lines, offsets, pos = [], [], 0
+        for line in f:
+            start, pos = pos, pos + len(line)
+            if not line.strip():
+                continue
+            lines.append(line)
+            offsets.append(start)
+            if len(lines) >= chunk_rows:
+                chunk = parse(lines, np.array(offsets, dtype=np.int64), state)
+                if chunk is not None:
+                    yield chunk
+                lines, offsets = [], []
+        if lines:
+            chunk = parse(lines, np.array(offsets, dtype=np.int64), state)
+            if chunk is not None:
+                yield chunk
+
+
+def load_catalog(path, fmt=None, where=None, sample=None, limit=None, seed=None, chunk_rows=CHUNK_ROWS):
+    """Stream a catalogue file into a Catalog
+
+    where(columns) returns a mask of rows to keep from a chunk's columns
+    (angles in degrees, a in AU); sample keeps that random fraction of
+    what is left; limit stops reading once that many rows are kept.
+    Rows without a closed orbit (no a, or e >= 1) are always skipped.
+    """
+    fmt = fmt or guess_format(path)
+    rng = np.random.default_rng(seed)
+    catalog = Catalog(path, fmt)
+    parts = []
+    kept = 0
+    for columns, names, offsets in read_chunks(path, fmt, chunk_rows):
+        catalog.rows_read += len(offsets)
+        a, e = columns["a"], columns["e"]
+        keep = (a > 0) & (e >= 0) & (e < 1)
+        if where is not None:
+            keep &= np.asarray(where(columns), dtype=bool)
+        if sample is not None:
+            keep &= rng.random(len(keep)) < sample
+        rows = np.flatnonzero(keep)
+        if limit is not None:
+            rows = rows[:limit - kept]
+        parts.append(({name: columns[name][rows].astype(np.float32) for name in COLUMNS},
+                      names[rows], offsets[rows]))
+        kept += len(rows)
+        if limit is not None and kept >= limit:
+            break
+    catalog._finish(parts)
+    return catalog
+
+
+class Catalog:
+    """The rows kept from a catalogue file: one float32 array per orbital element"""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self.rows_read = 0
+        self.count = 0
+        self.names = np.zeros(0, dtype="S1")
+        self.offsets = np.zeros(0, dtype=np.int64)
+        for name in COLUMNS:
+            setattr(self, name, np.zeros(0, dtype=np.float32))
+        self._header = None
+
+    def _finish(self, parts):
+        if parts:
+            for name in COLUMNS:
+                setattr(self, name, np.concatenate([p[0][name] for p in parts]))
+            self.names = np.concatenate([p[1] for p in parts])
+            self.offsets = np.concatenate([p[2] for p in parts])
+        self.count = len(self.offsets)
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in COLUMNS) + self.names.nbytes + self.offsets.nbytes
+
+    def name(self, row):
+        return self.names[row].decode("utf-8", "replace")
+
+    # ---- on-demand detail records ----
+    def record(self, row):
+        """Every field of a kept row, read back from the file (lowercase keys)"""
+        with _open(self.path) as f:
+            f.seek(int(self.offsets[row]))
+            if self.fmt == "json":
+                return {key.lower(): value for key, value in _read_json_value(f).items()}
+            line = f.readline()
+        if self.fmt == "mpc":
+            return {key: line[start:end].decode("ascii", "replace").strip()
+                    for key, (start, end) in MPC_FIELDS.items()}
+        if self.fmt == "csv":
+            if self._header is None:
+                with _open(self.path) as f:
+                    self._header = [h.strip().lower() for h in next(csv.reader(
+                        [next(line for line in f if line.strip()).decode("utf-8", "replace")]))]
+            values = next(csv.reader([line.decode("utf-8", "replace")]))
+            return dict(zip(self._header, values))
+        return {key.lower(): value for key, value in json.loads(line).items()}
+
+    def details(self, row):
+        """planet_info-style dict for a kept row (see solar_data.py)"""
+        record = self.record(row)
+        name = self.name(row)
+        a, e, i, H = (float(getattr(self, c)[row]) for c in ("a", "e", "i", "H"))
+        kind = str(_lookup(record, "kind") or "")
+        comet = kind.startswith("c") or any(p in name for p in ("C/", "P/", "D/", "X/", "I/"))
+
+        diameter = _float(_lookup(record, "diameter"))
+        if np.isfinite(diameter):
+            diameter = f"{diameter:,.1f} km"
+        elif np.isfinite(H):
+            albedo = _float(_lookup(record, "albedo"))
+            albedo = albedo if albedo > 0 else DEFAULT_ALBEDO
+            diameter = f"≈ {1329 / np.sqrt(albedo) * 10 ** (-H / 5):,.1f} km (from H = {H:.1f})"
+        else:
+            diameter = "Unknown"
+
+        if record.get("observations"):
+            fact = (f"Its orbit is fitted to {record['observations']} observations "
+                    f"over {record.get('oppositions') or '?'} oppositions.")
+        else:
+            fact = f"Its distance from the Sun swings between {a * (1 - e):.2f} and {a * (1 + e):.2f} AU."
+        return {
+            "name": name,
+            "type": "Comet" if comet else "Asteroid",
+            "diameter": diameter,
+            "mass": "Unknown",
+            "orbital_period": f"{a ** 1.5:.2f} Earth years",
+            "fun_fact": fact,
+            "description": f"Semi-major axis {a:.3f} AU, eccentricity {e:.3f}, inclination {i:.1f}°.",
+        }
+
+    # ---- into the simulation ----
+    def add_to(self, engine, bodies, specs=SOLAR_BODIES, kepler=False, color="gray", size=0.05,
+               ticks_per_day=TICKS_PER_DAY):
+        """Append every kept row to an OrbitEngine and a BodyStore; returns the first new index"""
+        if engine.count != bodies.count:
+            raise ValueError("the engine and the body store must hold the same bodies")
+        a = self.a.astype(float)
+        angles = {name: np.radians(np.nan_to_num(getattr(self, name).astype(float))) for name in ("i", "node", "peri", "M")}
+        first = int(engine.add_bodies(
+            display_radius(a, specs), EARTH_SPEED * a ** -1.5, angle=angles["M"],
+            eccentricity=self.e.astype(float), inclination=angles["i"], node=angles["node"],
+            periapsis=angles["peri"], mean_motion=mean_motion(365.25 * a ** 1.5, ticks_per_day),
+            kepler=kepler,
+        )[0]) if self.count else engine.count
+        bodies.add_many([self.name(k) for k in range(self.count)], None, None, size, color, trail=False)
+        return first
+
+
+def display_radius(a_au, specs=SOLAR_BODIES):
+    """Drawn orbit radius (px) for semi-major axes in AU, placed between the planets' drawn orbits"""
+    rows = sorted((spec["au"], spec["radius"]) for spec in specs
+                  if "au" in spec and spec.get("parent", "sun") == "sun")
+    au = np.log([r[0] for r in rows])
+    px = np.array([r[1] for r in rows], dtype=float)
+    x = np.log(np.asarray(a_au, dtype=float))
+    radius = np.interp(x, au, px)
+    # Past the first and last planet, carry on along the end segments
+    radius = np.where(x < au[0], px[0] + (x - au[0]) * (px[1] - px[0]) / (au[1] - au[0]), radius)
+    radius = np.where(x > au[-1], px[-1] + (x - au[-1]) * (px[-1] - px[-2]) / (au[-1] - au[-2]), radius)
+    return np.maximum(radius, MIN_RADIUS)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Load a minor-body catalogue and report what was kept")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=sorted(_PARSERS), help="default: from the file name")
+    parser.add_argument("--sample", type=float, help="fraction of rows to keep at random")
+    parser.add_argument("--limit", type=int, help="stop after this many rows")
+    parser.add_argument("--max-a", type=float, help="only orbits with a below this (AU)")
+    parser.add_argument("--max-h", type=float, help="only bodies brighter than this absolute magnitude")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--show", type=int, default=3, help="print the details of this many rows")
+    args = parser.parse_args()
+
+    def where(c):
+        keep = np.ones(len(c["a"]), dtype=bool)
+        if args.max_a is not None:
+            keep &= c["a"] < args.max_a
+        if args.max_h is not None:
+            keep &= c["H"] < args.max_h
+        return keep
+
+    start = time.perf_counter()
+    catalog = load_catalog(args.path, args.format, where, args.sample, args.limit, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"📚 {catalog.count:,} of {catalog.rows_read:,} rows kept from "
+          f"{os.path.basename(args.path)} in {elapsed:.2f}s ({catalog.nbytes / 2 ** 20:.1f} MB kept)")
+    for row in range(min(args.show, catalog.count)):
+        print(f"   {catalog.details(row)}")
@@ -0,0 +1,110 @@
+# =====================================================================
+# 🛰️ CONTROL API
+# =====================================================================
+# A small local HTTP API for driving the app from scripts or a kiosk
+# orchestrator: read the state, pause, resume, change speed, zoom and
+# select a body.
+#
+#   • Served by asyncio inside the app's own event loop: no threads, and
+#     a request is never handled in the middle of a frame.
+#   • Each command is queued on the scheduler at UI priority and the
+#     reply waits for it, so physics and rendering keep their slots
+#     however many requests arrive.
+#   • JSON in (query string and/or body), JSON out. Listens on
+#     127.0.0.1 unless told otherwise.
+#
+#   curl localhost:8765/state
+#   curl -X POST localhost:8765/speed -d '{"value": 2}'
+#   curl -X POST "localhost:8765/select?body=Titan"
+# =====================================================================
+
+import asyncio
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+from scheduler import UI
+
+MAX_BODY = 64 * 1024
+READ_TIMEOUT = 5.0
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            408: "Request Timeout", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ControlServer:
+    """HTTP front end for a dict of commands, run through a Scheduler
+
+    commands maps a path ("speed" for /speed) to a function taking the
+    request's arguments as keywords and returning something JSON can
+    encode. Commands in readonly may be called with GET; all of them
+    accept POST.
+    """
+
+    def __init__(self, commands, scheduler, host="127.0.0.1", port=8765, readonly=("state", "stats")):
+        self.commands = commands
+        self.scheduler = scheduler
+        self.host = host
+        self.port = port
+        self.readonly = set(readonly)
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]    # the real one when port was 0
+        return self
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _handle(self, reader, writer):
+        try:
+            status, reply = await asyncio.wait_for(self._request(reader), READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            status, reply = 408, {"error": "request timed out"}
+        except (ValueError, UnicodeDecodeError, asyncio.IncompleteReadError) as e:
+            status, reply = 400, {"error": str(e) or "malformed request"}
+        body = json.dumps(reply).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode("ascii") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _request(self, reader):
+        method, target, _ = (await reader.readline()).decode("ascii").split(" ", 2)
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            key, _, value = line.partition(":")
+            headers[key.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY:
+            return 413, {"error": f"body larger than {MAX_BODY} bytes"}
+
+        url = urlsplit(target)
+        args = dict(parse_qsl(url.query))
+        if length:
+            data = json.loads(await reader.readexactly(length))
+            if not isinstance(data, dict):
+                raise ValueError("the body must be a JSON object")
+            args.update(data)
+
+        name = url.path.strip("/") or "state"
+        command = self.commands.get(name)
+        if command is None:
+            return 404, {"error": f"no command {name!r}", "commands": sorted(self.commands)}
+        if method != "POST" and not (method == "GET" and name in self.readonly):
+            return 405, {"error": f"use POST for {name}"}
+        try:
+            return 200, await self.scheduler.submit(lambda: command(**args), UI, f"api {name}")
+        except (TypeError, ValueError, KeyError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
@@ -0,0 +1,112 @@
+# =====================================================================
+# 📅 EPHEMERIS TABLES
+# =====================================================================
+# Precomputed body positions over a span of simulated time.
+#
+# build_ephemeris() samples every body's position at a fixed interval
+# and writes the samples to a compact binary file: a small header
+# followed by a (samples, bodies, 2) float32 table. Ephemeris opens the
+# file as a memory map, so only the pages that are actually looked at
+# are read, and any time inside the span is found in O(1): two rows
+# and a linear blend. This powers the time-scrub slider and "jump to
+# day" in the control panel, and lets a session replay from disk.
+#
+# Run "python ephemeris.py --days 3650 --out solar.ephem" to build one
+# without a display.
+# =====================================================================
+
+import struct
+
+import numpy as np
+
+from kepler import TICKS_PER_DAY
+
+# magic, version, bodies, samples, start tick, ticks per sample
+_HEADER = struct.Struct("<8sIIIdd")
+_MAGIC = b"SOLEPHEM"
+_VERSION = 1
+
+
+def build_ephemeris(engine, path, duration, interval=1.0, start=None, chunk=4096):
+    """Sample every body over duration ticks into path and return the opened Ephemeris"""
+    start = engine.time if start is None else float(start)
+    samples = int(np.ceil(duration / interval)) + 1
+    bodies = engine.count
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, bodies, samples, start, interval))
+    table = np.memmap(path, dtype=np.float32, mode="r+", offset=_HEADER.size,
+                      shape=(samples, bodies, 2))
+    scratch = np.empty((bodies, 2))
+    # Write in chunks so a long span never needs the whole table in RAM
+    for first in range(0, samples, chunk):
+        last = min(samples, first + chunk)
+        for row in range(first, last):
+            table[row] = engine.positions_at(start + row * interval, out=scratch)
+        table.flush()
+    del table
+    return Ephemeris(path)
+
+
+class Ephemeris:
+    """Memory-mapped position table with O(1) lookup at any time in its span"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, bodies, samples, start, interval = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a solar ephemeris file")
+        self.bodies = bodies
+        self.samples = samples
+        self.start = start
+        self.interval = interval
+        self.table = np.memmap(path, dtype=np.float32, mode="r", offset=_HEADER.size,
+                               shape=(samples, bodies, 2))
+
+    @property
+    def end(self):
+        return self.start + (self.samples - 1) * self.interval
+
+    def at(self, t):
+        """Positions of every body at time t (ticks), clamped to the table's span"""
+        x = (min(max(t, self.start), self.end) - self.start) / self.interval
+        row = min(int(x), self.samples - 2) if self.samples > 1 else 0
+        frac = x - row
+        if self.samples == 1 or frac <= 0.0:
+            return np.asarray(self.table[row], dtype=float)
+        a, b = self.table[row], self.table[row + 1]
+        return a + (b - a) * frac
+
+    def frames(self, every=1):
+        """Yield (time, positions) for replaying the table from disk"""
+        for row in range(0, self.samples, every):
+            yield self.start + row * self.interval, self.table[row]
+
+    def close(self):
+        """Release the memory map"""
+        mm = getattr(self.table, "_mmap", None)
+        self.table = None
+        if mm is not None:
+            mm.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from orbit_engine import OrbitEngine
+    from solar_data import SOLAR_BODIES, planet_info
+
+    parser = argparse.ArgumentParser(description="Precompute a solar system ephemeris file")
+    parser.add_argument("--days", type=float, default=3650.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="ticks per sample")
+    parser.add_argument("--kepler", action="store_true", help="use Kepler orbits")
+    parser.add_argument("--out", default="solar.ephem")
+    args = parser.parse_args()
+
+    engine = OrbitEngine.from_specs(SOLAR_BODIES, info=planet_info, kepler=args.kepler)
+    start = time.perf_counter()
+    eph = build_ephemeris(engine, args.out, args.days * TICKS_PER_DAY, args.interval)
+    print(f"📅 {eph.samples} samples × {eph.bodies} bodies → {args.out} "
+          f"in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,93 @@
+# =====================================================================
+# 🏷️ BODY LABELS
+# =====================================================================
+# Cached label rendering for the solar system app.
+#
+# Writing a label with a turtle means clear() + write() every frame,
+# which deletes and recreates a Tk text item just to move a static
+# string. A LabelLayer instead keeps one persistent canvas text item
+# per body and only moves it (a coords update) when the body actually
+# moved. Changing the text or the font is the only thing that touches
+# the item's configuration.
+# =====================================================================
+
+import numpy as np
+
+
+class LabelLayer:
+    """One persistent canvas text item per body, offset above/below it"""
+
+    def __init__(self, canvas, texts, dy=25, font=("Arial", 9, "bold"), color="white",
+                 anchor="s", tolerance=0.5):
+        self.canvas = canvas
+        self.texts = list(texts)
+        self.dy = dy
+        self.font = font
+        self.color = color
+        self.anchor = anchor
+        self.tolerance = tolerance    # pixels a body must move before its label follows
+        self.items = [None] * len(self.texts)
+        self.visible = True
+        self._last = np.full((len(self.texts), 2), np.nan)
+        self._shown = np.ones(len(self.texts), dtype=bool)
+
+    def _create(self, i, x, y):
+        self.items[i] = self.canvas.create_text(
+            x, -(y + self.dy), text=self.texts[i], anchor=self.anchor,
+            fill=self.color, font=self.font,
+        )
+
+    def update(self, positions, shown=None):
+        """Move the labels of bodies that moved; labels not in shown are hidden"""
+        if not self.visible:
+            return
+        positions = np.asarray(positions)
+        if shown is not None:
+            self._apply_shown(np.asarray(shown, dtype=bool))
+        last = self._last
+        # NaN (never drawn) compares as "moved" because the < test fails
+        moved = ~np.all(np.abs(positions - last) < self.tolerance, axis=1)
+        moved &= self._shown
+
+        for i in np.flatnonzero(moved):
+            if self.texts[i] is None:
+                continue
+            x, y = positions[i]
+            if self.items[i] is None:
+                self._create(i, x, y)
+            else:
+                # Turtle y points up, canvas y points down
+                self.canvas.coords(self.items[i], x, -(y + self.dy))
+            last[i] = positions[i]
+
+    def _apply_shown(self, shown):
+        # Only labels whose culled/declutter state flipped get reconfigured
+        for i in np.flatnonzero(shown != self._shown):
+            if self.items[i] is not None:
+                self.canvas.itemconfigure(self.items[i], state="normal" if shown[i] else "hidden")
+        self._shown = shown
+
+    def set_text(self, i, text):
+        """Change one label's text (the only per-label rebuild)"""
+        self.texts[i] = text
+        if self.items[i] is not None:
+            if text is None:
+                self.canvas.delete(self.items[i])
+                self.items[i] = None
+                self._last[i] = np.nan
+            else:
+                self.canvas.itemconfigure(self.items[i], text=text)
+
+    def set_font(self, font):
+        """Change the font of every label in this layer"""
+        self.font = font
+        for item in self.items:
+            if item is not None:
+                self.canvas.itemconfigure(item, font=font)
+
+    def set_visible(self, visible):
+        """Show or hide the whole layer without deleting any items"""
+        self.visible = visible
+        for item, shown in zip(self.items, self._shown):
+            if item is not None:
+                self.canvas.itemconfigure(item, state="normal" if visible and shown else "hidden")
@@ -0,0 +1,282 @@
+# =====================================================================
+# 🌍 N-BODY GRAVITY (BARNES-HUT)
+# =====================================================================
+# Optional physics mode: real mutual gravitation instead of scripted
+# orbits.
+#
+#   • Forces come from a Barnes-Hut quadtree: distant groups of bodies
+#     act as one mass at their centre of mass, so a force pass costs
+#     O(N log N) instead of O(N²). The tree is built from Morton
+#     (Z-order) codes and both the build and the walk are done level by
+#     level on whole NumPy arrays, never body by body in Python.
+#   • Motion is integrated with kick-drift-kick leapfrog, a symplectic
+#     scheme that keeps orbits from spiralling in or out over time.
+#   • Masses come from the "mass" strings in planet_info; bodies with no
+#     mass (asteroids, test particles) feel gravity but exert none.
+#
+# Units are the app's: pixels and ticks. G is chosen so that a circular
+# orbit at Earth's drawn radius takes as long as Earth's scripted one.
+# Satellites keep following their parent kinematically: at display
+# scale they sit far outside their parent's Hill sphere and would
+# simply wander off.
+# =====================================================================
+
+import re
+
+import numpy as np
+
+# Morton codes interleave two coordinates of TREE_DEPTH bits each
+TREE_DEPTH = 16
+
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻", "0123456789-")
+_MASS_RE = re.compile(r"([\d.]+)\s*×\s*10\s*([⁰¹²³⁴⁵⁶⁷⁸⁹⁻\d-]+)")
+
+
+def parse_mass_kg(text):
+    """Mass in kg from a planet_info string like "5.972 × 10²⁴ kg" """
+    match = _MASS_RE.search(text or "")
+    if not match:
+        raise ValueError(f"can't read a mass from {text!r}")
+    return float(match.group(1)) * 10.0 ** int(match.group(2).translate(_SUPERSCRIPTS))
+
+
+def gravity_constant(sun_mass, radius=280.0, angular_speed=0.035):
+    """G (px³ per mass unit per tick²) giving a circular orbit of that radius that angular speed"""
+    return angular_speed ** 2 * radius ** 3 / sun_mass
+
+
+def _spread_bits(v):
+    # 0b...dcba -> 0b...0d0c0b0a for up to 32-bit integers
+    v = v & 0xFFFFFFFF
+    v = (v | (v << 16)) & 0x0000FFFF0000FFFF
+    v = (v | (v << 8)) & 0x00FF00FF00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F0F0F0F0F
+    v = (v | (v << 2)) & 0x3333333333333333
+    v = (v | (v << 1)) & 0x5555555555555555
+    return v
+
+
+class QuadTree:
+    """Barnes-Hut quadtree stored as one sorted array of cells per level"""
+
+    def __init__(self, positions, masses, depth=TREE_DEPTH):
+        self.depth = depth
+        lo = positions.min(axis=0)
+        size = float((positions.max(axis=0) - lo).max()) * (1 + 1e-9) or 1.0
+        self.size = size
+
+        cells = 1 << depth
+        ij = np.clip(((positions - lo) * (cells / size)).astype(np.int64), 0, cells - 1)
+        codes = _spread_bits(ij[:, 0]) | (_spread_bits(ij[:, 1]) << 1)
+        self.order = np.argsort(codes, kind="stable")
+        self.rank = np.empty_like(self.order)
+        self.rank[self.order] = np.arange(len(self.order))
+        codes = codes[self.order]
+        m = masses[self.order]
+        mx = m[:, None] * positions[self.order]
+        centroid = positions[self.order]
+
+        # Level l groups bodies by the top 2*l bits of their code
+        self.levels = []
+        for level in range(depth + 1):
+            keys = codes >> (2 * (depth - level))
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            ends = np.r_[starts[1:], len(keys)]
+            mass = np.add.reduceat(m, starts)
+            weighted = np.add.reduceat(mx, starts, axis=0)
+            # Massless cells (only test particles) fall back to their plain centroid
+            plain = np.add.reduceat(centroid, starts, axis=0) / (ends - starts)[:, None]
+            safe = np.where(mass > 0, mass, 1.0)
+            com = np.where((mass > 0)[:, None], weighted / safe[:, None], plain)
+            self.levels.append({
+                "keys": keys[starts], "start": starts, "end": ends,
+                "mass": mass, "com": com, "size": size / (1 << level),
+            })
+
+    @classmethod
+    def from_arrays(cls, rank, levels, size, depth=TREE_DEPTH):
+        """A tree built elsewhere, from its rank array and per-level cells (e.g. in shared memory)"""
+        tree = cls.__new__(cls)
+        tree.depth, tree.size, tree.rank, tree.levels = depth, size, rank, levels
+        return tree
+
+    def accelerations(self, positions, masses, G, theta=0.7, softening=1.0, chunk=8192, targets=None):
+        """Gravitational acceleration on the target bodies (default: all), walking the tree level by level"""
+        targets = np.arange(len(positions)) if targets is None else np.asarray(targets)
+        n = len(targets)
+        acc = np.zeros((n, 2))
+        eps2 = softening * softening
+        theta2 = theta * theta
+        for first in range(0, n, chunk):
+            # Every target starts paired with the root cell; pair_l is its row in acc
+            pair_l = np.arange(first, min(n, first + chunk))
+            pair_t = targets[pair_l]
+            pair_c = np.zeros(len(pair_t), dtype=np.int64)
+            for level in range(self.depth + 1):
+                if not len(pair_t):
+                    break
+                cells = self.levels[level]
+                start, end = cells["start"][pair_c], cells["end"][pair_c]
+                mass, com = cells["mass"][pair_c], cells["com"][pair_c]
+
+                # A target inside the cell must not attract itself
+                rank = self.rank[pair_t]
+                inside = (rank >= start) & (rank < end)
+                own_m = np.where(inside, masses[pair_t], 0.0)
+                mass_ex = mass - own_m
+                safe = np.where(mass_ex > 0, mass_ex, 1.0)
+                com = np.where((inside & (mass_ex > 0))[:, None],
+                               (com * mass[:, None] - own_m[:, None] * positions[pair_t]) / safe[:, None],
+                               com)
+
+                d = com - positions[pair_t]
+                r2 = np.einsum("ij,ij->i", d, d) + eps2
+                single = (end - start) == 1
+                leaf = single | (level == self.depth)
+                # Massless cells exert nothing, so there is no point opening them
+                accept = leaf | (mass_ex <= 0) | (cells["size"] ** 2 < theta2 * r2)
+
+                use = accept & (mass_ex > 0)
+                w = G * mass_ex[use] / (r2[use] * np.sqrt(r2[use]))
+                t = pair_l[use]
+                acc[:, 0] += np.bincount(t, weights=w * d[use, 0], minlength=n)
+                acc[:, 1] += np.bincount(t, weights=w * d[use, 1], minlength=n)
+
+                # Open the rest: pair each target with every child cell
+                opened = ~accept
+                if level == self.depth or not opened.any():
+                    break
+                nxt = self.levels[level + 1]
+                parent_keys = cells["keys"][pair_c[opened]]
+                lo = np.searchsorted(nxt["keys"], parent_keys << 2, side="left")
+                hi = np.searchsorted(nxt["keys"], (parent_keys + 1) << 2, side="left")
+                counts = hi - lo
+                pair_t = np.repeat(pair_t[opened], counts)
+                pair_l = np.repeat(pair_l[opened], counts)
+                offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                pair_c = np.repeat(lo, counts) + offsets
+        return acc
+
+
+class NBodySystem:
+    """Bodies under mutual gravity, integrated with leapfrog and Barnes-Hut forces"""
+
+    def __init__(self, positions, velocities, masses, G, theta=0.7, softening=1.0):
+        self.pos = np.array(positions, dtype=float)
+        self.vel = np.array(velocities, dtype=float)
+        self.mass = np.array(masses, dtype=float)
+        self.G = G
+        self.theta = theta
+        self.softening = softening
+        self.acc = self.accelerations()
+
+    def accelerations(self):
+        tree = QuadTree(self.pos, self.mass)
+        return tree.accelerations(self.pos, self.mass, self.G, self.theta, self.softening)
+
+    def step(self, dt=1.0):
+        """One kick-drift-kick leapfrog step"""
+        self.vel += 0.5 * dt * self.acc
+        self.pos += dt * self.vel
+        self.acc = self.accelerations()
+        self.vel += 0.5 * dt * self.acc
+
+    def energy(self):
+        """Total energy by direct summation (O(N²); for checking small systems)"""
+        kinetic = 0.5 * np.sum(self.mass * np.einsum("ij,ij->i", self.vel, self.vel))
+        d = self.pos[:, None, :] - self.pos[None, :, :]
+        r = np.sqrt(np.einsum("ijk,ijk->ij", d, d) + self.softening ** 2)
+        mm = self.mass[:, None] * self.mass[None, :]
+        potential = -self.G * np.sum(np.triu(mm / r, 1))
+        return kinetic + potential
+
+
+class NBodyDriver:
+    """Plugs an NBodySystem into an OrbitEngine in place of the scripted orbits
+
+    The engine's top-level bodies (parent == -1) plus the Sun are
+    integrated; positions are reported relative to the Sun in the
+    orbital plane (no view squash), which is what the engine expects.
+    """
+
+    def __init__(self, engine, masses, sun_mass, G=None, theta=0.7, softening=1.0):
+        self.indices = np.flatnonzero(engine.parent < 0)
+        G = gravity_constant(sun_mass) if G is None else G
+
+        rel = engine.positions[self.indices].copy()
+        rel[:, 1] /= engine.squash          # undo the drawing squash: true orbital plane
+        r = np.hypot(rel[:, 0], rel[:, 1])
+        r = np.where(r > 0, r, 1.0)
+        # Start on circular orbits around the Sun, moving counter-clockwise
+        speed = np.sqrt(G * sun_mass / r)
+        vel = np.column_stack((-rel[:, 1], rel[:, 0])) / r[:, None] * speed[:, None]
+
+        positions = np.vstack([[0.0, 0.0], rel])
+        velocities = np.vstack([[0.0, 0.0], vel])
+        body_masses = np.concatenate([[sun_mass], np.asarray(masses, dtype=float)[self.indices]])
+        # Put the centre of mass at rest so the whole system doesn't drift
+        velocities -= np.average(velocities, axis=0, weights=body_masses)
+        self.system = NBodySystem(positions, velocities, body_masses, G, theta, softening)
+        self.positions = self._heliocentric()
+        self.prev_positions = self.positions.copy()
+
+    @classmethod
+    def from_info(cls, engine, info, **options):
+        """Driver with masses from planet_info-style records (the Sun's included)"""
+        return cls(engine, masses_from_info(engine, info), parse_mass_kg(info["sun"]["mass"]), **options)
+
+    def _heliocentric(self):
+        return self.system.pos[1:] - self.system.pos[0]
+
+    def step(self, dt=1.0):
+        self.prev_positions = self.positions
+        self.system.step(dt)
+        self.positions = self._heliocentric()
+
+    # ---- checkpoints (see session.py) ----
+    def checkpoint(self):
+        """Positions, velocities and accelerations as named arrays"""
+        s = self.system
+        return {"nbody_pos": s.pos.copy(), "nbody_vel": s.vel.copy(), "nbody_acc": s.acc.copy(),
+                "nbody_prev": self.prev_positions.copy()}
+
+    def restore(self, state):
+        """Load a checkpoint() of a driver over the same bodies"""
+        s = self.system
+        if state["nbody_pos"].shape != s.pos.shape:
+            raise ValueError("the checkpoint's gravity bodies don't match this driver's")
+        s.pos[:], s.vel[:], s.acc[:] = state["nbody_pos"], state["nbody_vel"], state["nbody_acc"]
+        self.positions = self._heliocentric()
+        self.prev_positions = np.array(state["nbody_prev"], dtype=float)
+
+
+def masses_from_info(engine, info, default=0.0):
+    """Mass (kg) of every engine body from planet_info, by lower-cased name"""
+    masses = np.full(engine.count, default)
+    for i, name in enumerate(engine.names):
+        entry = info.get((name or "").lower())
+        if entry and "mass" in entry:
+            masses[i] = parse_mass_kg(entry["mass"])
+    return masses
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from orbit_engine import OrbitEngine, add_asteroid_belt
+    from solar_data import SOLAR_BODIES, planet_info
+
+    parser = argparse.ArgumentParser(description="Time Barnes-Hut steps without a display")
+    parser.add_argument("--bodies", type=int, default=20000, help="massless asteroids to add")
+    parser.add_argument("--steps", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = OrbitEngine.from_specs(SOLAR_BODIES)
+    add_asteroid_belt(engine, args.bodies, seed=1)
+    driver = NBodyDriver.from_info(engine, planet_info)
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        driver.step()
+    elapsed = time.perf_counter() - start
+    print(f"🌍 {len(driver.indices) + 1} bodies: {elapsed / args.steps * 1000:.1f} ms per step")
@@ -0,0 +1,314 @@
+# =====================================================================
+# 🎞️ OFFSCREEN RENDERER
+# =====================================================================
+# Draws the same scene as the turtle window (background, stars, trails,
+# the Sun and planets with their GIFs, name and size labels) straight
+# into Pillow images, so renders need no display at all.
+#
+#   • Static layers (background picture and stars) are drawn once and
+#     copied for every frame.
+#   • Sprites are decoded once per process and alpha-composited at their
+#     native size, exactly like turtle image shapes.
+#   • export() steps the engine in the main process and hands each
+#     frame's positions and trails to a process pool; workers render
+#     and encode the frames in parallel, while a bounded queue of jobs
+#     keeps memory flat on long time-lapses. Finished frames go straight
+#     to disk: PNGs from the workers, raw video to ffmpeg, and GIF
+#     frames (each encoded on its own by a worker) spliced onto the end
+#     of the animated GIF as they arrive.
+#
+# Output: a PNG sequence, an animated GIF, and/or a video when ffmpeg
+# is on the PATH. Run "python offscreen_render.py --help" for options.
+# =====================================================================
+
+import io
+import os
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from assets import ASSET_DIR, asset_path
+from camera import Camera
+from starfield import StarField
+from trails import TrailBuffer
+from viewport import visible_mask, dot_mask, declutter
+
+
+def _font(size, bold=False):
+    names = ("arialbd.ttf", "DejaVuSans-Bold.ttf") if bold else ("arial.ttf", "DejaVuSans.ttf")
+    for name in names:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            pass
+    return ImageFont.load_default(size)
+
+
+def _load_sprite(path):
+    """RGBA sprite from a GIF, or None if it can't be read"""
+    try:
+        with Image.open(path) as im:
+            return im.convert("RGBA")
+    except OSError:
+        return None
+
+
+class SceneRenderer:
+    """Renders frames of the solar system into Pillow images"""
+
+    def __init__(self, specs, parent, width=1400, height=900, asset_dir=ASSET_DIR,
+                 num_stars=50, star_seed=2024, sun_size=1.2, labels=True, trail_width=1):
+        self.width = width
+        self.height = height
+        self.labels = labels
+        self.trail_width = trail_width
+        self.parent = np.asarray(parent)
+        self.colors = [spec["color"] if spec.get("trail", True) else None for spec in specs]
+        self.names = [spec["name"] for spec in specs]
+        self.labelled = np.array([bool(name) for name in self.names])   # unnamed dots get no label, as live
+        self.size_labels = [spec.get("size_label") or "" for spec in specs]
+        self.sizes = np.array([spec["size"] for spec in specs], dtype=float)
+        self.name_font = _font(12, bold=True)
+        self.size_font = _font(9)
+
+        def load(key):
+            path = asset_path(key, asset_dir)
+            return _load_sprite(path) if path else None
+
+        self.sprites = [load(spec["gif_key"]) for spec in specs]
+        self.sun = load("sun")
+        # Fallback circles use turtle's 20 px "circle" shape scaled by the size
+        self.sun_radius = self.sun.width / 2 if self.sun else 10 * 3.0 * sun_size
+        self.radii = np.array([s.width / 2 if s else 10 * size for s, size in zip(self.sprites, self.sizes)])
+        self.base = self._static_layers(load("background"), num_stars, star_seed)
+
+    def _static_layers(self, background, num_stars, star_seed):
+        base = Image.new("RGB", (self.width, self.height), "black")
+        if background is not None:
+            # turtle's bgpic centres the picture at its native size
+            base.paste(background, ((self.width - background.width) // 2,
+                                    (self.height - background.height) // 2), background)
+        stars = StarField(num_stars, self.width, self.height, seed=star_seed)
+        draw = ImageDraw.Draw(base)
+        for x, y, size in zip(*self._to_pixels(np.column_stack((stars.x, stars.y))).T, stars.size):
+            r = size / 2
+            draw.ellipse((x - r, y - r, x + r, y + r), fill=stars.color)
+        return base
+
+    def _to_pixels(self, screen):
+        # Turtle coordinates: origin at the centre, y up
+        out = np.array(screen, dtype=float)
+        out[..., 0] += self.width / 2
+        out[..., 1] = self.height / 2 - out[..., 1]
+        return out
+
+    def _paste(self, frame, sprite, x, y):
+        frame.paste(sprite, (int(round(x - sprite.width / 2)), int(round(y - sprite.height / 2))), sprite)
+
+    def render(self, positions, trails=None, camera=None):
+        """One RGB frame from world positions and optional (bodies, points, 2) world trails"""
+        camera = camera or Camera()
+        frame = self.base.copy()
+        draw = ImageDraw.Draw(frame)
+        half_w, half_h = self.width / 2, self.height / 2
+
+        if trails is not None and trails.shape[1] >= 2:
+            pixels = self._to_pixels(camera.to_screen(trails))
+            for i, color in enumerate(self.colors):
+                if color:
+                    draw.line(pixels[i].ravel().tolist(), fill=color, width=self.trail_width)
+
+        sx, sy = self._to_pixels(camera.to_screen((0.0, 0.0)))
+        if self.sun is not None:
+            self._paste(frame, self.sun, sx, sy)
+        else:
+            r = self.sun_radius
+            draw.ellipse((sx - r, sy - r, sx + r, sy + r), fill="yellow")
+
+        screen = camera.to_screen(positions)
+        pixels = self._to_pixels(screen)
+        visible = visible_mask(screen, self.radii, half_w, half_h)
+        as_dot = dot_mask(screen, self.radii, self.parent, camera.zoom)
+        for i in np.flatnonzero(visible):
+            x, y = pixels[i]
+            if self.sprites[i] is not None and not as_dot[i]:
+                self._paste(frame, self.sprites[i], x, y)
+            else:
+                r = 10 * self.sizes[i]
+                draw.ellipse((x - r, y - r, x + r, y + r), fill=self.colors[i] or "white")
+
+        if self.labels:
+            shown = declutter(screen, self.radii, visible & self.labelled)
+            for i in np.flatnonzero(shown):
+                x, y = pixels[i]
+                # Same offsets as the live labels: names 25 px above, sizes 25 px below
+                draw.text((x, y - 25), self.names[i], fill="white", font=self.name_font, anchor="ms")
+                if not as_dot[i] and self.size_labels[i]:
+                    draw.text((x, y + 25), self.size_labels[i], fill="yellow", font=self.size_font, anchor="ms")
+        return frame
+
+
+# ---- worker side (runs in the pool processes) ----
+_worker = {}
+
+
+def _init_worker(specs, parent, options):
+    _worker["renderer"] = SceneRenderer(specs, parent, **options)
+
+
+def _render_job(positions, trails, camera, png_path, scale, want, duration=0):
+    """Render one frame; save it as PNG and/or return its bytes for the GIF or video writer"""
+    frame = _worker["renderer"].render(positions, trails, camera)
+    if scale != 1.0:
+        frame = frame.resize((int(frame.width * scale), int(frame.height * scale)), Image.LANCZOS)
+    if png_path:
+        frame.save(png_path, compress_level=1)
+    if want == "gif":
+        # Quantizing and compressing are the slow part; do them here, in parallel
+        out = io.BytesIO()
+        frame.quantize(colors=255, method=Image.Quantize.FASTOCTREE).save(out, "GIF", duration=duration, loop=0)
+        return out.getvalue()
+    if want == "video":
+        return frame.tobytes()
+    return None
+
+
+def _gif_blocks(data):
+    """Split a one-frame GIF into (header with its colour table, application extensions,
+    other extensions, image from its descriptor on); the trailer is dropped"""
+    table = 3 << ((data[10] & 7) + 1) if data[10] & 0x80 else 0
+    at = 13 + table
+    apps, extensions = b"", b""
+    while data[at] == 0x21:                 # "!" extension: label, then sub-blocks up to a 0 length
+        end = at + 2
+        while data[end]:
+            end += data[end] + 1
+        end += 1
+        if data[at + 1] == 0xFF:
+            apps += data[at:end]
+        else:
+            extensions += data[at:end]
+        at = end
+    return data[:13 + table], apps, extensions, data[at:-1]
+
+
+class _GifWriter:
+    """Appends one-frame GIFs to an animated GIF on disk as they arrive
+
+    The first frame keeps its header (and the loop extension); every
+    later frame's colour table moves into its image descriptor as a
+    local table, so frames quantized separately keep their own colours.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.frames = 0
+
+    def add(self, data):
+        head, apps, extensions, image = _gif_blocks(data)
+        if not self.frames:
+            self.file.write(head + apps + extensions + image)
+        else:
+            flags = image[9] | 0x80 | (head[10] & 7)
+            self.file.write(extensions + image[:9] + bytes([flags]) + head[13:] + image[10:])
+        self.frames += 1
+
+    def close(self):
+        self.file.write(b";")
+        self.file.close()
+
+
+def export(engine, specs, frames, ticks_per_frame=1.0, out_dir=None, gif=None, video=None,
+           fps=30, scale=1.0, trail_points=60, workers=None, camera=None, **options):
+    """Step the engine and render frames in a process pool; returns the number of frames written"""
+    if gif and video:
+        raise ValueError("export either a GIF or a video per run")
+    if video and shutil.which("ffmpeg") is None:
+        raise RuntimeError("video export needs ffmpeg on the PATH")
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    want = "gif" if gif else "video" if video else None
+    width = int(options.get("width", 1400) * scale)
+    height = int(options.get("height", 900) * scale)
+
+    encoder = None
+    if video:
+        encoder = subprocess.Popen(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+             "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+             "-pix_fmt", "yuv420p", video],
+            stdin=subprocess.PIPE,
+        )
+    gif_writer = _GifWriter(gif) if gif else None
+
+    def collect(result):
+        if want == "gif":
+            gif_writer.add(result)
+        elif want == "video":
+            encoder.stdin.write(result)
+
+    trails = TrailBuffer(engine.count, trail_points)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(specs, engine.parent.copy(), options)) as pool:
+        pending = deque()
+        for index in range(frames):
+            if index:
+                if engine.driver is not None:
+                    for _ in range(max(1, int(round(ticks_per_frame)))):
+                        engine.step()
+                else:
+                    engine.step(ticks_per_frame)
+            trails.push(engine.positions)
+            png_path = os.path.join(out_dir, f"frame_{index:05d}.png") if out_dir else None
+            pending.append(pool.submit(_render_job, engine.positions.copy(), trails.ordered(),
+                                       camera, png_path, scale, want, int(1000 / fps)))
+            # Keep a few frames per worker in flight; results come back in order
+            while len(pending) > 2 * workers:
+                collect(pending.popleft().result())
+        while pending:
+            collect(pending.popleft().result())
+
+    if encoder is not None:
+        encoder.stdin.close()
+        encoder.wait()
+    if gif_writer is not None:
+        gif_writer.close()
+    return frames
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from kepler import TICKS_PER_DAY
+    from orbit_engine import OrbitEngine
+    from solar_data import SOLAR_BODIES, planet_info
+
+    parser = argparse.ArgumentParser(description="Render a solar system time-lapse without a display")
+    parser.add_argument("--frames", type=int, default=365)
+    parser.add_argument("--days-per-frame", type=float, default=1.0)
+    parser.add_argument("--kepler", action="store_true", help="use Kepler orbits")
+    parser.add_argument("--out", help="directory for a PNG sequence")
+    parser.add_argument("--gif", help="animated GIF to write")
+    parser.add_argument("--video", help="video file to write (needs ffmpeg)")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--scale", type=float, default=1.0, help="shrink frames, e.g. 0.5 for GIFs")
+    parser.add_argument("--zoom", type=float, default=1.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-labels", action="store_true")
+    args = parser.parse_args()
+    if not (args.out or args.gif or args.video):
+        parser.error("give at least one of --out, --gif or --video")
+
+    engine = OrbitEngine.from_specs(SOLAR_BODIES, info=planet_info, kepler=args.kepler)
+    start = time.perf_counter()
+    count = export(engine, SOLAR_BODIES, args.frames, args.days_per_frame * TICKS_PER_DAY,
+                   out_dir=args.out, gif=args.gif, video=args.video, fps=args.fps, scale=args.scale,
+                   workers=args.workers, camera=Camera(zoom=args.zoom), labels=not args.no_labels)
+    elapsed = time.perf_counter() - start
+    print(f"🎞️ {count} frames in {elapsed:.1f}s ({count / elapsed:.1f} fps)")
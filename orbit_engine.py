@@ -0,0 +1,398 @@
+# =====================================================================
+# ⚙️ ORBIT ENGINE
+# =====================================================================
+# Headless orbit simulation for the solar system app.
+#
+# Every body's state lives in NumPy arrays (radius, offset, angle,
+# speed, parent index), so one call to step() advances all bodies at
+# once and fills a (N, 2) positions array that the renderer reads.
+# Nothing in here needs a display, so the same engine runs inside the
+# turtle window, in scripts, or with an asteroid belt of 10k+ bodies.
+#
+# Bodies follow either the classic squashed circles or, in Kepler mode,
+# ellipses from real orbital elements (see kepler.py).
+#
+# Satellites (moons, moons of moons...) form a tree over the parent
+# index. Bodies are grouped by depth once, when they are added; every
+# update then adds each level's parent positions in one batched step,
+# shallowest level first, so a moon always sees its parent's position
+# from the same tick, whatever the number of moons.
+#
+# Units:
+#   • distances are screen pixels (the orbit radius the app draws)
+#   • speeds are radians per tick (one tick = one 15 ms physics step)
+#
+# Run "python orbit_engine.py --bodies 10000" for a headless timing run.
+# =====================================================================
+
+import numpy as np
+
+from kepler import TICKS_PER_DAY, mean_motion, orbit_positions, parse_period_days
+
+# Orbits are drawn as circles squashed vertically to fake a tilted view
+ORBIT_SQUASH = 0.6
+
+# Per-body arrays: name -> (dtype, fill value)
+_FIELDS = {
+    "_radius": (float, 0.0),          # circle radius, or semi-major axis in Kepler mode
+    "_offset": (float, 0.0),
+    "_angle": (float, 0.0),           # orbit angle, or mean anomaly in Kepler mode
+    "_prev_angle": (float, 0.0),
+    "_base_speed": (float, 0.0),      # radians per tick actually used by step()
+    "_parent": (np.int64, -1),
+    "_circular_speed": (float, 0.0),  # hand-tuned speed of the circular orbit
+    "_mean_motion": (float, 0.0),     # Kepler mean motion, from the orbital period
+    "_eccentricity": (float, 0.0),
+    "_inclination": (float, 0.0),     # radians
+    "_node": (float, 0.0),            # longitude of the ascending node, radians
+    "_periapsis": (float, 0.0),       # argument of periapsis, radians
+    "_kepler": (bool, False),         # which bodies follow elliptical orbits
+}
+
+
+def hierarchy_levels(parent):
+    """Satellite indices grouped by depth (moons, then moons of moons...), shallowest first"""
+    parent = np.asarray(parent, dtype=np.int64)
+    moons = parent >= 0
+    depth = np.zeros(len(parent), dtype=np.int64)
+    # Each pass settles one more level of the tree
+    while True:
+        deeper = np.where(moons, depth[np.maximum(parent, 0)] + 1, 0)
+        if np.array_equal(deeper, depth):
+            break
+        depth = deeper
+    return [np.flatnonzero(depth == d) for d in range(1, int(depth.max(initial=0)) + 1)]
+
+
+def local_positions(angle, radius, offset, squash, kepler_bodies=None, eccentricity=None,
+                    inclination=None, node=None, periapsis=None, out=None):
+    """Positions of bodies relative to whatever they orbit (circles, or ellipses for kepler_bodies)"""
+    pos = np.empty((len(angle), 2)) if out is None else out
+    np.cos(angle, out=pos[:, 0])
+    pos[:, 0] *= radius
+    pos[:, 0] += offset
+    np.sin(angle, out=pos[:, 1])
+    pos[:, 1] *= radius * squash
+
+    # Elliptical orbits: one batched Kepler solve for every such body
+    k = kepler_bodies
+    if k is not None and len(k):
+        pos[k] = orbit_positions(radius[k], eccentricity[k], inclination[k], node[k],
+                                 periapsis[k], angle[k], squash=squash)
+        pos[k, 0] += offset[k]
+    return pos
+
+
+class OrbitEngine:
+    """Batched orbit state for every body, stored as NumPy arrays"""
+
+    def __init__(self, capacity=16, squash=ORBIT_SQUASH):
+        self.squash = squash
+        self.count = 0
+        self.time = 0.0            # simulated ticks since the last reset
+        self.names = []
+        for name, (dtype, fill) in _FIELDS.items():
+            setattr(self, name, np.full(capacity, fill, dtype=dtype))
+        self._positions = np.zeros((capacity, 2))
+        self._levels = []          # satellites by depth, see hierarchy_levels()
+        # Optional physics driver (e.g. nbody.NBodyDriver) that moves some bodies itself
+        self.driver = None
+        self._kepler_bodies = np.zeros(0, dtype=np.int64)
+
+    # ---- array views (only the live bodies) ----
+    @property
+    def radius(self):
+        return self._radius[:self.count]
+
+    @property
+    def offset(self):
+        return self._offset[:self.count]
+
+    @property
+    def angle(self):
+        return self._angle[:self.count]
+
+    @property
+    def base_speed(self):
+        return self._base_speed[:self.count]
+
+    @property
+    def parent(self):
+        return self._parent[:self.count]
+
+    @property
+    def eccentricity(self):
+        return self._eccentricity[:self.count]
+
+    @property
+    def kepler(self):
+        return self._kepler[:self.count]
+
+    @property
+    def positions(self):
+        return self._positions[:self.count]
+
+    # ---- building ----
+    def _reserve(self, extra):
+        needed = self.count + extra
+        capacity = len(self._radius)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, (dtype, fill) in _FIELDS.items():
+            new = np.full(capacity, fill, dtype=dtype)
+            new[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, new)
+        positions = np.zeros((capacity, 2))
+        positions[:self.count] = self._positions[:self.count]
+        self._positions = positions
+
+    def add_body(self, radius, speed, parent=-1, offset=0.0, angle=0.0, name=None):
+        """Add one body and return its index"""
+        return int(self.add_bodies([radius], [speed], [parent], [offset], [angle],
+                                   names=[name])[0])
+
+    def add_bodies(self, radius, speed, parent=None, offset=None, angle=None, names=None,
+                   eccentricity=0.0, inclination=0.0, node=0.0, periapsis=0.0,
+                   mean_motion=None, kepler=False):
+        """Add many bodies at once (e.g. an asteroid belt) and return their indices
+
+        The orbital elements (angles in radians) are used by bodies in
+        Kepler mode; mean_motion defaults to speed.
+        """
+        radius = np.asarray(radius, dtype=float)
+        n = len(radius)
+        parent = np.full(n, -1) if parent is None else np.asarray(parent, dtype=np.int64)
+        if np.any(parent >= self.count + np.arange(n)):
+            raise ValueError("a body's parent must be added before the body itself")
+
+        self._reserve(n)
+        idx = np.arange(self.count, self.count + n)
+        self._radius[idx] = radius
+        self._circular_speed[idx] = speed
+        self._mean_motion[idx] = speed if mean_motion is None else mean_motion
+        self._eccentricity[idx] = eccentricity
+        self._inclination[idx] = inclination
+        self._node[idx] = node
+        self._periapsis[idx] = periapsis
+        self._kepler[idx] = kepler
+        self._base_speed[idx] = np.where(self._kepler[idx], self._mean_motion[idx], self._circular_speed[idx])
+        self._parent[idx] = parent
+        self._offset[idx] = 0.0 if offset is None else offset
+        self._angle[idx] = 0.0 if angle is None else angle
+        self._prev_angle[idx] = self._angle[idx]
+        self.names.extend(names if names is not None else [None] * n)
+        self.count += n
+
+        self._levels = hierarchy_levels(self.parent)
+        self._kepler_bodies = np.flatnonzero(self.kepler)
+        self.update_positions()
+        return idx
+
+    def set_kepler(self, enabled, idx=None):
+        """Switch bodies (default: all) between circular and Kepler orbits"""
+        idx = slice(0, self.count) if idx is None else idx
+        self._kepler[idx] = enabled
+        n = self.count
+        self._base_speed[:n] = np.where(self._kepler[:n], self._mean_motion[:n], self._circular_speed[:n])
+        self._kepler_bodies = np.flatnonzero(self.kepler)
+        self.update_positions()
+
+    @classmethod
+    def from_specs(cls, specs, squash=ORBIT_SQUASH, info=None, kepler=False,
+                   ticks_per_day=TICKS_PER_DAY):
+        """Build an engine from SOLAR_BODIES-style rows (parents named by key)
+
+        With info (planet_info), each body's Kepler mean motion comes from
+        its "orbital_period" string (moons on a slower clock, see
+        _spec_motions); kepler=True starts in that mode.
+        """
+        engine = cls(capacity=max(16, len(specs)), squash=squash)
+        index_by_key = {}
+        for spec, motion in zip(specs, cls._spec_motions(specs, info, ticks_per_day)):
+            key = spec.get("info_key", spec["name"].lower())
+            parent_key = spec.get("parent", "sun")
+            parent = -1 if parent_key == "sun" else index_by_key[parent_key]
+
+            node = np.radians(spec.get("node", 0.0))
+            i = int(engine.add_bodies(
+                [spec["radius"]], [spec["speed"]], [parent], [spec.get("offset", 0)], names=[spec["name"]],
+                eccentricity=spec.get("eccentricity", 0.0),
+                inclination=np.radians(spec.get("inclination", 0.0)),
+                node=node,
+                # Tables give the longitude of perihelion; the solver wants it measured from the node
+                periapsis=np.radians(spec.get("perihelion", 0.0)) - node,
+                mean_motion=motion, kepler=kepler,
+            )[0])
+            index_by_key[key] = i
+        return engine
+
+    @staticmethod
+    def _spec_motions(specs, info, ticks_per_day):
+        """Kepler mean motion (radians per tick) of every row, moons on their system's clock
+
+        A tick is about two days, so a real moon period would turn Io
+        seven radians per step and the eye would see it jump at random.
+        Each satellite system therefore runs slower, by one factor for
+        all its moons: the fastest one moves at its hand-tuned circular
+        speed and the others keep their real period ratios.
+        """
+        motions, systems = [], {}
+        for i, spec in enumerate(specs):
+            key = spec.get("info_key", spec["name"].lower())
+            period = (info or {}).get(key, {}).get("orbital_period")
+            motions.append(float(mean_motion(parse_period_days(period), ticks_per_day)) if period else spec["speed"])
+            if spec.get("parent", "sun") != "sun":
+                systems.setdefault(spec["parent"], []).append(i)
+        motions = np.array(motions)
+        for moons in systems.values():
+            fastest = motions[moons].max()
+            allowed = max(specs[i]["speed"] for i in moons)
+            if fastest > allowed:
+                motions[moons] *= allowed / fastest
+        return motions
+
+    # ---- simulation ----
+    def update_positions(self):
+        """Recompute every position from the current angles"""
+        self._compute_positions(self._angle[:self.count], self._positions[:self.count])
+
+    def _compute_positions(self, angle, pos, driven=None):
+        n = self.count
+        local_positions(angle, self._radius[:n], self._offset[:n], self.squash, self._kepler_bodies,
+                        self._eccentricity, self._inclination, self._node, self._periapsis, out=pos)
+        return self.apply_hierarchy(pos, driven)
+
+    def apply_hierarchy(self, pos, driven=None):
+        """Turn local positions into world positions: physics-driven bodies, then satellites"""
+        # Bodies moved by a physics driver (in the true orbital plane)
+        if self.driver is not None:
+            driven = self.driver.positions if driven is None else driven
+            pos[self.driver.indices, 0] = driven[:, 0]
+            pos[self.driver.indices, 1] = driven[:, 1] * self.squash
+
+        # Satellites orbit their parent: one batched add per level, parents first
+        for level in self._levels:
+            pos[level] += pos[self._parent[level]]
+
+        return pos
+
+    def step(self, dt=1.0):
+        """Advance every body by dt ticks in one batched update"""
+        n = self.count
+        self._prev_angle[:n] = self._angle[:n]
+        self._angle[:n] += self._base_speed[:n] * dt
+        if self.driver is not None:
+            self.driver.step(dt)
+        self.time += dt
+        self.update_positions()
+
+    def attach_driver(self, driver):
+        """Hand some bodies to a physics driver (None gives them back to their orbits)"""
+        self.driver = driver
+        self.update_positions()
+
+    def interpolated_positions(self, alpha):
+        """Positions a fraction alpha of the way from the previous step to the current one"""
+        if alpha >= 1.0:
+            return self.positions
+        n = self.count
+        prev = self._prev_angle[:n]
+        angle = prev + (self._angle[:n] - prev) * alpha
+        driven = None
+        if self.driver is not None:
+            old = self.driver.prev_positions
+            driven = old + (self.driver.positions - old) * alpha
+        return self._compute_positions(angle, np.empty((n, 2)), driven)
+
+    def positions_at(self, t, out=None):
+        """Positions at simulated time t (ticks) without changing the state"""
+        if self.driver is not None and t != self.time:
+            raise RuntimeError("a physics driver can't be evaluated at other times; step it instead")
+        n = self.count
+        angle = self._angle[:n] + self._base_speed[:n] * (t - self.time)
+        return self._compute_positions(angle, np.empty((n, 2)) if out is None else out)
+
+    def seek(self, t):
+        """Jump straight to simulated time t (ticks); speeds are constant, so this is exact"""
+        if self.driver is not None:
+            raise RuntimeError("a physics driver can't seek; step it instead")
+        n = self.count
+        self._angle[:n] += self._base_speed[:n] * (t - self.time)
+        self._prev_angle[:n] = self._angle[:n]
+        self.time = float(t)
+        self.update_positions()
+
+    def set_state(self, angle, time):
+        """Load angles and simulated time computed elsewhere (e.g. by parallel workers)"""
+        n = self.count
+        self._angle[:n] = angle
+        self._prev_angle[:n] = angle
+        self.time = float(time)
+        self.update_positions()
+
+    def checkpoint(self):
+        """Everything step() changes, as named arrays (the driver's too); see session.py"""
+        n = self.count
+        state = {
+            "time": np.array(self.time),
+            "angle": self._angle[:n].copy(),
+            "prev_angle": self._prev_angle[:n].copy(),
+            "kepler": self._kepler[:n].copy(),
+        }
+        if self.driver is not None:
+            state.update(self.driver.checkpoint())
+        return state
+
+    def restore(self, state):
+        """Load a checkpoint() of an engine with the same bodies (attach the driver first)"""
+        n = self.count
+        if len(state["angle"]) != n:
+            raise ValueError(f"the checkpoint has {len(state['angle'])} bodies, the engine {n}")
+        self._angle[:n] = state["angle"]
+        self._prev_angle[:n] = state["prev_angle"]
+        self.time = float(state["time"])
+        if self.driver is not None:
+            self.driver.restore(state)
+        self.set_kepler(state["kepler"])     # also recomputes speeds and positions
+
+    def reset(self):
+        """Put every body back at angle 0"""
+        self._angle[:self.count] = 0.0
+        self._prev_angle[:self.count] = 0.0
+        self.time = 0.0
+        self.update_positions()
+
+
+def add_asteroid_belt(engine, count, inner=370, outer=440, seed=None):
+    """Scatter count small bodies between two radii, with Kepler-like speeds"""
+    rng = np.random.default_rng(seed)
+    radius = rng.uniform(inner, outer, count)
+    # Speed falls off as r^-1.5, anchored to Earth's 0.035 rad/tick at r=280
+    speed = 0.035 * (radius / 280.0) ** -1.5
+    angle = rng.uniform(0, 2 * np.pi, count)
+    return engine.add_bodies(radius, speed, angle=angle)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from solar_data import SOLAR_BODIES
+
+    parser = argparse.ArgumentParser(description="Run the orbit engine without a display")
+    parser.add_argument("--bodies", type=int, default=10000, help="asteroids to add to the solar system")
+    parser.add_argument("--ticks", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = OrbitEngine.from_specs(SOLAR_BODIES)
+    add_asteroid_belt(engine, args.bodies, seed=1)
+
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        engine.step()
+    elapsed = time.perf_counter() - start
+
+    print(f"⚙️ {engine.count} bodies, {args.ticks} ticks: "
+          f"{elapsed / args.ticks * 1000:.3f} ms per tick (budget 15 ms)")
@@ -0,0 +1,312 @@
+# =====================================================================
+# 🧵 PARALLEL PHYSICS
+# =====================================================================
+# Multi-core stepping that keeps the Tk main thread free.
+#
+#   • All body state lives in ONE multiprocessing.shared_memory block:
+#     the orbit arrays, three position frames and (in gravity mode) the
+#     N-body positions, velocities, accelerations and masses. Worker
+#     processes map the same block, so nothing is pickled per step.
+#   • Each worker owns an index range: it advances those bodies' angles
+#     and computes their orbit positions (or, with gravity on, their
+#     Barnes-Hut accelerations). The quadtree is built once per gravity
+#     step, into the same block, and every worker walks that one tree.
+#   • A background thread drives the pool, so a heavy step never blocks
+#     the event loop. Finished frames rotate through three buffers: the
+#     renderer gets a zero-copy view of the latest one while the next
+#     step writes into a buffer nobody is reading.
+#   • snapshot() writes the state back into the engine and reseed()
+#     picks it up again after the engine was changed directly, both
+#     without stopping the pool.
+#
+# On platforms that start workers with "spawn" (Windows, macOS) the
+# calling script must keep its start-up code under
+# if __name__ == "__main__".
+# =====================================================================
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from orbit_engine import local_positions
+from nbody import TREE_DEPTH, QuadTree
+
+_ORBIT_FIELDS = ("angle", "base_speed", "radius", "offset", "eccentricity",
+                 "inclination", "node", "periapsis", "kepler")
+_NBODY_FIELDS = ("pos", "vel", "acc")
+_TREE_FIELDS = ("keys", "start", "end", "mass", "com")
+_FRAMES = 3
+
+
+class SharedBodyArrays:
+    """Body arrays (and the step's Barnes-Hut tree) carved out of one shared-memory block"""
+
+    def __init__(self, count, nbody_count=0, name=None):
+        self.count = count
+        self.nbody_count = nbody_count
+        levels = TREE_DEPTH + 1
+        layout = [(f, (count,), np.float64) for f in _ORBIT_FIELDS]
+        layout.append(("frames", (_FRAMES, count, 2), np.float64))
+        layout += [(f, (nbody_count, 2), np.float64) for f in _NBODY_FIELDS]
+        layout.append(("mass", (nbody_count,), np.float64))
+        # A level never has more cells than there are bodies
+        layout += [("tree_rank", (nbody_count,), np.int64), ("tree_cells", (levels,), np.int64),
+                   ("tree_size", (1,), np.float64)]
+        layout += [("tree_" + f, (levels, nbody_count), np.int64) for f in ("keys", "start", "end")]
+        layout += [("tree_mass", (levels, nbody_count), np.float64),
+                   ("tree_com", (levels, nbody_count, 2), np.float64)]
+        size = sum(int(np.prod(shape)) for _, shape, _ in layout) * 8      # every dtype is 8 bytes
+        self._fields = [field for field, _, _ in layout]
+
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=max(size, 8))
+        offset = 0
+        for field, shape, dtype in layout:
+            view = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            setattr(self, field, view)
+            offset += view.nbytes
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def store_tree(self, tree):
+        """Copy a QuadTree of the N-body positions into the block"""
+        self.tree_rank[:] = tree.rank
+        self.tree_size[0] = tree.size
+        for level, cells in enumerate(tree.levels):
+            k = len(cells["keys"])
+            self.tree_cells[level] = k
+            for field in _TREE_FIELDS:
+                getattr(self, "tree_" + field)[level, :k] = cells[field]
+
+    def load_tree(self):
+        """The stored tree as a QuadTree over views of the block (nothing is copied)"""
+        size = float(self.tree_size[0])
+        levels = []
+        for level, k in enumerate(self.tree_cells):
+            cells = {field: getattr(self, "tree_" + field)[level, :k] for field in _TREE_FIELDS}
+            cells["size"] = size / (1 << level)
+            levels.append(cells)
+        return QuadTree.from_arrays(self.tree_rank, levels, size, depth=len(levels) - 1)
+
+    def close(self):
+        """Drop this process's views; the creating process also frees the block"""
+        for field in self._fields:
+            setattr(self, field, None)
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# ---- worker side (runs in the pool processes) ----
+_worker = {}
+
+
+def _attach(name, count, nbody_count, squash, G, theta, softening):
+    _worker["arrays"] = SharedBodyArrays(count, nbody_count, name=name)
+    _worker["squash"] = squash
+    _worker["gravity"] = (G, theta, softening)
+
+
+def _orbit_slice(lo, hi, dt, frame):
+    """Advance bodies [lo, hi) by dt ticks and write their local positions into a frame"""
+    a = _worker["arrays"]
+    a.angle[lo:hi] += a.base_speed[lo:hi] * dt
+    kepler = np.flatnonzero(a.kepler[lo:hi])
+    local_positions(a.angle[lo:hi], a.radius[lo:hi], a.offset[lo:hi], _worker["squash"], kepler,
+                    a.eccentricity[lo:hi], a.inclination[lo:hi], a.node[lo:hi], a.periapsis[lo:hi],
+                    out=a.frames[frame, lo:hi])
+
+
+def _gravity_slice(lo, hi):
+    """Barnes-Hut accelerations for N-body bodies [lo, hi), walking the step's shared tree"""
+    a = _worker["arrays"]
+    G, theta, softening = _worker["gravity"]
+    a.acc[lo:hi] = a.load_tree().accelerations(a.pos, a.mass, G, theta, softening, targets=np.arange(lo, hi))
+
+
+def _slices(n, parts):
+    bounds = np.linspace(0, n, parts + 1).astype(int)
+    return [(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo]
+
+
+class ParallelStepper:
+    """Steps an OrbitEngine's bodies in a process pool, off the UI thread"""
+
+    def __init__(self, engine, workers=None):
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        driver = engine.driver
+        system = driver.system if driver is not None else None
+        n = engine.count
+
+        self.arrays = SharedBodyArrays(n, len(system.mass) if system is not None else 0)
+        a = self.arrays
+        self.gravity = system is not None
+        self._load_engine()
+        gravity = (system.G, system.theta, system.softening) if system is not None else (0.0, 0.0, 0.0)
+
+        self.pool = ProcessPoolExecutor(
+            self.workers, initializer=_attach,
+            initargs=(a.name, n, a.mass.shape[0], engine.squash) + gravity,
+        )
+        self._latest = 0          # frame holding the newest finished positions
+        self._reading = None      # frame the renderer is looking at right now
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._working = False
+        self._wake = threading.Condition(self._lock)
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="physics", daemon=True)
+        self._thread.start()
+
+    def _load_engine(self):
+        e, a = self.engine, self.arrays
+        for field in _ORBIT_FIELDS:
+            getattr(a, field)[:] = getattr(e, "_" + field)[:a.count]
+        a.frames[:] = e.positions
+        if self.gravity:
+            system = e.driver.system
+            a.pos[:], a.vel[:], a.acc[:], a.mass[:] = system.pos, system.vel, system.acc, system.mass
+        self.time = e.time
+
+    # ---- UI side ----
+    def request(self, steps):
+        """Queue physics steps; returns immediately"""
+        if steps <= 0:
+            return
+        with self._wake:
+            self._pending += steps
+            self._wake.notify_all()
+
+    def latest(self):
+        """Zero-copy view of the newest finished frame (valid until the next latest() call)"""
+        with self._lock:
+            self._reading = self._latest
+            return self.arrays.frames[self._latest]
+
+    def wait(self):
+        """Block until every queued step has been applied"""
+        with self._wake:
+            while self._pending or self._working:
+                self._wake.wait()
+
+    def snapshot(self):
+        """Write the current state back into the engine, keeping the pool running"""
+        self.wait()
+        self.sync_to_engine()
+
+    def reseed(self):
+        """Carry on from the engine's state after it was changed directly (reset, seek, Kepler mode)
+
+        The pool and the shared block are kept; only turning gravity on
+        or off changes their layout and needs a new stepper.
+        """
+        if (self.engine.driver is not None) != self.gravity or self.engine.count != self.arrays.count:
+            raise ValueError("the engine's bodies or gravity mode changed; start a new stepper")
+        self.wait()
+        with self._lock:
+            self._load_engine()
+
+    @property
+    def busy(self):
+        """True while steps are queued or being computed"""
+        with self._lock:
+            return self._pending > 0 or self._working
+
+    # ---- physics thread ----
+    def _run(self):
+        while True:
+            with self._wake:
+                while not self._pending and not self._stopping:
+                    self._wake.wait()
+                if self._stopping:
+                    return
+                steps, self._pending = self._pending, 0
+                self._working = True
+                # Write into a frame that is neither the latest nor being read
+                frame = next(f for f in range(_FRAMES) if f not in (self._latest, self._reading))
+            self._advance(steps, frame)
+            with self._wake:
+                self._latest = frame
+                self._working = False
+                self._wake.notify_all()     # wake wait() callers
+
+    def _advance(self, steps, frame):
+        a = self.arrays
+        slices = _slices(self.arrays.count, self.workers)
+        if self.engine.driver is None:
+            # Scripted orbits have constant speeds: all pending steps in one go
+            list(self.pool.map(_orbit_slice, *zip(*[(lo, hi, float(steps), frame) for lo, hi in slices])))
+            driven = None
+        else:
+            for _ in range(steps):
+                self._gravity_step()
+            list(self.pool.map(_orbit_slice, *zip(*[(lo, hi, float(steps), frame) for lo, hi in slices])))
+            driven = a.pos[1:] - a.pos[0]
+        self.engine.apply_hierarchy(a.frames[frame], driven)
+        self.time += steps
+
+    def _gravity_step(self, dt=1.0):
+        # Kick-drift and the tree build here, once; the force walk is split across the pool
+        a = self.arrays
+        a.vel += 0.5 * dt * a.acc
+        a.pos += dt * a.vel
+        a.store_tree(QuadTree(a.pos, a.mass))
+        slices = _slices(len(a.mass), self.workers)
+        list(self.pool.map(_gravity_slice, *zip(*slices)))
+        a.vel += 0.5 * dt * a.acc
+
+    # ---- shutting down ----
+    def sync_to_engine(self):
+        """Copy the latest state back into the engine (call after the stepper is idle)"""
+        e, a = self.engine, self.arrays
+        if e.driver is not None:
+            system = e.driver.system
+            system.pos[:], system.vel[:], system.acc[:] = a.pos, a.vel, a.acc
+            e.driver.positions = system.pos[1:] - system.pos[0]
+            e.driver.prev_positions = e.driver.positions.copy()
+        e.set_state(a.angle, self.time)
+
+    def close(self):
+        """Stop the physics thread and the pool, write the state back and free shared memory"""
+        with self._wake:
+            self._stopping = True
+            self._wake.notify_all()
+        self._thread.join()
+        self.pool.shutdown()
+        self.sync_to_engine()
+        self.arrays.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from orbit_engine import OrbitEngine, add_asteroid_belt
+    from solar_data import SOLAR_BODIES, planet_info
+
+    parser = argparse.ArgumentParser(description="Time parallel stepping without a display")
+    parser.add_argument("--bodies", type=int, default=200000)
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    engine = OrbitEngine.from_specs(SOLAR_BODIES, info=planet_info)
+    add_asteroid_belt(engine, args.bodies, seed=1)
+    engine.set_kepler(True)
+
+    stepper = ParallelStepper(engine, args.workers)
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        stepper.request(1)
+        while stepper.busy:
+            time.sleep(0.0005)
+    elapsed = time.perf_counter() - start
+    stepper.close()
+    print(f"🧵 {engine.count} bodies on {stepper.workers} workers: "
+          f"{elapsed / args.frames * 1000:.1f} ms per frame")
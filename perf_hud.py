@@ -0,0 +1,235 @@
+# =====================================================================
+# 🩺 PERFORMANCE HUD
+# =====================================================================
+# Live instrumentation for the animation loop.
+#
+#   • FrameStats keeps the last few hundred frame times and per-stage
+#     times (physics, bodies, trails, labels, update...) in fixed-size
+#     NumPy ring buffers; recording a stage is one perf_counter() call.
+#   • PerfHUD shows FPS, p50/p99 frame time, a frame-time histogram,
+#     the canvas item count and the time spent in every stage, inside
+#     any Tk frame (the control panel's status area). It refreshes a
+#     few times a second, not every frame, as a UI task of the app's
+#     scheduler when given one (Tk's after() otherwise).
+#   • FrameStats.profile() starts cProfile and/or tracemalloc, lets N
+#     frames run, then writes the results (a .prof file, the top
+#     functions and the top allocation sites) to disk.
+# =====================================================================
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+
+import numpy as np
+
+# Histogram buckets (ms); the last one catches everything slower
+HISTOGRAM_EDGES = (0, 4, 8, 12, 16, 20, 25, 33, 50, 100)
+
+
+class FrameStats:
+    """Ring buffers of recent frame and stage times"""
+
+    def __init__(self, window=240, time_source=time.perf_counter):
+        self.window = window
+        self.time_source = time_source
+        self.frame_times = np.zeros(window)
+        self.frame_ends = np.zeros(window)
+        self.stages = {}          # stage name -> ring buffer of seconds
+        self.count = 0            # frames recorded so far
+        self._frame_start = None
+        self._mark = None
+        self._current = {}
+        self._session = None
+
+    # ---- recording ----
+    def begin(self):
+        """Start timing a frame"""
+        self._frame_start = self._mark = self.time_source()
+        self._current = {}
+
+    def mark(self, stage):
+        """Charge the time since the last mark to a stage (ignored outside a frame)"""
+        if self._mark is None:
+            return
+        now = self.time_source()
+        self._current[stage] = self._current.get(stage, 0.0) + (now - self._mark)
+        self._mark = now
+
+    def end(self):
+        """Finish the frame and store its times"""
+        if self._frame_start is None:
+            return
+        now = self.time_source()
+        slot = self.count % self.window
+        self.frame_times[slot] = now - self._frame_start
+        self.frame_ends[slot] = now
+        for stage in self._current.keys() - self.stages.keys():
+            self.stages[stage] = np.zeros(self.window)
+        for stage, buf in self.stages.items():
+            buf[slot] = self._current.get(stage, 0.0)
+        self.count += 1
+        self._frame_start = self._mark = None
+        if self._session is not None and self._session.frame_done():
+            self._session = None
+
+    # ---- summaries ----
+    def _recent(self, buf):
+        return buf[:min(self.count, self.window)]
+
+    def fps(self):
+        """Frames per second over the recorded window"""
+        ends = self._recent(self.frame_ends)
+        if len(ends) < 2:
+            return 0.0
+        span = ends.max() - ends.min()
+        return (len(ends) - 1) / span if span > 0 else 0.0
+
+    def percentiles(self, *qs):
+        """Frame-time percentiles in ms"""
+        times = self._recent(self.frame_times)
+        if not len(times):
+            return tuple(0.0 for _ in qs)
+        return tuple(float(v) * 1000 for v in np.percentile(times, qs))
+
+    def stage_means(self):
+        """Mean ms per frame of every stage, slowest first"""
+        means = {name: float(self._recent(buf).mean()) * 1000 for name, buf in self.stages.items()}
+        return dict(sorted(means.items(), key=lambda kv: -kv[1]))
+
+    def histogram(self, edges=HISTOGRAM_EDGES):
+        """Frame counts per bucket of HISTOGRAM_EDGES (last bucket open-ended)"""
+        times = self._recent(self.frame_times) * 1000
+        return np.bincount(np.searchsorted(edges, times, side="right") - 1, minlength=len(edges))[:len(edges)]
+
+    # ---- profiling hooks ----
+    def profile(self, frames, out_dir, cpu=True, memory=True, on_done=None):
+        """Profile the next frames frames; results land in out_dir. Returns the session."""
+        if self._session is not None:
+            raise RuntimeError("a profiling session is already running")
+        self._session = ProfileSession(frames, out_dir, cpu, memory, on_done)
+        self._session.start()
+        return self._session
+
+    @property
+    def profiling(self):
+        return self._session is not None
+
+
+class ProfileSession:
+    """cProfile and/or tracemalloc around a fixed number of frames"""
+
+    def __init__(self, frames, out_dir, cpu=True, memory=True, on_done=None):
+        self.frames = frames
+        self.out_dir = out_dir
+        self.cpu = cProfile.Profile() if cpu else None
+        self.memory = memory
+        self.on_done = on_done
+        self.remaining = frames
+        self.paths = []
+
+    def start(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        else:
+            self.memory = False      # somebody else owns tracemalloc; leave it alone
+        if self.cpu is not None:
+            self.cpu.enable()
+
+    def frame_done(self):
+        """Count a frame; stops and writes the results after the last one. True when finished."""
+        self.remaining -= 1
+        if self.remaining > 0:
+            return False
+        self.stop()
+        return True
+
+    def stop(self):
+        if self.cpu is not None:
+            self.cpu.disable()
+        snapshot = tracemalloc.take_snapshot() if self.memory else None
+        if self.memory:
+            tracemalloc.stop()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if self.cpu is not None:
+            prof = os.path.join(self.out_dir, f"profile-{stamp}.prof")
+            self.cpu.dump_stats(prof)
+            text = io.StringIO()
+            pstats.Stats(self.cpu, stream=text).sort_stats("cumulative").print_stats(40)
+            self._write(f"profile-{stamp}.txt", text.getvalue())
+            self.paths.append(prof)
+        if snapshot is not None:
+            top = snapshot.statistics("lineno")[:40]
+            self._write(f"memory-{stamp}.txt",
+                        f"Top allocation sites after {self.frames} frames\n\n"
+                        + "\n".join(str(stat) for stat in top) + "\n")
+        if self.on_done is not None:
+            self.on_done(self.paths)
+
+    def _write(self, name, text):
+        path = os.path.join(self.out_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        self.paths.append(path)
+
+
+class PerfHUD:
+    """Tk widgets showing live FrameStats, refreshed on a timer"""
+
+    def __init__(self, parent, stats, canvas=None, refresh_ms=500, bg="black", scheduler=None):
+        import tkinter as tk
+
+        self.stats = stats
+        self.canvas = canvas
+        self.refresh_ms = refresh_ms
+        self.parent = parent
+        self.fps_label = tk.Label(parent, text="FPS: –", fg="lime", bg=bg, font=("Arial", 10, "bold"))
+        self.fps_label.pack()
+        self.items_label = tk.Label(parent, text="Canvas items: –", fg="cyan", bg=bg, font=("Arial", 8))
+        self.items_label.pack()
+
+        # Histogram bars are created once and only re-coordinated
+        self.hist_w, self.hist_h = 220, 40
+        self.hist = tk.Canvas(parent, width=self.hist_w, height=self.hist_h + 12, bg=bg, highlightthickness=0)
+        self.hist.pack()
+        bar_w = self.hist_w / len(HISTOGRAM_EDGES)
+        self.bars = []
+        for k, edge in enumerate(HISTOGRAM_EDGES):
+            x0 = k * bar_w
+            self.bars.append(self.hist.create_rectangle(x0 + 1, self.hist_h, x0 + bar_w - 1, self.hist_h,
+                                                        fill="orange" if edge >= 16 else "lime", outline=""))
+            self.hist.create_text(x0 + bar_w / 2, self.hist_h + 6, text=str(edge), fill="gray",
+                                  font=("Arial", 6))
+
+        self.stage_label = tk.Label(parent, text="", fg="white", bg=bg, font=("Courier", 8), justify=tk.LEFT)
+        self.stage_label.pack()
+        self.scheduler = scheduler
+        if scheduler is not None:
+            from scheduler import UI
+            scheduler.every(refresh_ms / 1000, self.refresh, UI, name="hud")
+        else:
+            self.refresh()
+
+    def refresh(self):
+        s = self.stats
+        p50, p99 = s.percentiles(50, 99)
+        self.fps_label.config(text=f"FPS: {s.fps():.1f}   p50 {p50:.1f} ms   p99 {p99:.1f} ms")
+        if self.canvas is not None:
+            self.items_label.config(text=f"Canvas items: {len(self.canvas.find_all()):,}")
+
+        counts = s.histogram()
+        peak = max(1, counts.max())
+        for bar, n in zip(self.bars, counts):
+            x0, _, x1, _ = self.hist.coords(bar)
+            self.hist.coords(bar, x0, self.hist_h * (1 - n / peak), x1, self.hist_h)
+
+        lines = [f"{name:<8}{ms:7.2f} ms" for name, ms in s.stage_means().items()]
+        if s.profiling:
+            lines.append("🔬 profiling…")
+        self.stage_label.config(text="\n".join(lines))
+        if self.scheduler is None:
+            self.parent.after(self.refresh_ms, self.refresh)
@@ -0,0 +1,171 @@
+# =====================================================================
+# ⏱️ FRAME SCHEDULER
+# =====================================================================
+# One loop for everything the app does over time: physics steps,
+# rendering, Tk input, the control panel, star twinkles, sprite polling
+# and commands from the control API.
+#
+#   • Every task has a priority and a deadline. Each pass runs the tasks
+#     that are due, most important first (physics, then render, input,
+#     UI, background).
+#   • When a pass has used up its time slice, UI and background tasks
+#     that are still due wait for the next pass, so a slow twinkle or a
+#     burst of API calls can't push a frame back.
+#   • A periodic task that falls behind skips the ticks it missed
+#     instead of running them back to back (physics catches up on its
+#     own through SimulationClock).
+#   • run() is a coroutine: between deadlines it sleeps in asyncio, which
+#     is when sockets (the control API) are served.
+#
+# Per-task run counts, times and late starts are kept for the HUD and
+# the API.
+# =====================================================================
+
+import asyncio
+import time
+import traceback
+
+PHYSICS, RENDER, INPUT, UI, BACKGROUND = range(5)
+PRIORITY_NAMES = ("physics", "render", "input", "ui", "background")
+
+
+class Task:
+    """A scheduled callable: one-shot, or periodic when period is set"""
+
+    __slots__ = ("name", "fn", "priority", "period", "due", "future",
+                 "runs", "late", "seconds", "worst", "cancelled")
+
+    def __init__(self, name, fn, priority, due, period=None, future=None):
+        self.name = name
+        self.fn = fn
+        self.priority = priority
+        self.period = period
+        self.due = due
+        self.future = future       # resolved with fn's result (one-shot tasks from submit())
+        self.runs = 0
+        self.late = 0              # periodic deadlines skipped because the task fell behind
+        self.seconds = 0.0
+        self.worst = 0.0
+        self.cancelled = False
+
+
+class Scheduler:
+    """Priority and deadline scheduling of the app's tasks on one thread"""
+
+    def __init__(self, slice_seconds=0.010, time_source=time.perf_counter):
+        self.slice_seconds = slice_seconds    # a pass's budget before UI/background work waits
+        self.time_source = time_source
+        self.tasks = []
+        self.running = False
+        self.deferred = 0                     # tasks pushed to a later pass for lack of time
+        self._wake = None
+
+    # ---- adding tasks ----
+    def every(self, period, fn, priority=UI, name=None, delay=0.0):
+        """Run fn every period seconds (first run after delay)"""
+        return self._add(Task(name or fn.__name__, fn, priority, self.time_source() + delay, period))
+
+    def call_later(self, delay, fn, priority=BACKGROUND, name=None):
+        """Run fn once, delay seconds from now"""
+        return self._add(Task(name or fn.__name__, fn, priority, self.time_source() + delay))
+
+    def call_soon(self, fn, priority=UI, name=None):
+        """Run fn once, in the next pass"""
+        return self.call_later(0.0, fn, priority, name)
+
+    def submit(self, fn, priority=UI, name=None):
+        """Run fn in the next pass and return an asyncio future for its result (call from a coroutine)"""
+        future = asyncio.get_running_loop().create_future()
+        self._add(Task(name or getattr(fn, "__name__", "task"), fn, priority, self.time_source(), future=future))
+        return future
+
+    def cancel(self, task):
+        task.cancelled = True
+        if task in self.tasks:
+            self.tasks.remove(task)
+
+    def _add(self, task):
+        self.tasks.append(task)
+        if self._wake is not None:
+            self._wake.set()
+        return task
+
+    # ---- running ----
+    def run_due(self, now=None):
+        """Run every due task, most important first; returns how many ran"""
+        start = self.time_source() if now is None else now
+        due = sorted((t for t in self.tasks if t.due <= start), key=lambda t: (t.priority, t.due))
+        ran = 0
+        for task in due:
+            if task.cancelled:
+                continue
+            if task.priority >= UI and self.time_source() - start > self.slice_seconds:
+                self.deferred += 1
+                continue
+            self._run(task, start)
+            ran += 1
+        return ran
+
+    def _run(self, task, now):
+        if task.period is None:
+            self.tasks.remove(task)
+        else:
+            task.due += task.period
+            if task.due <= now:
+                # Fell behind: skip the missed ticks rather than bunching them up
+                task.late += int((now - task.due) // task.period) + 1
+                task.due = now + task.period
+        began = self.time_source()
+        try:
+            result = task.fn()
+        except Exception as e:
+            if task.future is not None and not task.future.done():
+                task.future.set_exception(e)
+            else:
+                traceback.print_exc()
+        else:
+            if task.future is not None and not task.future.done():
+                task.future.set_result(result)
+        spent = self.time_source() - began
+        task.runs += 1
+        task.seconds += spent
+        task.worst = max(task.worst, spent)
+
+    def next_deadline(self):
+        return min((t.due for t in self.tasks), default=self.time_source() + 0.1)
+
+    async def run(self):
+        """Run tasks until stop(); sleeps in asyncio between deadlines"""
+        self.running = True
+        self._wake = asyncio.Event()
+        while self.running:
+            self.run_due()
+            delay = self.next_deadline() - self.time_source()
+            if delay > 0:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(0)     # let sockets in even when tasks are overdue
+        self._wake = None
+
+    def stop(self):
+        self.running = False
+        if self._wake is not None:
+            self._wake.set()
+
+    # ---- stats ----
+    def stats(self):
+        """Per-task run counts and timings (ms), for the HUD and the control API"""
+        return {
+            task.name: {
+                "priority": PRIORITY_NAMES[task.priority],
+                "runs": task.runs,
+                "late": task.late,
+                "mean_ms": task.seconds / task.runs * 1000 if task.runs else 0.0,
+                "worst_ms": task.worst * 1000,
+            }
+            for task in self.tasks if task.period is not None
+        }
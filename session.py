@@ -0,0 +1,279 @@
+# =====================================================================
+# 💾 SESSIONS: CHECKPOINTS AND REPLAY LOGS
+# =====================================================================
+# Two ways to get a session back:
+#
+#   • Checkpoints — the whole simulation state in one binary file: a
+#     small header, the settings as JSON (speed, toggles, camera,
+#     selection...), then the NumPy arrays (angles, time, Kepler flags,
+#     gravity state, body sizes, trails) as raw bytes. Saving and
+#     loading are a few memcpys, so an exhibit can restart where it
+#     left off within milliseconds. Files are written to a temporary
+#     name and renamed, so a crash mid-save never leaves half a file.
+#
+#   • Event logs — JSON lines recording how many physics steps every
+#     frame ran and every input (speed, toggles, zoom, selection, time
+#     jumps) with the frame and tick it happened at. Physics only
+#     depends on the steps and the inputs, never on wall-clock time, so
+#     replay() rebuilds the same session bit for bit, headless and as
+#     fast as the machine goes; the log's closing line carries a digest
+#     of the final positions to prove it.
+#
+#   python solarSystem1.py --record run.jsonl --checkpoint exhibit.snap
+#   python session.py run.jsonl                 (headless, as fast as it goes)
+#   python session.py run.jsonl --render        (also time the Pillow renderer)
+# =====================================================================
+
+import hashlib
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+# magic, version, settings JSON length, array table JSON length
+_HEADER = struct.Struct("<8sIII")
+_MAGIC = b"SOLSNAP\0"
+_VERSION = 1
+_ALIGN = 64
+LOG_VERSION = 1
+
+
+# ==== Checkpoints ====
+def save_checkpoint(path, arrays, settings=None):
+    """Write named arrays and JSON-ready settings to path; returns the file size"""
+    table, offset = [], 0
+    arrays = {name: np.asarray(a, order="C") for name, a in arrays.items()}
+    for name, a in arrays.items():
+        table.append([name, a.dtype.str, list(a.shape), offset])
+        offset += -(-a.nbytes // _ALIGN) * _ALIGN
+    settings_json = json.dumps(settings or {}).encode("utf-8")
+    table_json = json.dumps(table).encode("utf-8")
+    start = _HEADER.size + len(settings_json) + len(table_json)
+    start += -start % _ALIGN
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(settings_json), len(table_json)))
+        f.write(settings_json)
+        f.write(table_json)
+        for (_, _, _, at), a in zip(table, arrays.values()):
+            f.seek(start + at)
+            f.write(a.data)
+        f.truncate(start + offset)
+    os.replace(tmp, path)
+    return start + offset
+
+
+def load_checkpoint(path):
+    """(arrays, settings) saved by save_checkpoint()"""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, settings_len, table_len = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{path} is not a solar system checkpoint")
+    at = _HEADER.size
+    settings = json.loads(data[at:at + settings_len])
+    table = json.loads(data[at + settings_len:at + settings_len + table_len])
+    start = at + settings_len + table_len
+    start += -start % _ALIGN
+    arrays = {}
+    for name, dtype, shape, offset in table:
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        arrays[name] = np.frombuffer(data, dtype, count, start + offset).reshape(tuple(shape)).copy()
+    return arrays, settings
+
+
+def positions_digest(positions):
+    """Short fingerprint of a positions array, to check that a replay matched"""
+    return hashlib.sha1(np.ascontiguousarray(positions, dtype=np.float64).tobytes()).hexdigest()[:16]
+
+
+# ==== Event logs ====
+class EventLog:
+    """Appends a session's frames and inputs to a JSON-lines file
+
+    Frames are run-length encoded: a line is only written when the
+    number of physics steps per frame changes.
+    """
+
+    def __init__(self, path, header):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8")
+        self.frames = 0
+        self.events = 0
+        self._steps = None
+        self._write({"log": LOG_VERSION, **header})
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def frame(self, steps):
+        """One frame that ran steps physics steps"""
+        if steps != self._steps:
+            self._steps = steps
+            self._write({"frame": self.frames, "steps": steps})
+        self.frames += 1
+
+    def event(self, tick, name, **args):
+        """An input, applied before the next frame"""
+        self._write({"frame": self.frames, "tick": tick, "event": name, "args": args})
+        self.events += 1
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self, tick=None, positions=None):
+        """End the log, with the final tick and a digest of the final positions"""
+        if self.file.closed:
+            return
+        end = {"frame": self.frames, "end": True, "tick": tick}
+        if positions is not None:
+            end["digest"] = positions_digest(positions)
+        self._write(end)
+        self.file.close()
+
+
+def read_log(path):
+    """(header, records) of an EventLog file"""
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("log") != LOG_VERSION:
+            raise ValueError(f"{path} is not a solar system event log")
+        return header, [json.loads(line) for line in f if line.strip()]
+
+
+class ReplayError(RuntimeError):
+    """The replayed session drifted away from the recorded one"""
+
+
+def replay(engine, records, handlers, on_frame=None, frames=None):
+    """Re-run a log's frames and inputs on engine; returns the frame count
+
+    handlers maps event names to functions taking the event's arguments;
+    events without a handler only matter to the view and are skipped.
+    on_frame(frame) runs after each frame's steps (e.g. to render).
+    Raises ReplayError if an input arrives at a different tick than it
+    was recorded at.
+    """
+    steps, frame = 0, 0
+    for record in records:
+        stop = record["frame"] if frames is None else min(record["frame"], frames)
+        while frame < stop:
+            for _ in range(steps):
+                engine.step()
+            if on_frame is not None:
+                on_frame(frame)
+            frame += 1
+        if frames is not None and frame >= frames:
+            break
+        if "steps" in record:
+            steps = record["steps"]
+        elif "event" in record:
+            if record["tick"] != engine.time:
+                raise ReplayError(f"{record['event']} at frame {frame}: recorded at tick "
+                                  f"{record['tick']}, replayed at {engine.time}")
+            handler = handlers.get(record["event"])
+            if handler is not None:
+                handler(**record["args"])
+    return frame
+
+
+# ==== Headless replay ====
+def build_engine(header, checkpoint=None):
+    """The engine a log was recorded with: same bodies, catalogue sample and starting state"""
+    from catalog import load_catalog
+    from nbody import NBodyDriver
+    from orbit_engine import OrbitEngine
+    from solar_data import SOLAR_BODIES, planet_info
+
+    engine = OrbitEngine.from_specs(SOLAR_BODIES, info=planet_info, kepler=header.get("kepler", False))
+    source = header.get("catalog")
+    if source:
+        from body_store import BodyStore
+        catalog = load_catalog(source["path"], sample=source.get("sample"), limit=source.get("limit"),
+                               seed=source.get("seed"))
+        catalog.add_to(engine, BodyStore.from_specs(SOLAR_BODIES), kepler=header.get("kepler", False))
+    if engine.count != header["bodies"]:
+        raise ValueError(f"the log has {header['bodies']} bodies, the rebuilt scene {engine.count}")
+    checkpoint = checkpoint or header.get("checkpoint")
+    if checkpoint:
+        arrays, _ = load_checkpoint(checkpoint)
+        if "nbody_pos" in arrays:
+            engine.attach_driver(NBodyDriver.from_info(engine, planet_info))
+        engine.restore(arrays)
+    return engine
+
+
+def engine_handlers(engine):
+    """Replay handlers for the inputs that change the simulation itself"""
+    from kepler import TICKS_PER_DAY
+    from nbody import NBodyDriver
+    from solar_data import planet_info
+
+    def gravity(on):
+        engine.attach_driver(NBodyDriver.from_info(engine, planet_info) if on else None)
+
+    def reset():
+        engine.attach_driver(None)
+        engine.reset()
+
+    return {
+        "kepler": lambda on: engine.set_kepler(on),
+        "gravity": gravity,
+        "reset": reset,
+        "day": lambda day: engine.seek(float(day) * TICKS_PER_DAY),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a recorded session without a display")
+    parser.add_argument("log", help="event log written with solarSystem1.py --record")
+    parser.add_argument("--checkpoint", help="checkpoint the session started from (default: the one in the log)")
+    parser.add_argument("--frames", type=int, help="stop after this many frames")
+    parser.add_argument("--render", action="store_true", help="also render every frame with Pillow and time it")
+    args = parser.parse_args()
+
+    header, records = read_log(args.log)
+    engine = build_engine(header, args.checkpoint)
+    handlers = engine_handlers(engine)
+    on_frame = None
+    if args.render:
+        from camera import Camera
+        from offscreen_render import SceneRenderer
+        from solar_data import SOLAR_BODIES
+
+        specs = SOLAR_BODIES + [{"name": "", "gif_key": None, "size": 0.05, "color": "gray"}] * (
+            engine.count - len(SOLAR_BODIES))
+        renderer = SceneRenderer(specs, engine.parent)
+        camera = Camera()
+        frame_ms = []
+
+        def follow_camera(zoom, center):
+            camera.zoom = camera.target_zoom = zoom
+            camera.center[:] = center
+
+        handlers["camera"] = follow_camera
+
+        def render(frame):
+            began = time.perf_counter()
+            renderer.render(engine.positions, camera=camera)
+            frame_ms.append((time.perf_counter() - began) * 1000)
+
+        on_frame = render
+
+    began = time.perf_counter()
+    frames = replay(engine, records, handlers, on_frame, args.frames)
+    elapsed = time.perf_counter() - began
+    end = records[-1] if records and records[-1].get("end") else {}
+    print(f"💾 {frames:,} frames, {engine.time:,.0f} ticks in {elapsed:.2f}s "
+          f"({frames * 0.015 / max(elapsed, 1e-9):.1f}× real time)")
+    if args.render and frame_ms:
+        print(f"🖼️ render p50 {np.percentile(frame_ms, 50):.2f} ms  p99 {np.percentile(frame_ms, 99):.2f} ms")
+    if "digest" in end and args.frames is None:
+        same = positions_digest(engine.positions) == end["digest"]
+        print("✅ final positions match the recording" if same else "❌ final positions differ from the recording")
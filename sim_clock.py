@@ -0,0 +1,83 @@
+# =====================================================================
+# ⏱️ SIMULATION CLOCK
+# =====================================================================
+# Fixed-timestep clock that decouples the simulation from the render
+# timer.
+#
+# Real elapsed time (times the speed multiplier) is poured into an
+# accumulator and drained in whole physics steps of STEP_SECONDS, so
+# planets move at the same wall-clock speed whether the host draws at
+# 30 or 120 frames per second. The leftover fraction of a step is the
+# interpolation factor (alpha) the renderer uses to draw in-between
+# positions.
+#
+# Under load the clock degrades gracefully:
+#   • at most max_substeps physics steps run per frame; older backlog
+#     is dropped instead of snowballing ("spiral of death")
+#   • a frame that blew its render budget makes the next one skip
+#     drawing (physics still runs), up to max_skip frames in a row
+# =====================================================================
+
+import time
+
+# One physics step: the 15 ms tick every speed constant was tuned for
+STEP_SECONDS = 0.015
+
+
+class SimulationClock:
+    """Turns real time into a whole number of fixed physics steps"""
+
+    def __init__(self, step=STEP_SECONDS, max_substeps=8, frame_budget=0.030, max_skip=2,
+                 time_source=time.perf_counter):
+        self.step = step
+        self.max_substeps = max_substeps
+        self.frame_budget = frame_budget
+        self.max_skip = max_skip
+        self.time_source = time_source
+        self.reset()
+
+    def reset(self):
+        """Forget all accumulated time (e.g. after a reset or a pause)"""
+        self._last = self.time_source()
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.steps_taken = 0
+        self.dropped_seconds = 0.0
+        self.skipped_frames = 0
+        self.last_render = 0.0
+        self._skipped_in_row = 0
+
+    def resume(self):
+        """Restart the real-time reference so a pause does not cause a catch-up burst"""
+        self._last = self.time_source()
+
+    def advance(self, scale=1.0):
+        """Account for the real time since the last call; returns physics steps to run"""
+        now = self.time_source()
+        elapsed = max(0.0, now - self._last)
+        self._last = now
+        self.accumulator += elapsed * scale
+
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_substeps:
+            # Too far behind: run the cap and let the rest of the backlog go
+            self.dropped_seconds += (steps - self.max_substeps) * self.step
+            self.accumulator -= (steps - self.max_substeps) * self.step
+            steps = self.max_substeps
+        self.accumulator -= steps * self.step
+        self.alpha = self.accumulator / self.step
+        self.steps_taken += steps
+        return steps
+
+    def should_render(self):
+        """False when the previous frame overran its budget and this one should be skipped"""
+        if self.last_render > self.frame_budget and self._skipped_in_row < self.max_skip:
+            self._skipped_in_row += 1
+            self.skipped_frames += 1
+            return False
+        self._skipped_in_row = 0
+        return True
+
+    def rendered(self, seconds):
+        """Report how long the last render took"""
+        self.last_render = seconds
@@ -18,6 +18,11 @@
 #   • Each celestial body can use a custom GIF (if provided)
 #   • If GIFs are missing, color-coded circles are used as fallback
 #
+# Running:
+#   python solarSystem1.py [--verbose]
+# Importing the module has no side effects; main() builds the window,
+# the scene and the control panel and starts the animation.
+#
 # Educational Features:
 #   • Clicking an object shows scientific details (mass, type, temperature)
 #   • Displays fun facts and planetary descriptions
@@ -25,230 +30,160 @@
 # Dependencies:
 #   • turtle — for drawing planets and orbits
 #   • tkinter — for control panel UI
-#   • math — for trigonometric orbital motion
-#   • os/random — for file management and twinkling stars
+#   • numpy — batched orbit maths (see orbit_engine.py)
+#   • os — for file management
 #
 # =====================================================================
 
 # Import required libraries
 import turtle              # for graphics and drawing planets
+import asyncio             # one event loop for frames, input and the control API
+import copy                # frozen engine copies for background work
 import os                  # for checking image file paths
-import random              # for random stars and twinkling
+import tempfile            # where the ephemeris table is written
 import tkinter as tk       # for GUI buttons (control panel)
-from math import *         # for sin, cos, etc. (used in orbit calculations)
-
-# ==== YOUR GIF FILES ====
-# Dictionary of all your planet and background images with EXACT paths
-gif_files = {
-    "sun": r"C:\Users\ASUS TUF\OneDrive\Desktop\solar\sun-no-bg.gif",
-    "mercury": r"C:\Users\ASUS TUF\OneDrive\Desktop\solar\mercury no bg.gif", 
-    "venus": r"C:\Users\ASUS TUF\OneDrive\Desktop\solar\venus no bg.gif",
-    "earth": r"C:\Users\ASUS TUF\OneDrive\Desktop\solar\earth-no-bg.gif",
-    "mars": r"C:\Users\ASUS TUF\OneDrive\Desktop\solar\mars no bg.gif",
-    "jupiter": r"C:\Users\ASUS TUF\OneDrive\Desktop\solar\jupiter nobg.gif",
-    "saturn": r"C:\Users\ASUS TUF\OneDrive\Desktop\solar\saturn no bg.gif",
-    "uranus": r"C:\Users\ASUS TUF\OneDrive\Desktop\solar\uranus no bg.gif",
-    "neptune": r"C:\Users\ASUS TUF\OneDrive\Desktop\solar\nepton no bg.gif",
-    "moon": r"C:\Users\ASUS TUF\OneDrive\Desktop\solar\moon no bg.gif",
-    "background": r"C:\Users\ASUS TUF\OneDrive\Desktop\solar\background.gif",
-}
-
-# ==== Planet Information Database ====
-planet_info = {
-    "sun": {
-        "name": "Sun",
-        "type": "Star",
-        "diameter": "1,391,000 km",
-        "mass": "1.989 × 10³⁰ kg",
-        "temperature": "5,500°C (surface)",
-        "composition": "71% Hydrogen, 27% Helium, 2% Other",
-        "fun_fact": "The Sun contains 99.86% of all mass in our Solar System!",
-        "description": "Our Sun is a yellow dwarf star that provides the energy for life on Earth."
-    },
-    "mercury": {
-        "name": "Mercury",
-        "type": "Terrestrial Planet",
-        "diameter": "4,879 km",
-        "mass": "3.301 × 10²³ kg",
-        "temperature": "430°C (day), -180°C (night)",
-        "orbital_period": "88 Earth days",
-        "fun_fact": "A day on Mercury lasts longer than its year!",
-        "description": "The smallest and innermost planet, with extreme temperature variations."
-    },
-    "venus": {
-        "name": "Venus",
-        "type": "Terrestrial Planet", 
-        "diameter": "12,104 km",
-        "mass": "4.867 × 10²⁴ kg",
-        "temperature": "465°C",
-        "orbital_period": "225 Earth days",
-        "fun_fact": "Venus rotates backwards compared to other planets!",
-        "description": "Often called Earth's sister planet, but with a runaway greenhouse effect."
-    },
-    "earth": {
-        "name": "Earth",
-        "type": "Terrestrial Planet",
-        "diameter": "12,756 km",
-        "mass": "5.972 × 10²⁴ kg",
-        "temperature": "15°C (average)",
-        "orbital_period": "365.25 days",
-        "fun_fact": "Earth is the only known planet with liquid water on its surface!",
-        "description": "Our home planet, the only known place in the universe with life."
-    },
-    "mars": {
-        "name": "Mars",
-        "type": "Terrestrial Planet",
-        "diameter": "6,792 km",
-        "mass": "6.417 × 10²³ kg",
-        "temperature": "-65°C (average)",
-        "orbital_period": "687 Earth days",
-        "fun_fact": "Mars has the largest volcano in the Solar System - Olympus Mons!",
-        "description": "The Red Planet, with polar ice caps and evidence of past water."
-    },
-    "jupiter": {
-        "name": "Jupiter",
-        "type": "Gas Giant",
-        "diameter": "142,984 km",
-        "mass": "1.898 × 10²⁷ kg",
-        "temperature": "-145°C (cloud tops)",
-        "orbital_period": "11.86 Earth years",
-        "fun_fact": "Jupiter's Great Red Spot is a storm that has raged for over 400 years!",
-        "description": "The largest planet, a gas giant with a prominent Great Red Spot."
-    },
-    "saturn": {
-        "name": "Saturn",
-        "type": "Gas Giant",
-        "diameter": "120,536 km",
-        "mass": "5.683 × 10²⁶ kg",
-        "temperature": "-178°C (cloud tops)",
-        "orbital_period": "29.46 Earth years",
-        "fun_fact": "Saturn would float in water if you could find a big enough ocean!",
-        "description": "Known for its spectacular ring system made of ice and rock particles."
-    },
-    "uranus": {
-        "name": "Uranus",
-        "type": "Ice Giant",
-        "diameter": "51,118 km",
-        "mass": "8.681 × 10²⁵ kg",
-        "temperature": "-224°C",
-        "orbital_period": "84 Earth years",
-        "fun_fact": "Uranus rotates on its side - practically rolling around the Sun!",
-        "description": "An ice giant that rotates on its side with a unique blue-green color."
-    },
-    "neptune": {
-        "name": "Neptune",
-        "type": "Ice Giant",
-        "diameter": "49,528 km",
-        "mass": "1.024 × 10²⁶ kg",
-        "temperature": "-218°C",
-        "orbital_period": "164.8 Earth years",
-        "fun_fact": "Neptune has the strongest winds in the Solar System - over 2,000 km/h!",
-        "description": "The windiest planet, a deep blue ice giant with violent storms."
-    },
-    "moon": {
-        "name": "Moon",
-        "type": "Natural Satellite",
-        "diameter": "3,476 km",
-        "mass": "7.342 × 10²² kg",
-        "temperature": "127°C (day), -173°C (night)",
-        "orbital_period": "27.3 Earth days",
-        "fun_fact": "The Moon is slowly moving away from Earth at 3.8 cm per year!",
-        "description": "Earth's only natural satellite, responsible for ocean tides."
-    }
-}
-
-# ==== Verify all files exist ====
-print("🖼️ Checking your GIF files...")
-available_files = {}
+import time                # for frame timing
+from collections import deque   # recent close-approach events
+import numpy as np         # for batched positions and hit-testing
+from concurrent.futures import ThreadPoolExecutor   # ephemeris tables built off the UI thread
+
+from orbit_engine import OrbitEngine, add_asteroid_belt   # headless, vectorized orbit physics
+from trails import CanvasTrails            # bounded, reusable trail lines
+from labels import LabelLayer              # cached name/size labels
+from starfield import StarField            # batched, seeded star background
+from spatial_index import UniformGrid      # fast click / drag-select hit-testing
+from camera import Camera                  # zoom/pan applied at draw time only
+from viewport import visible_mask, dot_mask, declutter   # culling and level of detail
+from sim_clock import SimulationClock      # fixed physics step, independent of frame rate
+from ephemeris import build_ephemeris      # precomputed positions for time scrubbing
+from kepler import TICKS_PER_DAY
+from nbody import NBodyDriver               # optional real gravity
+from perf_hud import FrameStats, PerfHUD    # live frame timings and profiling hooks
+from assets import ASSET_FILES, SpriteCache, asset_path   # relative, lazily loaded images
+from body_store import Body, BodyStore, HandlePool   # compact body data, turtles only when drawn
+from catalog import load_catalog            # streamed asteroid / comet catalogues
+from scheduler import Scheduler, PHYSICS, RENDER, INPUT, BACKGROUND   # one loop, by priority
+from control_api import ControlServer      # local HTTP control for scripts and kiosks
+from stream import StreamServer            # mirror the frames to thin viewer windows
+from session import EventLog, load_checkpoint, save_checkpoint   # resume and replay sessions
+from close_approach import SweepAndPrune, APPROACH, COLLISION, EVENT_NAMES, event_rows   # near misses
+from solar_data import planet_info, SOLAR_BODIES
+
+# ==== Startup ====
+# Nothing below runs at import. main() builds the window and scene, draws
+# the first frame, then defers the rest (stars, ephemeris, info text) so
+# the solar system shows up quickly. Status lines only print with VERBOSE.
+VERBOSE = False
+STARTUP_BUDGET = 1.5      # seconds from main() to the first frame; slower is reported
+startup_seconds = None    # measured time to the first frame
+
+def log(*args):
+    if VERBOSE:
+        print(*args)
+
+# ==== Image files ====
+# Pictures are looked up next to this script (see ASSET_FILES in
+# assets.py) and only loaded when something first needs them.
 missing_files = []
 
-for key, file_path in gif_files.items():
-    if os.path.isfile(file_path):               
-        available_files[key] = file_path        
-        file_size = os.path.getsize(file_path) / 1024  
-        print(f"✅ Found {key}: {os.path.basename(file_path)} ({file_size:.1f}KB)")
-    else:
-        missing_files.append((key, file_path))  
-        print(f"❌ Missing {key}: {file_path}")
-        
-        directory = os.path.dirname(file_path)
-        if os.path.exists(directory):
-            files_in_dir = os.listdir(directory)
-            similar_files = [f for f in files_in_dir if key in f.lower() and f.endswith('.gif')]
-            if similar_files:
-                print(f"   🔍 Found similar files: {similar_files}")
-
-if missing_files:
-    print(f"\n⚠️ {len(missing_files)} files are missing. Using colored circles as fallback.")
-else:
-    print(f"\n🎉 All {len(available_files)} GIF files found!")
+def check_assets():
+    global missing_files
+    missing_files = [key for key in ASSET_FILES if asset_path(key) is None]
+    if missing_files:
+        print(f"⚠️ Missing images for: {', '.join(missing_files)}. Using colored circles as fallback.")
 
 # ==== Setup Turtle Window ====
-win = turtle.Screen()
-win.setup(width=1400, height=900)
-win.bgcolor("black")
-win.title("🌌 Your Personal Solar System - Click Planets for Info!")
-win.tracer(0)
-
-if "background" in available_files:
-    try:
-        win.bgpic(available_files["background"])
-        print("🌌 Background loaded successfully!")
-    except:
-        print("⚠️ Background failed to load, using black background")
+win = None
+sprites = None
+
+def setup_window():
+    """Open the turtle window and hook up mouse input"""
+    global win, sprites
+    win = turtle.Screen()
+    win.setup(width=1400, height=900)
+    win.bgcolor("black")
+    win.title("🌌 Your Personal Solar System - Click Planets for Info!")
+    win.tracer(0)
+
+    if asset_path("background"):
+        try:
+            win.bgpic(asset_path("background"))
+            log("🌌 Background loaded successfully!")
+        except:
+            print("⚠️ Background failed to load, using black background")
+
+    # GIF shapes are registered on first use (see assets.py)
+    sprites = SpriteCache(win)
+
+    canvas = win.getcanvas()
+    win.onclick(on_planet_click)
+    canvas.bind("<Shift-ButtonPress-1>", on_select_start)
+    canvas.bind("<Shift-B1-Motion>", on_select_drag)
+    canvas.bind("<Shift-ButtonRelease-1>", on_select_end)
+    canvas.bind("<MouseWheel>", on_mouse_wheel)
+    canvas.bind("<Button-4>", on_mouse_wheel)
+    canvas.bind("<Button-5>", on_mouse_wheel)
+    canvas.bind("<ButtonPress-3>", on_pan_start)
+    canvas.bind("<B3-Motion>", on_pan_drag)
+    canvas.winfo_toplevel().protocol("WM_DELETE_WINDOW", quit_app)
 
 # === Draw twinkling stars ===
-stars = []
+# Stars are plain canvas ovals kept in arrays; each twinkle is one batch.
+# They are not needed for the first frame, so main() adds them just after.
 num_stars = 50
-
-print("✨ Creating twinkling stars...")
-for _ in range(num_stars):
-    star = turtle.Turtle()
-    star.hideturtle()
-    star.penup()
-    star.color("white")
-    star.goto(random.randint(-700, 700), random.randint(-450, 450))
-    star.dot(random.randint(1, 3))
-    stars.append(star)
+STAR_SEED = 2024      # same seed, same sky and same twinkles
+stars = None
+
+def setup_stars():
+    global stars
+    log("✨ Creating twinkling stars...")
+    stars = StarField(num_stars, width=1400, height=900, seed=STAR_SEED)
+    stars.attach(win.getcanvas())
+    # Created after the planets, so tuck them just above the background picture
+    win.getcanvas().tag_raise(stars.tag, win._bgpic)
+    scheduler.every(0.3, twinkle, BACKGROUND)
 
 def twinkle():
-    for star in stars:
-        if random.random() < 0.3:
-            size = random.uniform(1, 3.5)
-            star.clear()
-            star.dot(size)
-    win.ontimer(twinkle, 300)
-
-twinkle()
-
-# ==== Register all available GIF shapes ====
-print("📝 Registering GIF shapes...")
-for key, file_path in available_files.items():
-    try:
-        win.register_shape(file_path)
-        print(f"✅ Registered {key}")
-    except Exception as e:
-        print(f"❌ Failed to register {key}: {e}")
+    stars.twinkle()
 
-# ==== Information Display System ====
-info_display = turtle.Turtle()
-info_display.hideturtle()
-info_display.penup()
-info_display.color("white")
-info_display.goto(0, 400)
+# ==== GIF shapes ====
+# Registered on first use; resized variants are built in the background
+# and picked up here every 50 ms.
+def poll_sprites():
+    if sprites.poll():
+        update_body_radii()
+        if not running:
+            render_frame()
 
+# ==== Information Display System ====
+# The writing turtle is created the first time there is something to show.
+info_display = None
 current_info = None
-
-def show_info(celestial_key):
-    """Display information about a celestial body at the TOP"""
-    global current_info
-    
-    if celestial_key not in planet_info:
-        return
+current_details = None    # the record shown for current_info (catalogue bodies have no planet_info entry)
+selected_bodies = []      # indices of the selected bodies (-1 is the Sun)
+
+def info_turtle():
+    global info_display
+    if info_display is None:
+        info_display = turtle.Turtle()
+        info_display.hideturtle()
+        info_display.penup()
+        info_display.color("white")
+        info_display.goto(0, 400)
+    return info_display
+
+def show_info(celestial_key, info=None):
+    """Display information about a celestial body at the TOP (info overrides planet_info)"""
+    global current_info, current_details
     
-    info = planet_info[celestial_key]
+    if info is None:
+        if celestial_key not in planet_info:
+            return
+        info = planet_info[celestial_key]
     current_info = celestial_key
+    current_details = info
     
+    info_display = info_turtle()
     info_display.clear()
     info_display.goto(0, 380)
     info_display.color("cyan")
@@ -285,319 +220,1284 @@ def show_info(celestial_key):
     info_display.color("yellow")
     info_display.write(f"✨ Fun Fact: {info['fun_fact']}", align="center", font=("Arial", 10, "bold"))
 
+def show_selection(targets):
+    """Display the bodies picked by a drag-selection at the TOP"""
+    global current_info, current_details, selected_bodies
+    if len(targets) == 1:
+        show_body(targets[0])
+        return
+    if not targets:
+        clear_info()
+        return
+
+    current_info = current_details = None
+    selected_bodies = [t.index for t in targets]
+    record("select", bodies=selected_bodies)
+    info_display = info_turtle()
+    info_display.clear()
+    info_display.goto(0, 380)
+    info_display.color("cyan")
+    info_display.write(f"🌌 {len(targets)} bodies selected", align="center", font=("Arial", 16, "bold"))
+
+    names = [t.name for t in targets[:12]]
+    if len(targets) > 12:
+        names.append(f"… and {len(targets) - 12} more")
+    info_display.goto(0, 350)
+    info_display.color("white")
+    info_display.write(", ".join(names), align="center", font=("Arial", 12, "normal"))
+
 def clear_info():
     """Clear the information display"""
-    global current_info
-    info_display.clear()
-    current_info = None
+    global current_info, current_details, selected_bodies
+    if info_display is not None:
+        info_display.clear()
+    current_info = current_details = None
+    selected_bodies = []
+    record("select", bodies=[])
+
+# ==== Click hit-testing ====
+# Drawn positions go into a uniform grid that is rebuilt lazily on the
+# first click after the bodies moved, so a click never scans every body.
+CLICK_SLOP = 6        # extra pixels of forgiveness around tiny bodies
+hit_index = UniformGrid(cell_size=64)
+hit_index_dirty = True
+
+def shape_radius(shape_name, size):
+    """Radius in pixels of a shape as drawn on screen (image shapes ignore size)"""
+    shape = win._shapes.get(shape_name)
+    if shape is not None and shape._type == "image":
+        return shape._data.width() / 2
+    return 10 * size
+
+def drawn_radius(t):
+    """Radius in pixels of a turtle's shape as drawn on screen"""
+    return shape_radius(t.shape(), t.shapesize()[0])
+
+SUN_BODY = Body(-1, "Sun", "sun")
+
+def hit_target(k):
+    """The body behind hit-index entry k: bodies first, then the sun"""
+    return bodies.view(k) if k < bodies.count else SUN_BODY
+
+def body_at(i):
+    """The body with index i; -1 is the Sun"""
+    return SUN_BODY if i < 0 else bodies.view(i)
+
+def body_info(body):
+    """planet_info-style record of a body; catalogue bodies read theirs from disk"""
+    if catalog is not None and body.index >= catalog_first:
+        return catalog.details(body.index - catalog_first)
+    return planet_info.get(body.info_key)
+
+def show_body(body):
+    """Info panel for a clicked body"""
+    global selected_bodies
+    show_info(body.info_key, body_info(body))
+    selected_bodies = [body.index]
+    record("select", bodies=selected_bodies)
+
+def rebuild_hit_index():
+    global hit_index_dirty
+    positions = np.vstack([screen_positions, [sun.position()]])
+    hit_index.rebuild(positions, np.append(body_radii, drawn_radius(sun)))
+    hit_index_dirty = False
 
 def on_planet_click(x, y):
     """Handle clicks on planets and sun"""
-    for planet in planets:
-        distance = ((x - planet.xcor()) ** 2 + (y - planet.ycor()) ** 2) ** 0.5
-        if distance < 30:
-            show_info(planet.info_key)
-            return
-    
-    distance_to_sun = ((x - sun.xcor()) ** 2 + (y - sun.ycor()) ** 2) ** 0.5
-    if distance_to_sun < 60:
-        show_info("sun")
+    if hit_index_dirty:
+        rebuild_hit_index()
+    hit = hit_index.nearest(x, y, slop=CLICK_SLOP)
+    if hit < 0:
+        clear_info()
         return
-    
-    clear_info()
+    show_body(hit_target(hit))
 
-win.onclick(on_planet_click)
+# ==== Rectangle selection (Shift + drag) ====
+select_start = None
+select_box = None
 
-# ==== Sun ====
-sun = turtle.Turtle()
-if "sun" in available_files:
-    sun.shape(available_files["sun"])
-    sun.shapesize(stretch_wid=1.2, stretch_len=1.2)
-    print("☀️ Sun GIF loaded!")
-else:
-    sun.shape("circle")
-    sun.color("yellow")
-    sun.shapesize(stretch_wid=3, stretch_len=3)
-    print("☀️ Using circle sun (no GIF)")
+def _event_xy(event):
+    cv = win.getcanvas()
+    return cv.canvasx(event.x), -cv.canvasy(event.y)
 
-sun.penup()
-sun.info_key = "sun"
+def on_select_start(event):
+    global select_start
+    select_start = _event_xy(event)
 
-# ==== Planet class ====
+def on_select_drag(event):
+    global select_box
+    if select_start is None:
+        return
+    (x0, y0), (x1, y1) = select_start, _event_xy(event)
+    cv = win.getcanvas()
+    if select_box is None:
+        select_box = cv.create_rectangle(x0, -y0, x1, -y1, outline="cyan", dash=(4, 2))
+    else:
+        cv.coords(select_box, x0, -y0, x1, -y1)
+
+def on_select_end(event):
+    global select_start, select_box
+    if select_start is None:
+        return
+    (x0, y0), (x1, y1) = select_start, _event_xy(event)
+    select_start = None
+    if select_box is not None:
+        win.getcanvas().delete(select_box)
+        select_box = None
+    if hit_index_dirty:
+        rebuild_hit_index()
+    show_selection([hit_target(k) for k in hit_index.query_rect(x0, y0, x1, y1)])
+
+# ==== Body drawing ====
+# Body data lives in a BodyStore (see body_store.py); a turtle is lent to a
+# body only while it is on screen, so off-screen bodies cost a few bytes.
+# Per body we keep the picture it wears (a resized variant after
+# Smaller/Bigger, "circle" without a GIF) and whether it is drawn as a dot.
+bodies = None
+handles = None
+body_shapes = None
+body_dot = None
+wanted_scale = None   # latest picture scale asked for; older arrivals are ignored
+
+def make_handle():
+    t = turtle.Turtle(visible=False, undobuffersize=0)
+    t.penup()
+    return t
+
+def dress_handle(t, i):
+    """Make a pooled turtle look like body i"""
+    t.shape("circle" if body_dot[i] else body_shapes[i])
+    t.color(bodies.color(i))   # also the colour of the cheap dot used when far away
+    size = float(bodies.sizes[i])
+    t.shapesize(stretch_wid=size, stretch_len=size)
+
+def move_body(i, x, y, as_dot=False):
+    """Draw body i at its camera-projected screen position"""
+    t = handles.get(i)
+    if as_dot != body_dot[i]:
+        body_dot[i] = as_dot
+        t.shape("circle" if as_dot else body_shapes[i])
+    if not t.isvisible():
+        t.showturtle()
+    t.goto(x, y)
+
+def body_radius(i):
+    return shape_radius(body_shapes[i], float(bodies.sizes[i]))
+
+def resize_body(i, size):
+    """Change a body's size; GIF bodies swap to a picture scaled to match"""
+    bodies.sizes[i] = size
+    t = handles.peek(i)
+    if t is not None:
+        t.shapesize(stretch_wid=size, stretch_len=size)
+    if body_shapes[i] != "circle":
+        scale = wanted_scale[i] = size / float(bodies.base_sizes[i])
+        sprites.request(bodies.gif_key(i), scale, lambda shape: set_body_picture(i, shape, scale))
+
+def set_body_picture(i, shape, scale):
+    # Pictures can arrive out of order after quick clicks; keep only the latest wish
+    if shape is None or shape == body_shapes[i] or scale != wanted_scale[i]:
+        return
+    sprites.wear(shape, body_shapes[i])
+    body_shapes[i] = shape
+    t = handles.peek(i)
+    if t is not None and not body_dot[i]:
+        t.shape(shape)
+
+# ==== Scene ====
+# The Sun, trails, labels, planets and camera. Trail lines and label texts
+# are only created on the canvas the first time they are drawn.
 show_labels = True
 show_trails = True
-
-class Planet(turtle.Turtle):
-    def __init__(self, radius, gif_key, star, offset, size, color, name, size_label, speed, trail=True, info_key=None):
-        if gif_key in available_files:
-            super().__init__(shape=available_files[gif_key])
-            self.using_gif = True
-            print(f"🪐 {name}: Using GIF (size: {size})")
+TRAIL_SECONDS = 8.0   # how many seconds of animation the trail shows (a point per frame)
+# KEPLER_ORBITS: ellipses from real orbital elements and periods instead of circles
+KEPLER_ORBITS = False
+
+# ==== Minor-body catalogue ====
+# --catalog adds asteroids and comets from a catalogue file (CSV, JSON
+# lines or MPCORB.DAT, see catalog.py) after the planets. They are drawn
+# as small dots without trails or labels; clicking one reads its full
+# record back from the file. Every body costs a turtle while on screen,
+# so the live view stops reading after the first CATALOG_LIMIT usable
+# rows; set CATALOG_SAMPLE to spread them across the file at random.
+CATALOG_FILE = None
+CATALOG_LIMIT = 5000
+CATALOG_SAMPLE = None     # fraction of rows to keep, before the limit
+CATALOG_SEED = 2024       # same sample every run, so checkpoints and logs still fit
+catalog = None
+catalog_first = None      # index of the first catalogue body
+# BELT_BODIES scatters that many unnamed dots between Mars and Jupiter,
+# before any catalogue; benchmark.py uses it to time big scenes through
+# the app's own frame path.
+BELT_BODIES = 0
+
+sun = None
+trails = None
+name_labels = None
+size_labels = None
+engine = None
+body_radii = None
+labelled = None           # bodies that have name labels (not catalogue dots)
+camera = None
+screen_positions = None
+drawn = None
+
+def build_scene():
+    """Create the Sun, the orbit engine, the planet turtles, trails, labels and camera"""
+    global sun, trails, name_labels, size_labels, engine, body_radii, labelled
+    global bodies, handles, body_shapes, body_dot, wanted_scale
+    global camera, screen_positions, drawn, catalog, catalog_first, approaches
+
+    sun = turtle.Turtle()
+    if sprites.base_shape("sun"):
+        sun.shape(sprites.base_shape("sun"))
+        sun.shapesize(stretch_wid=1.2, stretch_len=1.2)
+        log("☀️ Sun GIF loaded!")
+    else:
+        sun.shape("circle")
+        sun.color("yellow")
+        sun.shapesize(stretch_wid=3, stretch_len=3)
+        log("☀️ Using circle sun (no GIF)")
+    sun.penup()
+    sun.info_key = "sun"
+
+    # Each body gets ONE canvas line fed from a fixed-size ring buffer, so the
+    # canvas never grows no matter how long the app runs.
+    trails = CanvasTrails(
+        win.getcanvas(),
+        [spec["color"] if spec.get("trail", True) else None for spec in SOLAR_BODIES],
+        seconds=TRAIL_SECONDS,
+    )
+
+    # Orbit state lives in the engine, names and looks in the body store;
+    # turtles are only handed out to bodies on screen.
+    log("\n🪐 Creating planets with smaller sizes...")
+    engine = OrbitEngine.from_specs(SOLAR_BODIES, info=planet_info, kepler=KEPLER_ORBITS)
+    bodies = BodyStore.from_specs(SOLAR_BODIES)
+    if BELT_BODIES:
+        add_asteroid_belt(engine, BELT_BODIES, seed=1)
+        bodies.add_many([None] * BELT_BODIES, size=0.05, color="gray", trail=False)
+    if CATALOG_FILE:
+        start = time.perf_counter()
+        catalog = load_catalog(CATALOG_FILE, sample=CATALOG_SAMPLE, limit=CATALOG_LIMIT, seed=CATALOG_SEED)
+        catalog_first = catalog.add_to(engine, bodies, kepler=KEPLER_ORBITS)
+        log(f"📚 {catalog.count:,} of {catalog.rows_read:,} catalogue bodies loaded "
+            f"in {time.perf_counter() - start:.2f}s")
+    planets = len(SOLAR_BODIES)
+
+    # Persistent text items that are only moved each frame, never rewritten.
+    name_labels = LabelLayer(
+        win.getcanvas(), [spec["name"] for spec in SOLAR_BODIES] + [None] * (bodies.count - planets),
+        dy=25, font=("Arial", 9, "bold"), color="white",
+    )
+    size_labels = LabelLayer(
+        win.getcanvas(), [spec.get("size_label") for spec in SOLAR_BODIES] + [None] * (bodies.count - planets),
+        dy=-25, font=("Arial", 7, "normal"), color="yellow",
+    )
+    labelled = np.arange(bodies.count) < planets
+
+    body_shapes = np.full(bodies.count, "circle", dtype=object)
+    for i in range(planets):
+        picture = sprites.base_shape(bodies.gif_key(i))
+        body_shapes[i] = picture or "circle"
+        if picture:
+            sprites.wear(picture)
+        log(f"🪐 {bodies.names[i]}: Using {'GIF' if picture else 'colored circle'} (size: {bodies.sizes[i]:.2f})")
+    body_dot = np.zeros(bodies.count, dtype=bool)
+    wanted_scale = np.ones(bodies.count)
+    handles = HandlePool(make_handle, dress_handle)
+
+    # Drawn radius of every body, used for culling and click hit-testing
+    body_radii = np.array([body_radius(i) for i in range(bodies.count)])
+
+    # Zoom and pan only change how world positions are projected on screen;
+    # orbits, angles and trails are never touched.
+    camera = Camera()
+    screen_positions = camera.to_screen(engine.positions)
+    drawn = np.zeros(bodies.count, dtype=bool)    # bodies currently shown on screen
+
+    # Every body against every other, after each batch of physics steps
+    approaches = SweepAndPrune(body_radii, APPROACH_GAP, engine.parent)
+    approaches.subscribe(on_approach_events)
+
+def render_frame(alpha=1.0, positions=None):
+    """Project the engine's world positions through the camera and draw what is on screen
+
+    alpha blends between the previous and the latest physics step so
+    motion stays smooth when frames and steps do not line up; positions
+    overrides the engine (e.g. a row looked up in the ephemeris).
+    """
+    global screen_positions, hit_index_dirty, drawn
+    camera.update()
+    if positions is None:
+        positions = engine.interpolated_positions(alpha)
+    screen_positions = camera.to_screen(positions)
+    half_w, half_h = win.window_width() / 2, win.window_height() / 2
+
+    sun.goto(*camera.to_screen((0.0, 0.0)))
+
+    # Only bodies on screen (or just leaving it) cost a turtle call
+    visible = visible_mask(screen_positions, body_radii, half_w, half_h)
+    as_dot = dot_mask(screen_positions, body_radii, engine.parent, camera.zoom)
+    for i in np.flatnonzero(visible | drawn):
+        if visible[i]:
+            move_body(i, *screen_positions[i], as_dot=as_dot[i])
         else:
-            super().__init__(shape="circle")
-            self.color(color)
-            self.using_gif = False
-            print(f"🪐 {name}: Using colored circle (size: {size})")
-        
-        self.radius = radius
-        self.star = star
-        self.offset = offset
-        self.angle = 0
-        self.name = name
-        self.size_label = size_label
-        self.base_speed = speed
-        self.info_key = info_key or name.lower()
-        self.shapesize(stretch_wid=size, stretch_len=size)
-        self.penup()
-
-        if trail and show_trails:
-            self.trail = turtle.Turtle()
-            self.trail.hideturtle()
-            self.trail.color(color)
-            self.trail.penup()
-            self.trail.pensize(1)
-            self.trail.goto(self.xcor(), self.ycor())
-            self.trail.pendown()
+            handles.release(i)
+    drawn = visible
+    perf.mark("bodies")
+
+    if show_trails:
+        trails.draw(camera, viewport=(half_w, half_h))
+        perf.mark("trails")
+    if show_labels:
+        shown = declutter(screen_positions, body_radii, visible & labelled)
+        name_labels.update(screen_positions, shown=shown)
+        size_labels.update(screen_positions, shown=shown & ~as_dot)
+        perf.mark("labels")
+    if highlights:
+        draw_highlights()
+        perf.mark("approaches")
+    hit_index_dirty = True
+    record_camera()
+    if streamer is not None and streamer.viewers:
+        streamer.publish(positions, sim_day(), stream_state())
+        perf.mark("stream")
+
+# ==== Close approaches ====
+# Bodies passing within APPROACH_GAP pixels of each other (at zoom 1, with
+# their drawn radii) are found by sweep-and-prune (see close_approach.py).
+# Each approach flashes an orange ring around the pair, a collision a red
+# one; the latest events are kept for the control API. The Sun is not an
+# engine body, so it never takes part.
+APPROACH_GAP = 2.0
+APPROACH_HISTORY = 200    # events kept for the API
+HIGHLIGHT_SECONDS = 1.5
+HIGHLIGHT_LIMIT = 50      # rings on screen at once
+HIGHLIGHT_COLORS = {APPROACH: "orange", COLLISION: "red"}
+show_approaches = True
+approaches = None
+recent_approaches = deque(maxlen=APPROACH_HISTORY)
+highlights = {}           # (a, b) -> [canvas oval or None, kind, expiry time]
+
+def on_approach_events(events):
+    """Keep the newest events and ring the pairs that just came close or touched"""
+    recent_approaches.extend(events[-APPROACH_HISTORY:])
+    expires = time.perf_counter() + HIGHLIGHT_SECONDS
+    for e in events:
+        kind = int(e["kind"])
+        if kind not in HIGHLIGHT_COLORS:
+            continue
+        pair = (int(e["a"]), int(e["b"]))
+        ring = highlights.get(pair)
+        if ring is not None:
+            ring[1], ring[2] = max(ring[1], kind), expires    # a collision outranks an approach
+        elif len(highlights) < HIGHLIGHT_LIMIT:
+            highlights[pair] = [None, kind, expires]
+
+def draw_highlights():
+    """Move each ring to its pair's projected midpoint; drop the ones that expired"""
+    canvas = win.getcanvas()
+    now = time.perf_counter()
+    for pair, ring in list(highlights.items()):
+        item, kind, expires = ring
+        if expires < now:
+            if item is not None:
+                canvas.delete(item)
+            del highlights[pair]
+            continue
+        (ax, ay), (bx, by) = screen_positions[pair[0]], screen_positions[pair[1]]
+        x, y = (ax + bx) / 2, (ay + by) / 2
+        r = np.hypot(ax - bx, ay - by) / 2 + max(body_radii[pair[0]], body_radii[pair[1]]) + 4
+        # Turtle y points up, canvas y points down
+        box = (x - r, -y - r, x + r, -y + r)
+        if item is None:
+            ring[0] = canvas.create_oval(*box, outline=HIGHLIGHT_COLORS[kind], width=2)
         else:
-            self.trail = None
-
-        self.label = turtle.Turtle()
-        self.label.hideturtle()
-        self.label.penup()
-        self.label.color("white")
-
-        self.size_display = turtle.Turtle()
-        self.size_display.hideturtle()
-        self.size_display.penup()
-        self.size_display.color("yellow")
-
-    def move(self):
-        x = self.offset + self.radius * cos(self.angle)
-        y = self.radius * sin(self.angle) * 0.6
-        self.goto(self.star.xcor() + x, self.star.ycor() + y)
-
-        if self.trail and show_trails:
-            self.trail.goto(self.xcor(), self.ycor())
-
-        self.label.clear()
-        self.size_display.clear()
-
-        if show_labels:
-            self.label.goto(self.xcor(), self.ycor() + 25)
-            self.label.write(self.name, align="center", font=("Arial", 9, "bold"))
-
-            if self.size_label:
-                self.size_display.goto(self.xcor(), self.ycor() - 25)
-                self.size_display.write(self.size_label, align="center", font=("Arial", 7, "normal"))
-
-    def reset_position(self):
-        self.goto(self.star.xcor() + self.radius + self.offset, self.star.ycor())
-        self.angle = 0
-        if self.trail:
-            self.trail.clear()
-            self.trail.penup()
-            self.trail.goto(self.xcor(), self.ycor())
-            if show_trails:
-                self.trail.pendown()
-
-    def toggle_trail(self):
-        if self.trail:
-            if show_trails:
-                self.trail.pendown()
-            else:
-                self.trail.penup()
-
-# ==== Create planets ====
-print("\n🪐 Creating planets with smaller sizes...")
-planets = [
-    Planet(180, "mercury", sun, 0, 0.15, "gray", "Mercury", "4,879 km", 0.06, info_key="mercury"),
-    Planet(220, "venus", sun, 0, 0.18, "orange", "Venus", "12,104 km", 0.045, info_key="venus"),
-    Planet(280, "earth", sun, 0, 0.2, "blue", "Earth", "12,756 km", 0.035, info_key="earth"),
-    Planet(340, "mars", sun, 0, 0.16, "red", "Mars", "6,792 km", 0.025, info_key="mars"),
-    Planet(460, "jupiter", sun, 0, 0.35, "orange", "Jupiter", "142,984 km", 0.015, info_key="jupiter"),
-    Planet(560, "saturn", sun, 0, 0.3, "khaki", "Saturn", "120,536 km", 0.012, info_key="saturn"),
-    Planet(660, "uranus", sun, 0, 0.22, "cyan", "Uranus", "51,118 km", 0.008, info_key="uranus"),
-    Planet(760, "neptune", sun, 0, 0.21, "blue", "Neptune", "49,528 km", 0.006, info_key="neptune"),
-]
-
-if len(planets) >= 3:
-    moon = Planet(45, "moon", planets[2], 0, 0.08, "lightgray", "Moon", "3,476 km", 0.15, trail=False, info_key="moon")
-    planets.append(moon)
-    print("🌙 Moon added to Earth (size: 0.08)")
-
-def get_speeds():
-    return [p.base_speed for p in planets]
-
-speeds = get_speeds()
-
-print("🎯 Setting initial positions...")
-for p in planets:
-    p.reset_position()
+            canvas.coords(item, *box)
+            canvas.itemconfigure(item, outline=HIGHLIGHT_COLORS[kind])
+
+def clear_highlights():
+    canvas = win.getcanvas()
+    for item, _, _ in highlights.values():
+        if item is not None:
+            canvas.delete(item)
+    highlights.clear()
 
 running = True
 speed_multiplier = 1.0
 
-def animate():
-    if running:
+# ==== Performance stats ====
+# Every frame is timed stage by stage; the HUD in the control panel
+# shows the numbers and can profile a run of frames to disk.
+perf = FrameStats()
+PROFILE_FRAMES = 300
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+
+# ==== Simulation clock ====
+# Physics runs in fixed 15 ms steps of *simulated* time, however long a
+# frame really took; the 15 ms render task only decides when to draw.
+clock = SimulationClock()
+
+# ==== Scheduler ====
+# Physics, rendering, Tk input, the control panel, twinkles, sprite
+# polling and API commands all run as tasks of one scheduler (see
+# scheduler.py), driven by asyncio in main(). Tasks run by priority and
+# deadline, so a slow background job waits instead of delaying a frame.
+scheduler = Scheduler()
+FRAME_SECONDS = 0.015
+INPUT_SECONDS = 0.005     # how often Tk gets to handle mouse and keyboard events
+
+# ==== Parallel physics ====
+# PARALLEL_WORKERS > 0 steps the bodies in that many worker processes over
+# shared memory; the UI thread only queues steps and draws the newest
+# finished frame. Worth it for big belts on a multi-core machine, so off
+# by default. Anything that changes the engine directly first syncs it from
+# the workers and reseeds them afterwards, keeping the pool; only turning
+# gravity on or off needs a new one. While paused there is no stepper at
+# all: paused views (pan, zoom, clicks, the time slider) read the engine.
+PARALLEL_WORKERS = 0
+stepper = None
+
+def start_parallel():
+    global stepper
+    if PARALLEL_WORKERS > 0 and stepper is None and running:
+        from parallel_physics import ParallelStepper   # only loaded when it is used
+        stepper = ParallelStepper(engine, PARALLEL_WORKERS)
+
+def stop_parallel():
+    global stepper
+    if stepper is not None:
+        stepper.close()
+        stepper = None
+
+def sync_parallel():
+    """Bring the engine up to date with the workers, which keep running"""
+    if stepper is not None:
+        stepper.snapshot()
+
+def reseed_parallel():
+    """Let the workers carry on from the engine after it was changed directly"""
+    if stepper is not None:
+        stepper.reseed()
+
+stepper_frame = None     # newest positions from the parallel stepper
+
+def step_physics():
+    """Physics task: advance the simulation by the fixed steps that are due"""
+    global stepper_frame
+    if not running:
+        return
+    perf.begin()
+    steps = clock.advance(speed_multiplier)
+    if event_log is not None:
+        event_log.frame(steps)
+    if stepper is not None:
+        stepper.request(steps)
+        stepper_frame = stepper.latest()
+    else:
+        for _ in range(steps):
+            engine.step()
+    positions = stepper_frame if stepper is not None else engine.positions
+    # One trail point per frame that moved (the workers only hand back the
+    # newest step), so trails span the same time with or without them
+    if steps and show_trails:
+        trails.push(positions[:len(SOLAR_BODIES)])
+    perf.mark("physics")
+    if steps and show_approaches:
+        approaches.update(positions, sim_ticks())
+        perf.mark("approaches")
+
+def draw_frame():
+    """Render task: draw when the clock has time for it; while paused, finish a smooth zoom"""
+    if not running:
+        if camera.moving:
+            render_frame()
+            win.update()
+        return
+    if clock.should_render():
+        start = time.perf_counter()
+        if stepper is not None:
+            render_frame(positions=stepper_frame)
+        else:
+            render_frame(clock.alpha)
         win.update()
-        for i, p in enumerate(planets):
-            p.move()
-            p.angle += speeds[i] * speed_multiplier
-        win.ontimer(animate, 15)
+        perf.mark("update")
+        clock.rendered(time.perf_counter() - start)
+        update_day_label()
+    perf.end()
+
+def pump_tk():
+    """Input task: let Tk handle mouse, keyboard and window events for both windows"""
+    try:
+        win.getcanvas().update()
+    except tk.TclError:       # the windows are gone
+        scheduler.stop()
+
+def quit_app():
+    scheduler.stop()
 
 # ==== Control Functions ====
 def toggle_run():
     global running
     running = not running
+    record("run", on=running)
     run_button.config(text="▶️ Resume" if not running else "⏸️ Pause")
     if running:
-        animate()
+        clock.resume()
+        start_parallel()
+    else:
+        stop_parallel()     # paused views (pan, zoom, clicks) read the engine
 
-def increase_speed():
+def set_speed(value):
     global speed_multiplier
-    speed_multiplier = min(5.0, speed_multiplier * 1.2)
+    speed_multiplier = min(5.0, max(0.1, value))
+    record("speed", value=speed_multiplier)
     speed_label.config(text=f"Speed: {speed_multiplier:.1f}x")
 
+def increase_speed():
+    set_speed(speed_multiplier * 1.2)
+
 def decrease_speed():
-    global speed_multiplier
-    speed_multiplier = max(0.1, speed_multiplier * 0.8)
-    speed_label.config(text=f"Speed: {speed_multiplier:.1f}x")
+    set_speed(speed_multiplier * 0.8)
 
 def reset_simulation():
     global speed_multiplier
     speed_multiplier = 1.0
     speed_label.config(text=f"Speed: {speed_multiplier:.1f}x")
-    for p in planets:
-        p.reset_position()
+    if engine.driver is not None:
+        toggle_gravity()
+    record("reset")
+    engine.reset()
+    clock.reset()
+    update_day_label()
+    trails.clear()
+    clear_highlights()
+    camera.reset()
+    reseed_parallel()
+    render_frame()
     clear_info()
 
-def zoom_in():
-    for p in planets:
-        if p.name != "Moon":
-            p.radius *= 1.15
-    for p in planets:
-        p.reset_position()
+# While paused, the render task keeps drawing until a zoom has glided to its end
+def zoom_in(anchor=None):
+    camera.zoom_by(1.15, anchor)
 
-def zoom_out():
-    for p in planets:
-        if p.name != "Moon":
-            p.radius *= 0.85
-    for p in planets:
-        p.reset_position()
+def zoom_out(anchor=None):
+    camera.zoom_by(0.85, anchor)
+
+# ==== Mouse wheel zoom and right-drag pan ====
+pan_last = None
+
+def on_mouse_wheel(event):
+    """Zoom around the cursor (Windows/macOS send delta, X11 sends Button-4/5)"""
+    anchor = _event_xy(event)
+    if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+        zoom_in(anchor)
+    else:
+        zoom_out(anchor)
+
+def on_pan_start(event):
+    global pan_last
+    pan_last = _event_xy(event)
+
+def on_pan_drag(event):
+    global pan_last
+    if pan_last is None:
+        return
+    x, y = _event_xy(event)
+    camera.pan_by(x - pan_last[0], y - pan_last[1])
+    pan_last = (x, y)
+    if not running:
+        render_frame()
 
 def toggle_labels():
     global show_labels
     show_labels = not show_labels
+    record("labels", on=show_labels)
     labels_button.config(text="🏷️ Show Labels" if not show_labels else "🚫 Hide Labels")
-    if not show_labels:
-        for p in planets:
-            p.label.clear()
-            p.size_display.clear()
+    name_labels.set_visible(show_labels)
+    size_labels.set_visible(show_labels)
+
+def toggle_orbit_mode():
+    sync_parallel()
+    kepler = not engine.kepler.any()
+    record("kepler", on=kepler)
+    engine.set_kepler(kepler)
+    orbit_button.config(text="⭕ Circular Orbits" if engine.kepler.any() else "🪐 Kepler Orbits")
+    trails.clear()
+    if engine.driver is None:
+        rebuild_ephemeris()
+    reseed_parallel()
+    render_frame()
+
+# ==== N-body gravity mode ====
+# Swaps the scripted orbits for mutual gravitation (Barnes-Hut forces,
+# leapfrog steps); moons keep following their planet. Gravity can't be
+# scrubbed or jumped ahead, so the time controls are off meanwhile.
+def toggle_gravity():
+    stop_parallel()
+    record("gravity", on=engine.driver is None)
+    switch_gravity()
+    start_parallel()
+
+def switch_gravity():
+    """Swap between gravity and scripted orbits; the workers must be stopped"""
+    if engine.driver is None:
+        engine.attach_driver(NBodyDriver.from_info(engine, planet_info))
+        log("🌍 N-body gravity on")
+    else:
+        engine.attach_driver(None)
+        log("🌍 N-body gravity off")
+    gravity_on = engine.driver is not None
+    gravity_button.config(text="🌀 Scripted Orbits" if gravity_on else "🌍 N-Body Gravity")
+    time_state = tk.DISABLED if gravity_on else tk.NORMAL
+    time_slider.config(state=time_state)
+    jump_button.config(state=time_state)
+    trails.clear()
+    render_frame()
+
+# ==== Ephemeris (time scrubbing) ====
+# Every body's position is sampled over EPHEMERIS_DAYS into a memory-mapped
+# table, so the slider can show any day instantly without simulating to it.
+# With a big catalogue loaded the table would run to gigabytes, so past
+# EPHEMERIS_MAX_BODIES the slider seeks the engine instead (slower, exact).
+# Each running app writes its own temporary table and deletes it on exit,
+# so a second instance can never truncate a file this one has mapped.
+# A big table takes seconds, so it is built on a thread from a frozen copy
+# of the engine and swapped in when done; until then scrubbing seeks.
+EPHEMERIS_DAYS = 3650
+EPHEMERIS_MAX_BODIES = 10000
+EPHEMERIS_FILE = None     # made by the first rebuild
+ephemeris = None
+ephemeris_build = None    # Future of the table being built
+ephemeris_pool = None     # one thread, so builds never write the file at the same time
+shown_day = None
+slider_day = 0.0
+
+def _close_result(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def drop_ephemeris_build():
+    """Forget the table being built; it is closed unread when it finishes"""
+    global ephemeris_build
+    if ephemeris_build is not None and not ephemeris_build.cancel():
+        ephemeris_build.add_done_callback(_close_result)
+    ephemeris_build = None
+
+def rebuild_ephemeris():
+    global ephemeris, EPHEMERIS_FILE, ephemeris_build, ephemeris_pool
+    drop_ephemeris_build()
+    if ephemeris is not None:
+        ephemeris.close()
+        ephemeris = None
+    if engine.count > EPHEMERIS_MAX_BODIES:
+        log(f"📅 No ephemeris for {engine.count:,} bodies; scrubbing seeks the engine")
+        return
+    if engine.driver is not None:     # e.g. a restored session with gravity on
+        return
+    if EPHEMERIS_FILE is None:
+        fd, EPHEMERIS_FILE = tempfile.mkstemp(prefix="solar_system-", suffix=".ephem")
+        os.close(fd)
+    if ephemeris_pool is None:
+        ephemeris_pool = ThreadPoolExecutor(1, thread_name_prefix="ephemeris")
+    # positions_at() leaves the engine alone; seeking to 0 and back would
+    # move the angles by a few ULPs and a replay log would no longer match
+    ephemeris_build = ephemeris_pool.submit(build_ephemeris, copy.deepcopy(engine), EPHEMERIS_FILE,
+                                            EPHEMERIS_DAYS * TICKS_PER_DAY, start=0.0)
+    scheduler.call_later(0.1, poll_ephemeris)
+
+def poll_ephemeris():
+    """Swap in the finished table, or look again shortly"""
+    global ephemeris, ephemeris_build
+    build = ephemeris_build
+    if build is None:
+        return
+    if not build.done():
+        scheduler.call_later(0.1, poll_ephemeris)
+        return
+    ephemeris_build = None
+    try:
+        ephemeris = build.result()
+    except (OSError, ValueError) as e:
+        log(f"⚠️ Could not build the ephemeris: {e}")
+        return
+    log(f"📅 Ephemeris ready: {EPHEMERIS_DAYS} days, {ephemeris.samples} samples")
+
+def remove_ephemeris():
+    """Stop building, then unmap and delete this process's ephemeris table"""
+    global ephemeris, EPHEMERIS_FILE, ephemeris_pool
+    drop_ephemeris_build()
+    if ephemeris_pool is not None:
+        ephemeris_pool.shutdown(wait=True)
+        ephemeris_pool = None
+    if ephemeris is not None:
+        ephemeris.close()
+        ephemeris = None
+    if EPHEMERIS_FILE is not None:
+        try:
+            os.unlink(EPHEMERIS_FILE)
+        except OSError:
+            pass
+        EPHEMERIS_FILE = None
+
+def show_day(day):
+    """Pause and show the configuration on the given simulated day"""
+    if engine.driver is not None:
+        return
+    if running:
+        toggle_run()      # also stops the workers; the engine is ours until Resume
+    record("day", day=float(day))
+    t = float(day) * TICKS_PER_DAY
+    engine.seek(t)      # so Resume carries on from here
+    trails.clear()
+    if ephemeris is not None and t <= ephemeris.end:
+        render_frame(positions=ephemeris.at(t))
+    else:
+        render_frame()
+    update_day_label()
+
+def on_time_slider(value):
+    global slider_day
+    # Tk also fires this when the slider is first drawn; only act on real moves
+    if float(value) == slider_day:
+        return
+    slider_day = float(value)
+    show_day(slider_day)
+
+def jump_to_day():
+    global slider_day
+    try:
+        day = max(0.0, float(day_entry.get()))
+    except ValueError:
+        return
+    slider_day = min(day, EPHEMERIS_DAYS)
+    time_slider.set(slider_day)
+    show_day(day)
+
+def sim_ticks():
+    return stepper.time if stepper is not None else engine.time
+
+def sim_day():
+    return sim_ticks() / TICKS_PER_DAY
+
+def update_day_label():
+    global shown_day
+    day = int(sim_day())
+    if day != shown_day:
+        shown_day = day
+        day_label.config(text=f"📅 Day {day:,}")
 
 def toggle_trails():
     global show_trails
     show_trails = not show_trails
+    record("trails", on=show_trails)
     trails_button.config(text="🌀 Show Trails" if not show_trails else "🚫 Hide Trails")
-    for p in planets:
-        p.toggle_trail()
-        if not show_trails and p.trail:
-            p.trail.clear()
+    trails.clear()
+    trails.set_visible(show_trails)
+
+def toggle_approaches():
+    global show_approaches
+    show_approaches = not show_approaches
+    record("approaches", on=show_approaches)
+    approaches_button.config(text="💥 Close Approaches" if not show_approaches else "🚫 Hide Approaches")
+    if not show_approaches:
+        clear_highlights()
 
 def make_smaller():
-    for p in planets:
-        current_size = p.shapesize()[0]
+    record("size", factor=0.8)
+    for i in range(bodies.count):
+        current_size = float(bodies.sizes[i])
         new_size = max(0.05, current_size * 0.8)
-        p.shapesize(stretch_wid=new_size, stretch_len=new_size)
-        print(f"📏 Made {p.name} smaller: {current_size:.2f} → {new_size:.2f}")
+        resize_body(i, new_size)
+        log(f"📏 Made {bodies.names[i]} smaller: {current_size:.2f} → {new_size:.2f}")
+    update_body_radii()
 
 def make_bigger():
-    for p in planets:
-        current_size = p.shapesize()[0]
+    record("size", factor=1.2)
+    for i in range(bodies.count):
+        current_size = float(bodies.sizes[i])
         new_size = min(1.0, current_size * 1.2)
-        p.shapesize(stretch_wid=new_size, stretch_len=new_size)
-        print(f"📏 Made {p.name} bigger: {current_size:.2f} → {new_size:.2f}")
+        resize_body(i, new_size)
+        log(f"📏 Made {bodies.names[i]} bigger: {current_size:.2f} → {new_size:.2f}")
+    update_body_radii()
+
+def update_body_radii():
+    global hit_index_dirty
+    body_radii[:] = [body_radius(i) for i in range(bodies.count)]
+    approaches.set_radii(body_radii)
+    hit_index_dirty = True
+    if streamer is not None:
+        streamer.set_scene(stream_scene())
 
 def clear_info_display():
     clear_info()
 
-# ==== Tkinter GUI (Control Panel) ====
-print("🎮 Creating control panel...")
-root = tk.Tk()
-root.title("🌌 Solar System Control Panel")
-root.geometry("300x650")
-root.configure(bg='black')
-
-title_label = tk.Label(root, text="🌌 Solar System Controls", fg="white", bg="black", font=("Arial", 12, "bold"))
-title_label.pack(pady=10)
-
-run_button = tk.Button(root, text="⏸️ Pause", command=toggle_run, width=20, bg="darkgreen", fg="white", font=("Arial", 10, "bold"))
-run_button.pack(pady=5)
-
-speed_frame = tk.Frame(root, bg="black")
-speed_frame.pack(pady=10)
-
-tk.Button(speed_frame, text="🚀 Speed Up", command=increase_speed, bg="blue", fg="white", width=10).pack(side=tk.LEFT, padx=2)
-tk.Button(speed_frame, text="🐌 Slow Down", command=decrease_speed, bg="purple", fg="white", width=10).pack(side=tk.RIGHT, padx=2)
-
-speed_label = tk.Label(root, text=f"Speed: {speed_multiplier:.1f}x", fg="yellow", bg="black", font=("Arial", 10))
-speed_label.pack()
-
-zoom_frame = tk.Frame(root, bg="black")
-zoom_frame.pack(pady=10)
-
-tk.Button(zoom_frame, text="🔍 Zoom In", command=zoom_in, bg="darkblue", fg="white", width=10).pack(side=tk.LEFT, padx=2)
-tk.Button(zoom_frame, text="🔍 Zoom Out", command=zoom_out, bg="darkred", fg="white", width=10).pack(side=tk.RIGHT, padx=2)
-
-size_frame = tk.Frame(root, bg="black")
-size_frame.pack(pady=10)
-
-tk.Button(size_frame, text="📏 Smaller", command=make_smaller, bg="brown", fg="white", width=10).pack(side=tk.LEFT, padx=2)
-tk.Button(size_frame, text="📏 Bigger", command=make_bigger, bg="darkorange", fg="white", width=10).pack(side=tk.RIGHT, padx=2)
-
-labels_button = tk.Button(root, text="🚫 Hide Labels", command=toggle_labels, width=20, bg="darkgray", fg="white")
-labels_button.pack(pady=5)
-
-trails_button = tk.Button(root, text="🚫 Hide Trails", command=toggle_trails, width=20, bg="darkgray", fg="white")
-trails_button.pack(pady=5)
-
-info_button = tk.Button(root, text="🗑️ Clear Info", command=clear_info_display, width=20, bg="darkblue", fg="white")
-info_button.pack(pady=5)
-
-reset_button = tk.Button(root, text="🔄 Reset Everything", command=reset_simulation, width=20, bg="darkred", fg="white", font=("Arial", 10, "bold"))
-reset_button.pack(pady=15)
-
-status_frame = tk.Frame(root, bg="black")
-status_frame.pack(pady=10)
+def start_profile():
+    """cProfile + tracemalloc around the next PROFILE_FRAMES frames, written to PROFILE_DIR"""
+    if perf.profiling:
+        return
+    profile_button.config(state=tk.DISABLED)
+    def done(paths):
+        profile_button.config(state=tk.NORMAL)
+        print("🔬 Profile written:")
+        for path in paths:
+            print(f"   {path}")
+    perf.profile(PROFILE_FRAMES, PROFILE_DIR, on_done=done)
+    print(f"🔬 Profiling the next {PROFILE_FRAMES} frames...")
+
+# ==== Control API ====
+# --control-port serves a small local HTTP API (see control_api.py) for
+# scripts and kiosk orchestration. Commands run as UI-priority tasks of
+# the scheduler, between frames.
+CONTROL_HOST = "127.0.0.1"
+CONTROL_PORT = 0          # 0 = no API
+
+def find_body(name):
+    """The body called name (any case), the Sun included"""
+    key = str(name).strip().lower()
+    if key == "sun":
+        return SUN_BODY
+    for i in range(bodies.count):
+        if (bodies.names[i] or "").lower() == key:
+            return bodies.view(i)
+    raise KeyError(f"no body called {name!r}")
+
+def control_commands():
+    """The commands served by the control API: path -> function(**arguments)"""
+    def state():
+        return {
+            "running": running,
+            "speed": speed_multiplier,
+            "zoom": camera.target_zoom,
+            "day": sim_day(),
+            "selected": current_info,
+            "bodies": bodies.count,
+            "kepler": bool(engine.kepler.any()),
+            "gravity": engine.driver is not None,
+            "fps": perf.fps(),
+        }
+
+    def pause():
+        if running:
+            toggle_run()
+        return state()
+
+    def resume():
+        if not running:
+            toggle_run()
+        return state()
+
+    def speed(value):
+        set_speed(float(value))
+        return state()
+
+    def zoom(factor=None, level=None):
+        if level is not None:
+            factor = float(level) / camera.target_zoom
+        if factor is None:
+            raise ValueError("give a zoom factor or level")
+        camera.zoom_by(float(factor))
+        return state()
+
+    def select(body):
+        target = find_body(body)
+        show_body(target)
+        return {"selected": target.name, "info": body_info(target)}
+
+    def close_approaches(limit=50, kind=None):
+        limit = int(limit)
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        events = list(recent_approaches)
+        if kind is not None:
+            if kind not in EVENT_NAMES:
+                raise ValueError(f"kind must be one of {', '.join(EVENT_NAMES)}")
+            events = [e for e in events if EVENT_NAMES[e["kind"]] == kind]
+        names = list(bodies.names[:bodies.count])
+        return {
+            "on": show_approaches,
+            "close_pairs": len(approaches.close),
+            "touching": len(approaches.touching),
+            "events": event_rows(events[-limit:], names),
+        }
+
+    def stats():
+        report = scheduler.stats()
+        if streamer is not None:
+            report["stream"] = streamer.stats()
+        return report
+
+    return {"state": state, "stats": stats, "pause": pause, "resume": resume,
+            "speed": speed, "zoom": zoom, "select": select, "approaches": close_approaches}
+
+# ==== State streaming ====
+# --stream-port publishes every drawn frame (quantized positions, as
+# keyframes and deltas) and the view state to thin viewer processes
+# (python stream.py), so one simulation can feed many screens.
+STREAM_HOST = "127.0.0.1"
+STREAM_PORT = 0           # 0 = no streaming
+streamer = None
+
+def stream_scene():
+    """What a viewer needs to draw the bodies: labels, colours and drawn radii"""
+    return {
+        "names": [str(n) for n in bodies.names[:bodies.count]],
+        "labels": [name if shown else None for name, shown in zip(bodies.names[:bodies.count], labelled)],
+        "colors": [bodies.color(i) for i in range(bodies.count)],
+        "radii": [round(float(r), 1) for r in body_radii],
+    }
 
-tk.Label(status_frame, text="📊 Status:", fg="white", bg="black", font=("Arial", 10, "bold")).pack()
-tk.Label(status_frame, text=f"GIFs Found: {len(available_files)}/{len(gif_files)}", fg="lime", bg="black").pack()
-tk.Label(status_frame, text=f"Planets: {len(planets)}", fg="cyan", bg="black").pack()
-tk.Label(status_frame, text="☀️ Sun size: 1.2", fg="yellow", bg="black").pack()
-tk.Label(status_frame, text="💡 Click planets for info!", fg="yellow", bg="black", font=("Arial", 9, "bold")).pack()
+def stream_state():
+    """The view state mirrored by viewers; only sent when it changes"""
+    return {
+        "running": running,
+        "speed": speed_multiplier,
+        "zoom": camera.zoom,
+        "center": camera.center.tolist(),
+        "selected": current_info,
+        "info": current_details,
+    }
 
-if missing_files:
-    tk.Label(status_frame, text=f"Missing: {len(missing_files)} files", fg="red", bg="black").pack()
+# ==== Sessions: checkpoints and event logs ====
+# --checkpoint FILE restores the session saved in FILE at start-up (when
+# there is one), saves it every CHECKPOINT_SECONDS and again on quit, so
+# an exhibit picks up where it left off after a restart. --record FILE
+# logs every frame's physics steps and every input next to a checkpoint
+# of the starting state; "python session.py FILE" replays it headless
+# and bit for bit (see session.py). Recording needs serial physics, so it
+# can't be combined with --workers.
+CHECKPOINT_FILE = None
+CHECKPOINT_SECONDS = 60.0
+RECORD_FILE = None
+event_log = None
+recorded_camera = None
+
+def record(name, **args):
+    """Log an input for replay (nothing happens unless --record is on)"""
+    if event_log is not None:
+        event_log.event(sim_ticks(), name, **args)
+
+def record_camera():
+    """Log the camera whenever a drawn frame saw it change"""
+    global recorded_camera
+    if event_log is None:
+        return
+    view = (camera.zoom, *camera.center.tolist())
+    if view != recorded_camera:
+        recorded_camera = view
+        record("camera", zoom=view[0], center=list(view[1:]))
+
+def catalog_source():
+    if not CATALOG_FILE:
+        return None
+    return {"path": os.path.abspath(CATALOG_FILE), "sample": CATALOG_SAMPLE, "limit": CATALOG_LIMIT,
+            "seed": CATALOG_SEED}
+
+def save_session(path=None):
+    """Write the whole session to a checkpoint file"""
+    path = path or CHECKPOINT_FILE
+    began = time.perf_counter()
+    sync_parallel()       # the workers' state, written back while they keep running
+    arrays = engine.checkpoint()
+    arrays["sizes"] = bodies.sizes[:bodies.count]
+    arrays["trail_points"] = trails.buffer.points
+    settings = {
+        "bodies": bodies.count,
+        "catalog": catalog_source(),
+        "running": running,
+        "speed": speed_multiplier,
+        "labels": show_labels,
+        "trails": show_trails,
+        "trail_head": trails.buffer.head,
+        "trail_filled": trails.buffer.filled,
+        "camera": {"zoom": camera.target_zoom, "center": camera.center.tolist()},
+        "selected": selected_bodies,
+        "saved_at": time.time(),
+    }
+    size = save_checkpoint(path, arrays, settings)
+    log(f"💾 Session saved to {path} ({size / 1024:,.0f} KB, {(time.perf_counter() - began) * 1000:.1f} ms)")
+
+def restore_session(path):
+    """Load a checkpoint written by save_session into the running app"""
+    began = time.perf_counter()
+    arrays, settings = load_checkpoint(path)
+    if settings.get("bodies") != bodies.count:
+        raise ValueError(f"{path} holds {settings.get('bodies')} bodies, this scene {bodies.count}")
+    # No workers until the end: a stepper made now would keep stepping
+    # the old state and write it back over the checkpoint
+    stop_parallel()
+    if ("nbody_pos" in arrays) != (engine.driver is not None):
+        switch_gravity()        # part of the restore, not an input to log
+    engine.restore(arrays)
+    orbit_button.config(text="⭕ Circular Orbits" if engine.kepler.any() else "🪐 Kepler Orbits")
+
+    for i in np.flatnonzero(arrays["sizes"] != bodies.sizes[:bodies.count]):
+        resize_body(i, float(arrays["sizes"][i]))
+    update_body_radii()
+    if settings["labels"] != show_labels:
+        toggle_labels()
+    if settings["trails"] != show_trails:
+        toggle_trails()
+    if arrays["trail_points"].shape == trails.buffer.points.shape:
+        trails.buffer.points[:] = arrays["trail_points"]
+        trails.buffer.head, trails.buffer.filled = settings["trail_head"], settings["trail_filled"]
+    set_speed(settings["speed"])
+    camera.zoom = camera.target_zoom = settings["camera"]["zoom"]
+    camera.center[:] = settings["camera"]["center"]
+    if settings["selected"]:
+        show_selection([body_at(i) for i in settings["selected"]])
+    if settings["running"] != running:
+        toggle_run()
+    clock.reset()
+    update_day_label()
+    render_frame()
+    start_parallel()
+    log(f"💾 Session restored from {path} in {(time.perf_counter() - began) * 1000:.1f} ms "
+        f"(day {sim_day():,.0f})")
+
+def start_recording(path):
+    """Log from here on, starting from a checkpoint of the current state"""
+    global event_log
+    start = f"{path}.snap"
+    save_session(start)
+    event_log = EventLog(path, {"bodies": bodies.count, "catalog": catalog_source(),
+                                "kepler": KEPLER_ORBITS, "checkpoint": os.path.abspath(start)})
+    scheduler.every(1.0, event_log.flush, BACKGROUND, name="flush log")
+    log(f"⏺️ Recording to {path}")
+
+def stop_recording():
+    global event_log
+    if event_log is not None:
+        event_log.close(engine.time, engine.positions)
+        log(f"⏺️ {event_log.frames:,} frames and {event_log.events:,} inputs recorded")
+        event_log = None
+
+async def run_loop():
+    """Run the scheduler, and the control API and the stream if they are on, until the app quits"""
+    global streamer
+    server = None
+    if CONTROL_PORT:
+        server = await ControlServer(control_commands(), scheduler, CONTROL_HOST, CONTROL_PORT,
+                                     readonly=("state", "stats", "approaches")).start()
+        log(f"🛰️ Control API on http://{server.host}:{server.port}/")
+    if STREAM_PORT:
+        streamer = await StreamServer(STREAM_HOST, STREAM_PORT).start()
+        streamer.set_scene(stream_scene())
+        log(f"📡 Streaming frames on {streamer.host}:{streamer.port}")
+    try:
+        await scheduler.run()
+    finally:
+        if server is not None:
+            await server.close()
+        if streamer is not None:
+            await streamer.close()
+            streamer = None
 
-instructions = tk.Text(root, height=8, width=35, bg="black", fg="white", font=("Arial", 8))
-instructions.pack(pady=10)
-instructions.insert(tk.END, "🎮 INSTRUCTIONS:\n\n")
-instructions.insert(tk.END, "• CLICK any planet for info!\n")
-instructions.insert(tk.END, "• Info appears at TOP\n")
-instructions.insert(tk.END, "• Pause/Resume animation\n") 
-instructions.insert(tk.END, "• Zoom in/out for better view\n")
-instructions.insert(tk.END, "• Adjust planet sizes\n")
-instructions.insert(tk.END, "• Toggle labels and trails\n")
-instructions.insert(tk.END, "• Clear info with button\n")
-instructions.insert(tk.END, "• Reset to start over\n\n")
-instructions.insert(tk.END, "Click the Sun or planets to learn! 🌌")
-instructions.config(state=tk.DISABLED)
+# ==== Tkinter GUI (Control Panel) ====
+# A second window of the same Tk app as the turtle screen, so a single
+# event loop serves both.
+root = None
+
+def build_control_panel():
+    global root, run_button, speed_label, day_label, time_slider, day_entry, jump_button
+    global labels_button, trails_button, orbit_button, gravity_button, profile_button, hud, approaches_button
+    log("🎮 Creating control panel...")
+    root = tk.Toplevel(win.getcanvas())
+    root.protocol("WM_DELETE_WINDOW", quit_app)
+    root.title("🌌 Solar System Control Panel")
+    root.geometry("300x1000")
+    root.configure(bg='black')
+
+    title_label = tk.Label(root, text="🌌 Solar System Controls", fg="white", bg="black", font=("Arial", 12, "bold"))
+    title_label.pack(pady=10)
+
+    run_button = tk.Button(root, text="⏸️ Pause", command=toggle_run, width=20, bg="darkgreen", fg="white", font=("Arial", 10, "bold"))
+    run_button.pack(pady=5)
+
+    speed_frame = tk.Frame(root, bg="black")
+    speed_frame.pack(pady=10)
+
+    tk.Button(speed_frame, text="🚀 Speed Up", command=increase_speed, bg="blue", fg="white", width=10).pack(side=tk.LEFT, padx=2)
+    tk.Button(speed_frame, text="🐌 Slow Down", command=decrease_speed, bg="purple", fg="white", width=10).pack(side=tk.RIGHT, padx=2)
+
+    speed_label = tk.Label(root, text=f"Speed: {speed_multiplier:.1f}x", fg="yellow", bg="black", font=("Arial", 10))
+    speed_label.pack()
+
+    day_label = tk.Label(root, text="📅 Day 0", fg="cyan", bg="black", font=("Arial", 10))
+    day_label.pack()
+
+    time_slider = tk.Scale(root, from_=0, to=EPHEMERIS_DAYS, orient=tk.HORIZONTAL, length=220,
+                           label="Scrub time (days)", command=on_time_slider,
+                           bg="black", fg="white", troughcolor="gray20", highlightthickness=0)
+    time_slider.pack()
+
+    jump_frame = tk.Frame(root, bg="black")
+    jump_frame.pack(pady=5)
+    day_entry = tk.Entry(jump_frame, width=8)
+    day_entry.pack(side=tk.LEFT, padx=2)
+    jump_button = tk.Button(jump_frame, text="📅 Jump to Day", command=jump_to_day, bg="darkblue", fg="white")
+    jump_button.pack(side=tk.LEFT, padx=2)
+
+    zoom_frame = tk.Frame(root, bg="black")
+    zoom_frame.pack(pady=10)
+
+    tk.Button(zoom_frame, text="🔍 Zoom In", command=zoom_in, bg="darkblue", fg="white", width=10).pack(side=tk.LEFT, padx=2)
+    tk.Button(zoom_frame, text="🔍 Zoom Out", command=zoom_out, bg="darkred", fg="white", width=10).pack(side=tk.RIGHT, padx=2)
+
+    size_frame = tk.Frame(root, bg="black")
+    size_frame.pack(pady=10)
+
+    tk.Button(size_frame, text="📏 Smaller", command=make_smaller, bg="brown", fg="white", width=10).pack(side=tk.LEFT, padx=2)
+    tk.Button(size_frame, text="📏 Bigger", command=make_bigger, bg="darkorange", fg="white", width=10).pack(side=tk.RIGHT, padx=2)
+
+    labels_button = tk.Button(root, text="🚫 Hide Labels", command=toggle_labels, width=20, bg="darkgray", fg="white")
+    labels_button.pack(pady=5)
+
+    trails_button = tk.Button(root, text="🚫 Hide Trails", command=toggle_trails, width=20, bg="darkgray", fg="white")
+    trails_button.pack(pady=5)
+
+    orbit_button = tk.Button(root, text="⭕ Circular Orbits" if KEPLER_ORBITS else "🪐 Kepler Orbits",
+                             command=toggle_orbit_mode, width=20, bg="darkgray", fg="white")
+    orbit_button.pack(pady=5)
+
+    gravity_button = tk.Button(root, text="🌍 N-Body Gravity", command=toggle_gravity, width=20, bg="darkgray", fg="white")
+    gravity_button.pack(pady=5)
+
+    approaches_button = tk.Button(root, text="🚫 Hide Approaches", command=toggle_approaches, width=20,
+                                  bg="darkgray", fg="white")
+    approaches_button.pack(pady=5)
+
+    info_button = tk.Button(root, text="🗑️ Clear Info", command=clear_info_display, width=20, bg="darkblue", fg="white")
+    info_button.pack(pady=5)
+
+    reset_button = tk.Button(root, text="🔄 Reset Everything", command=reset_simulation, width=20, bg="darkred", fg="white", font=("Arial", 10, "bold"))
+    reset_button.pack(pady=15)
+
+    status_frame = tk.Frame(root, bg="black")
+    status_frame.pack(pady=10)
+
+    tk.Label(status_frame, text="📊 Status:", fg="white", bg="black", font=("Arial", 10, "bold")).pack()
+    tk.Label(status_frame, text=f"GIFs Found: {len(ASSET_FILES) - len(missing_files)}/{len(ASSET_FILES)}", fg="lime", bg="black").pack()
+    tk.Label(status_frame, text=f"Planets: {bodies.count}", fg="cyan", bg="black").pack()
+    tk.Label(status_frame, text="☀️ Sun size: 1.2", fg="yellow", bg="black").pack()
+    tk.Label(status_frame, text="💡 Click planets for info!", fg="yellow", bg="black", font=("Arial", 9, "bold")).pack()
+
+    if missing_files:
+        tk.Label(status_frame, text=f"Missing: {len(missing_files)} files", fg="red", bg="black").pack()
+
+    # Live numbers: FPS, frame-time histogram, canvas items, time per stage
+    hud = PerfHUD(status_frame, perf, canvas=win.getcanvas(), scheduler=scheduler)
+    profile_button = tk.Button(status_frame, text=f"🔬 Profile {PROFILE_FRAMES} frames", command=start_profile,
+                               bg="darkslategray", fg="white")
+    profile_button.pack(pady=3)
+
+    instructions = tk.Text(root, height=8, width=35, bg="black", fg="white", font=("Arial", 8))
+    instructions.pack(pady=10)
+    instructions.insert(tk.END, "🎮 INSTRUCTIONS:\n\n")
+    instructions.insert(tk.END, "• CLICK any planet for info!\n")
+    instructions.insert(tk.END, "• Info appears at TOP\n")
+    instructions.insert(tk.END, "• Pause/Resume animation\n") 
+    instructions.insert(tk.END, "• Zoom in/out for better view\n")
+    instructions.insert(tk.END, "• Mouse wheel zooms, right-drag pans\n")
+    instructions.insert(tk.END, "• Adjust planet sizes\n")
+    instructions.insert(tk.END, "• Toggle labels and trails\n")
+    instructions.insert(tk.END, "• Clear info with button\n")
+    instructions.insert(tk.END, "• Reset to start over\n\n")
+    instructions.insert(tk.END, "Click the Sun or planets to learn! 🌌")
+    instructions.config(state=tk.DISABLED)
 
 # ==== Start everything ====
-print("\n🚀 Starting solar system simulation...")
-print("🎮 Control panel is ready!")
-print("💡 Click on any planet or the sun to see information!")
-print("📄 Information now displays at the TOP of the screen!")
-print("✨ All planets are smaller for better viewing!")
-
-animate()
-root.mainloop()
\ No newline at end of file
+def main(argv=None):
+    """Build the app, report the startup time and run the scheduler until the windows close"""
+    global VERBOSE, PARALLEL_WORKERS, CATALOG_FILE, CATALOG_LIMIT, CATALOG_SAMPLE, startup_seconds
+    global CONTROL_HOST, CONTROL_PORT, STREAM_HOST, STREAM_PORT, CHECKPOINT_FILE, RECORD_FILE
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Interactive solar system")
+    parser.add_argument("--verbose", action="store_true", help="print start-up status lines")
+    parser.add_argument("--workers", type=int, default=PARALLEL_WORKERS,
+                        help="physics worker processes (0 = step on the UI thread)")
+    parser.add_argument("--catalog", help="asteroid/comet catalogue to add (CSV, JSON, JSON lines or MPCORB.DAT)")
+    parser.add_argument("--catalog-limit", type=int, default=CATALOG_LIMIT,
+                        help="show the first N usable catalogue rows (after --catalog-sample)")
+    parser.add_argument("--catalog-sample", type=float, default=CATALOG_SAMPLE,
+                        help="fraction of the catalogue to keep at random")
+    parser.add_argument("--control-port", type=int, default=CONTROL_PORT,
+                        help="serve the HTTP control API on this port (0 = off)")
+    parser.add_argument("--control-host", default=CONTROL_HOST,
+                        help="address the control API listens on")
+    parser.add_argument("--stream-port", type=int, default=STREAM_PORT,
+                        help="stream frames to viewers (python stream.py) on this port (0 = off)")
+    parser.add_argument("--stream-host", default=STREAM_HOST,
+                        help="address the frame stream listens on")
+    parser.add_argument("--checkpoint", help="resume from this file if it exists, and keep saving to it")
+    parser.add_argument("--record", help="log frames and inputs to this file for session.py to replay")
+    args = parser.parse_args(argv)
+    if args.record and args.workers > 0:
+        # Workers apply queued steps in one merged update and report time late,
+        # so neither the ticks logged nor the arithmetic would replay exactly
+        parser.error("--record steps physics on the UI thread; drop --workers")
+    VERBOSE = args.verbose
+    PARALLEL_WORKERS = args.workers
+    CATALOG_FILE, CATALOG_LIMIT, CATALOG_SAMPLE = args.catalog, args.catalog_limit, args.catalog_sample
+    CONTROL_HOST, CONTROL_PORT = args.control_host, args.control_port
+    STREAM_HOST, STREAM_PORT = args.stream_host, args.stream_port
+    CHECKPOINT_FILE, RECORD_FILE = args.checkpoint, args.record
+
+    began = time.perf_counter()
+    check_assets()
+    setup_window()
+    build_scene()
+    log("🎯 Setting initial positions...")
+    render_frame()
+    win.update()
+    startup_seconds = time.perf_counter() - began
+    if startup_seconds > STARTUP_BUDGET:
+        print(f"⚠️ First frame took {startup_seconds * 1000:.0f} ms "
+              f"(budget {STARTUP_BUDGET * 1000:.0f} ms)")
+    else:
+        log(f"🚀 First frame in {startup_seconds * 1000:.0f} ms")
+
+    build_control_panel()
+    if CHECKPOINT_FILE:
+        if os.path.exists(CHECKPOINT_FILE):
+            try:
+                restore_session(CHECKPOINT_FILE)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Could not restore {CHECKPOINT_FILE}: {e}")
+        scheduler.every(CHECKPOINT_SECONDS, save_session, BACKGROUND, delay=CHECKPOINT_SECONDS)
+    if RECORD_FILE:
+        start_recording(RECORD_FILE)
+    # Frames, input and the panel run as scheduler tasks, most urgent first
+    scheduler.every(FRAME_SECONDS, step_physics, PHYSICS)
+    scheduler.every(FRAME_SECONDS, draw_frame, RENDER)
+    scheduler.every(INPUT_SECONDS, pump_tk, INPUT)
+    scheduler.every(0.05, poll_sprites, BACKGROUND)
+    # Not needed for the first frame: stars, the time-scrub table, resized GIFs
+    scheduler.call_later(0.0, setup_stars)
+    scheduler.call_later(0.05, rebuild_ephemeris)
+    log("\n🚀 Starting solar system simulation...")
+    log("🎮 Control panel is ready!")
+    log("💡 Click on any planet or the sun to see information!")
+    log("📄 Information now displays at the TOP of the screen!")
+
+    clock.reset()
+    start_parallel()
+    try:
+        asyncio.run(run_loop())
+    finally:
+        stop_parallel()
+        if CHECKPOINT_FILE:
+            save_session()
+        stop_recording()
+        remove_ephemeris()
+        sprites.close()
+        try:
+            win.bye()
+        except (tk.TclError, turtle.Terminator):
+            pass
+
+
+if __name__ == "__main__":
+    main()
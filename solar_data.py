@@ -0,0 +1,246 @@
+# =====================================================================
+# 🪐 SOLAR SYSTEM DATA
+# =====================================================================
+# Plain data shared by the turtle app and the headless tools: the
+# information shown when a body is clicked, and the table of bodies
+# (orbit radius, speed, parent, look) that the simulation is built from.
+# Nothing in here touches the display.
+# =====================================================================
+
+# ==== Planet Information Database ====
+planet_info = {
+    "sun": {
+        "name": "Sun",
+        "type": "Star",
+        "diameter": "1,391,000 km",
+        "mass": "1.989 × 10³⁰ kg",
+        "temperature": "5,500°C (surface)",
+        "composition": "71% Hydrogen, 27% Helium, 2% Other",
+        "fun_fact": "The Sun contains 99.86% of all mass in our Solar System!",
+        "description": "Our Sun is a yellow dwarf star that provides the energy for life on Earth."
+    },
+    "mercury": {
+        "name": "Mercury",
+        "type": "Terrestrial Planet",
+        "diameter": "4,879 km",
+        "mass": "3.301 × 10²³ kg",
+        "temperature": "430°C (day), -180°C (night)",
+        "orbital_period": "88 Earth days",
+        "fun_fact": "A day on Mercury lasts longer than its year!",
+        "description": "The smallest and innermost planet, with extreme temperature variations."
+    },
+    "venus": {
+        "name": "Venus",
+        "type": "Terrestrial Planet", 
+        "diameter": "12,104 km",
+        "mass": "4.867 × 10²⁴ kg",
+        "temperature": "465°C",
+        "orbital_period": "225 Earth days",
+        "fun_fact": "Venus rotates backwards compared to other planets!",
+        "description": "Often called Earth's sister planet, but with a runaway greenhouse effect."
+    },
+    "earth": {
+        "name": "Earth",
+        "type": "Terrestrial Planet",
+        "diameter": "12,756 km",
+        "mass": "5.972 × 10²⁴ kg",
+        "temperature": "15°C (average)",
+        "orbital_period": "365.25 days",
+        "fun_fact": "Earth is the only known planet with liquid water on its surface!",
+        "description": "Our home planet, the only known place in the universe with life."
+    },
+    "mars": {
+        "name": "Mars",
+        "type": "Terrestrial Planet",
+        "diameter": "6,792 km",
+        "mass": "6.417 × 10²³ kg",
+        "temperature": "-65°C (average)",
+        "orbital_period": "687 Earth days",
+        "fun_fact": "Mars has the largest volcano in the Solar System - Olympus Mons!",
+        "description": "The Red Planet, with polar ice caps and evidence of past water."
+    },
+    "jupiter": {
+        "name": "Jupiter",
+        "type": "Gas Giant",
+        "diameter": "142,984 km",
+        "mass": "1.898 × 10²⁷ kg",
+        "temperature": "-145°C (cloud tops)",
+        "orbital_period": "11.86 Earth years",
+        "fun_fact": "Jupiter's Great Red Spot is a storm that has raged for over 400 years!",
+        "description": "The largest planet, a gas giant with a prominent Great Red Spot."
+    },
+    "saturn": {
+        "name": "Saturn",
+        "type": "Gas Giant",
+        "diameter": "120,536 km",
+        "mass": "5.683 × 10²⁶ kg",
+        "temperature": "-178°C (cloud tops)",
+        "orbital_period": "29.46 Earth years",
+        "fun_fact": "Saturn would float in water if you could find a big enough ocean!",
+        "description": "Known for its spectacular ring system made of ice and rock particles."
+    },
+    "uranus": {
+        "name": "Uranus",
+        "type": "Ice Giant",
+        "diameter": "51,118 km",
+        "mass": "8.681 × 10²⁵ kg",
+        "temperature": "-224°C",
+        "orbital_period": "84 Earth years",
+        "fun_fact": "Uranus rotates on its side - practically rolling around the Sun!",
+        "description": "An ice giant that rotates on its side with a unique blue-green color."
+    },
+    "neptune": {
+        "name": "Neptune",
+        "type": "Ice Giant",
+        "diameter": "49,528 km",
+        "mass": "1.024 × 10²⁶ kg",
+        "temperature": "-218°C",
+        "orbital_period": "164.8 Earth years",
+        "fun_fact": "Neptune has the strongest winds in the Solar System - over 2,000 km/h!",
+        "description": "The windiest planet, a deep blue ice giant with violent storms."
+    },
+    "moon": {
+        "name": "Moon",
+        "type": "Natural Satellite",
+        "diameter": "3,476 km",
+        "mass": "7.342 × 10²² kg",
+        "temperature": "127°C (day), -173°C (night)",
+        "orbital_period": "27.3 Earth days",
+        "fun_fact": "The Moon is slowly moving away from Earth at 3.8 cm per year!",
+        "description": "Earth's only natural satellite, responsible for ocean tides."
+    },
+    "io": {
+        "name": "Io",
+        "type": "Natural Satellite",
+        "diameter": "3,643 km",
+        "mass": "8.932 × 10²² kg",
+        "temperature": "-130°C",
+        "orbital_period": "1.77 Earth days",
+        "fun_fact": "Io is the most volcanically active world in the Solar System, with over 400 active volcanoes!",
+        "description": "Jupiter's innermost Galilean moon, kneaded and heated by Jupiter's tides."
+    },
+    "europa": {
+        "name": "Europa",
+        "type": "Natural Satellite",
+        "diameter": "3,122 km",
+        "mass": "4.800 × 10²² kg",
+        "temperature": "-160°C",
+        "orbital_period": "3.55 Earth days",
+        "fun_fact": "Under its ice lies a salty ocean with about twice as much water as all of Earth's oceans!",
+        "description": "A smooth, icy Galilean moon and one of the best places to look for life."
+    },
+    "ganymede": {
+        "name": "Ganymede",
+        "type": "Natural Satellite",
+        "diameter": "5,268 km",
+        "mass": "1.482 × 10²³ kg",
+        "temperature": "-163°C",
+        "orbital_period": "7.15 Earth days",
+        "fun_fact": "Ganymede is bigger than Mercury and the only moon with its own magnetic field!",
+        "description": "The largest moon in the Solar System, made of rock and ice."
+    },
+    "callisto": {
+        "name": "Callisto",
+        "type": "Natural Satellite",
+        "diameter": "4,821 km",
+        "mass": "1.076 × 10²³ kg",
+        "temperature": "-139°C",
+        "orbital_period": "16.69 Earth days",
+        "fun_fact": "Callisto's surface is the most heavily cratered in the Solar System!",
+        "description": "The outermost Galilean moon, an ancient, dark ball of ice and rock."
+    },
+    "enceladus": {
+        "name": "Enceladus",
+        "type": "Natural Satellite",
+        "diameter": "504 km",
+        "mass": "1.080 × 10²⁰ kg",
+        "temperature": "-198°C",
+        "orbital_period": "1.37 Earth days",
+        "fun_fact": "Geysers at its south pole spray ice into space and feed one of Saturn's rings!",
+        "description": "A small, snow-white moon hiding a global ocean under its crust."
+    },
+    "tethys": {
+        "name": "Tethys",
+        "type": "Natural Satellite",
+        "diameter": "1,062 km",
+        "mass": "6.174 × 10²⁰ kg",
+        "temperature": "-187°C",
+        "orbital_period": "1.89 Earth days",
+        "fun_fact": "Its crater Odysseus is two-fifths as wide as Tethys itself!",
+        "description": "An icy moon made almost entirely of frozen water."
+    },
+    "dione": {
+        "name": "Dione",
+        "type": "Natural Satellite",
+        "diameter": "1,123 km",
+        "mass": "1.095 × 10²¹ kg",
+        "temperature": "-186°C",
+        "orbital_period": "2.74 Earth days",
+        "fun_fact": "Bright ice cliffs hundreds of kilometres long streak across Dione's trailing side!",
+        "description": "A dense, icy moon that may hold an ocean deep below its surface."
+    },
+    "rhea": {
+        "name": "Rhea",
+        "type": "Natural Satellite",
+        "diameter": "1,527 km",
+        "mass": "2.307 × 10²¹ kg",
+        "temperature": "-174°C",
+        "orbital_period": "4.52 Earth days",
+        "fun_fact": "Rhea is Saturn's second-largest moon and is almost three-quarters water ice!",
+        "description": "A heavily cratered, icy moon orbiting outside Saturn's main rings."
+    },
+    "titan": {
+        "name": "Titan",
+        "type": "Natural Satellite",
+        "diameter": "5,150 km",
+        "mass": "1.345 × 10²³ kg",
+        "temperature": "-179°C",
+        "orbital_period": "15.95 Earth days",
+        "fun_fact": "Titan has lakes and rivers of liquid methane and a thicker atmosphere than Earth!",
+        "description": "Saturn's largest moon, wrapped in a thick orange haze."
+    },
+    "iapetus": {
+        "name": "Iapetus",
+        "type": "Natural Satellite",
+        "diameter": "1,469 km",
+        "mass": "1.806 × 10²¹ kg",
+        "temperature": "-143°C (dark side)",
+        "orbital_period": "79.3 Earth days",
+        "fun_fact": "One side of Iapetus is as dark as coal and the other as bright as snow!",
+        "description": "A two-toned moon on Saturn's most steeply tilted major orbit."
+    }
+}
+
+# ==== Body Table ====
+# One row per simulated body. "parent" names the body it orbits ("sun" is
+# the fixed centre); parents must appear before their satellites, and
+# satellites may have satellites of their own. Moons without a picture
+# (gif_key None) are drawn as coloured dots.
+# "radius" is the drawn orbit size (the semi-major axis in Kepler mode);
+# eccentricity, inclination, node and perihelion (longitude, degrees) are
+# the real orbital elements used by the Kepler orbit mode. "au" is the real
+# semi-major axis, used to place catalogue bodies between the drawn orbits.
+# "speed" is radians per tick on the circular orbit; a moon system's
+# fastest "speed" also caps its moons' Kepler motion (one tick is about
+# two days, far too long for Io's real 1.8-day orbit).
+SOLAR_BODIES = [
+    {"name": "Mercury", "gif_key": "mercury", "parent": "sun", "au": 0.387, "radius": 180, "offset": 0, "size": 0.15, "color": "gray", "size_label": "4,879 km", "eccentricity": 0.2056, "inclination": 7.0, "node": 48.33, "perihelion": 77.46, "speed": 0.06},
+    {"name": "Venus", "gif_key": "venus", "parent": "sun", "au": 0.723, "radius": 220, "offset": 0, "size": 0.18, "color": "orange", "size_label": "12,104 km", "eccentricity": 0.0068, "inclination": 3.39, "node": 76.68, "perihelion": 131.53, "speed": 0.045},
+    {"name": "Earth", "gif_key": "earth", "parent": "sun", "au": 1.0, "radius": 280, "offset": 0, "size": 0.2, "color": "blue", "size_label": "12,756 km", "eccentricity": 0.0167, "inclination": 0.0, "node": 0.0, "perihelion": 102.94, "speed": 0.035},
+    {"name": "Mars", "gif_key": "mars", "parent": "sun", "au": 1.524, "radius": 340, "offset": 0, "size": 0.16, "color": "red", "size_label": "6,792 km", "eccentricity": 0.0934, "inclination": 1.85, "node": 49.56, "perihelion": 336.04, "speed": 0.025},
+    {"name": "Jupiter", "gif_key": "jupiter", "parent": "sun", "au": 5.203, "radius": 460, "offset": 0, "size": 0.35, "color": "orange", "size_label": "142,984 km", "eccentricity": 0.0489, "inclination": 1.3, "node": 100.46, "perihelion": 14.33, "speed": 0.015},
+    {"name": "Saturn", "gif_key": "saturn", "parent": "sun", "au": 9.537, "radius": 560, "offset": 0, "size": 0.3, "color": "khaki", "size_label": "120,536 km", "eccentricity": 0.0565, "inclination": 2.49, "node": 113.67, "perihelion": 93.06, "speed": 0.012},
+    {"name": "Uranus", "gif_key": "uranus", "parent": "sun", "au": 19.19, "radius": 660, "offset": 0, "size": 0.22, "color": "cyan", "size_label": "51,118 km", "eccentricity": 0.0457, "inclination": 0.77, "node": 74.01, "perihelion": 173.01, "speed": 0.008},
+    {"name": "Neptune", "gif_key": "neptune", "parent": "sun", "au": 30.07, "radius": 760, "offset": 0, "size": 0.21, "color": "blue", "size_label": "49,528 km", "eccentricity": 0.0113, "inclination": 1.77, "node": 131.78, "perihelion": 48.12, "speed": 0.006},
+    {"name": "Moon", "gif_key": "moon", "parent": "earth", "radius": 45, "offset": 0, "size": 0.08, "color": "lightgray", "size_label": "3,476 km", "eccentricity": 0.0549, "inclination": 5.14, "node": 0.0, "perihelion": 0.0, "speed": 0.15, "trail": False},
+    {"name": "Io", "gif_key": None, "parent": "jupiter", "radius": 80, "offset": 0, "size": 0.08, "color": "yellow", "size_label": "3,643 km", "eccentricity": 0.0041, "inclination": 0.05, "node": 0.0, "perihelion": 84.1, "speed": 0.25, "trail": False},
+    {"name": "Europa", "gif_key": None, "parent": "jupiter", "radius": 92, "offset": 0, "size": 0.075, "color": "wheat", "size_label": "3,122 km", "eccentricity": 0.009, "inclination": 0.47, "node": 0.0, "perihelion": 88.97, "speed": 0.18, "trail": False},
+    {"name": "Ganymede", "gif_key": None, "parent": "jupiter", "radius": 106, "offset": 0, "size": 0.09, "color": "tan", "size_label": "5,268 km", "eccentricity": 0.0013, "inclination": 0.2, "node": 0.0, "perihelion": 192.4, "speed": 0.13, "trail": False},
+    {"name": "Callisto", "gif_key": None, "parent": "jupiter", "radius": 124, "offset": 0, "size": 0.085, "color": "rosybrown", "size_label": "4,821 km", "eccentricity": 0.0074, "inclination": 0.19, "node": 0.0, "perihelion": 52.6, "speed": 0.09, "trail": False},
+    {"name": "Enceladus", "gif_key": None, "parent": "saturn", "radius": 70, "offset": 0, "size": 0.05, "color": "white", "size_label": "504 km", "eccentricity": 0.0047, "inclination": 0.01, "node": 0.0, "perihelion": 0.0, "speed": 0.28, "trail": False},
+    {"name": "Tethys", "gif_key": None, "parent": "saturn", "radius": 78, "offset": 0, "size": 0.055, "color": "lightgray", "size_label": "1,062 km", "eccentricity": 0.0001, "inclination": 1.12, "node": 0.0, "perihelion": 0.0, "speed": 0.24, "trail": False},
+    {"name": "Dione", "gif_key": None, "parent": "saturn", "radius": 86, "offset": 0, "size": 0.055, "color": "gainsboro", "size_label": "1,123 km", "eccentricity": 0.0022, "inclination": 0.02, "node": 0.0, "perihelion": 0.0, "speed": 0.2, "trail": False},
+    {"name": "Rhea", "gif_key": None, "parent": "saturn", "radius": 96, "offset": 0, "size": 0.06, "color": "lightgray", "size_label": "1,527 km", "eccentricity": 0.001, "inclination": 0.35, "node": 0.0, "perihelion": 0.0, "speed": 0.16, "trail": False},
+    {"name": "Titan", "gif_key": None, "parent": "saturn", "radius": 112, "offset": 0, "size": 0.09, "color": "orange", "size_label": "5,150 km", "eccentricity": 0.0288, "inclination": 0.35, "node": 0.0, "perihelion": 180.5, "speed": 0.1, "trail": False},
+    {"name": "Iapetus", "gif_key": None, "parent": "saturn", "radius": 132, "offset": 0, "size": 0.06, "color": "gray", "size_label": "1,469 km", "eccentricity": 0.0286, "inclination": 15.47, "node": 0.0, "perihelion": 275.9, "speed": 0.05, "trail": False},
+]
@@ -0,0 +1,74 @@
+# =====================================================================
+# ✨ STAR FIELD
+# =====================================================================
+# Batched, seeded twinkling star background for the solar system app.
+#
+# All stars live in compact NumPy arrays (x, y, size). Each star is a
+# plain canvas oval (no Turtle object behind it), and a twinkle tick
+# rewrites the coordinates of every changed star in ONE Tcl script, so
+# the whole update is a single round-trip to Tk instead of one per star.
+# The twinkle pattern comes from the field's own random generator, so a
+# seed reproduces the same sky and the same twinkles every run.
+# =====================================================================
+
+import numpy as np
+
+
+def _canvas_path(canvas):
+    """Tcl path of the real Tk canvas (turtle wraps it in a ScrolledCanvas)"""
+    return getattr(canvas, "_canvas", canvas)._w
+
+
+class StarField:
+    """A field of twinkling stars stored as arrays and drawn in batches"""
+
+    def __init__(self, count, width=1400, height=900, seed=None,
+                 min_size=1.0, max_size=3.5, twinkle_fraction=0.3, color="white"):
+        self.rng = np.random.default_rng(seed)
+        self.count = count
+        self.min_size = min_size
+        self.max_size = max_size
+        self.twinkle_fraction = twinkle_fraction
+        self.color = color
+        half_w, half_h = width // 2, height // 2
+        self.x = self.rng.integers(-half_w, half_w + 1, count).astype(np.float32)
+        self.y = self.rng.integers(-half_h, half_h + 1, count).astype(np.float32)
+        self.size = self.rng.integers(1, 4, count).astype(np.float32)
+        self.canvas = None
+        self.items = None
+        self.tag = f"starfield{id(self)}"
+
+    def _oval_coords(self, idx):
+        # A turtle dot of size d is a circle of diameter d; canvas y points down
+        r = self.size[idx] / 2.0
+        x, y = self.x[idx], -self.y[idx]
+        return np.column_stack((x - r, y - r, x + r, y + r))
+
+    def attach(self, canvas):
+        """Create one lightweight oval per star on the canvas, in one batch"""
+        self.canvas = canvas
+        path = _canvas_path(canvas)
+        coords = self._oval_coords(np.arange(self.count)).tolist()
+        script = "\n".join(
+            f"{path} create oval {x0:.1f} {y0:.1f} {x1:.1f} {y1:.1f} "
+            f"-fill {self.color} -outline {{}} -tags {self.tag}"
+            for x0, y0, x1, y1 in coords
+        )
+        if script:
+            canvas.tk.eval(script)
+        # Items come back in creation order, which is star order
+        self.items = np.array(canvas.find_withtag(self.tag), dtype=np.int64)
+
+    def twinkle(self):
+        """Give a random subset of stars a new size; returns the changed indices"""
+        changed = np.flatnonzero(self.rng.random(self.count) < self.twinkle_fraction)
+        self.size[changed] = self.rng.uniform(self.min_size, self.max_size, len(changed))
+        if self.canvas is not None and len(changed):
+            path = _canvas_path(self.canvas)
+            coords = self._oval_coords(changed).tolist()
+            script = "\n".join(
+                f"{path} coords {item} {x0:.1f} {y0:.1f} {x1:.1f} {y1:.1f}"
+                for item, (x0, y0, x1, y1) in zip(self.items[changed].tolist(), coords)
+            )
+            self.canvas.tk.eval(script)
+        return changed
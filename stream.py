@@ -0,0 +1,384 @@
+# =====================================================================
+# 📡 STATE STREAMING
+# =====================================================================
+# Mirrors one running simulation in any number of thin viewer windows,
+# e.g. a wall of screens fed by one machine.
+#
+# The app publishes every drawn frame's world positions plus a small
+# view state (running, speed, camera, selection and its info) to a
+# local TCP port. The wire format is compact and binary:
+#
+#   • positions are quantized to QUANTUM world units (int32)
+#   • a KEYFRAME carries them all; the frames after it are DELTAs
+#     against that keyframe (int16), so any delta can be decoded with
+#     only its keyframe, whatever frames were skipped in between
+#   • a new keyframe every KEYFRAME_EVERY frames, or sooner when a body
+#     moved too far for an int16 delta
+#   • the scene (names, labels, colours, radii) and the view state are
+#     JSON, sent on connect and when they change; identical frames
+#     (paused) are not sent at all
+#
+# Each frame is encoded once and the same bytes are handed to every
+# viewer's socket, so the app's cost per extra viewer is one buffered
+# write. A viewer that can't keep up is skipped rather than queued for:
+# it gets deltas only against a keyframe it has, and is dropped if its
+# backlog keeps growing.
+#
+#   python solarSystem1.py --stream-port 8766
+#   python stream.py --port 8766          (as many as you like)
+# =====================================================================
+
+import asyncio
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b"SOL1"
+HEADER = struct.Struct("<BI")           # message kind, payload length
+SCENE, STATE, KEYFRAME, DELTA = 1, 2, 3, 4
+KEY_HEAD = struct.Struct("<IdfI")       # frame number, day, quantum, body count
+DELTA_HEAD = struct.Struct("<IIdI")     # frame number, its keyframe's number, day, body count
+
+QUANTUM = 1 / 32          # world units per step (~1/32 pixel at zoom 1)
+KEYFRAME_EVERY = 60       # frames between keyframes (about a second)
+MAX_BUFFER = 256 * 1024   # a viewer with this much unsent data is skipped for a frame
+DROP_BUFFER = 8 * 2 ** 20 # ... and disconnected past this
+_INT16 = np.iinfo(np.int16).max
+_INT32 = np.iinfo(np.int32).max
+
+
+def message(kind, payload):
+    return HEADER.pack(kind, len(payload)) + payload
+
+
+def json_message(kind, obj):
+    return message(kind, json.dumps(obj, separators=(",", ":")).encode("utf-8"))
+
+
+class FrameEncoder:
+    """Quantizes position frames into keyframe / delta messages"""
+
+    def __init__(self, quantum=QUANTUM, keyframe_every=KEYFRAME_EVERY):
+        self.quantum = quantum
+        self.keyframe_every = keyframe_every
+        self.frame = 0             # keeps counting across resets, so keyframe numbers stay unique
+        self.reset()
+
+    def reset(self):
+        """Make the next frame a keyframe"""
+        self.key_frame = None      # number of the current keyframe
+        self._key = None           # its quantized positions
+        self._last = None
+
+    def encode(self, positions, day):
+        """(bytes, is_keyframe) for one (N, 2) frame; (None, False) if nothing moved"""
+        q = np.rint(np.clip(np.asarray(positions, dtype=np.float64) / self.quantum,
+                            -_INT32, _INT32)).astype(np.int32)
+        if self._last is not None and q.shape == self._last.shape and np.array_equal(q, self._last):
+            return None, False
+        self._last = q
+        self.frame += 1
+        count = len(q)
+        if self._key is not None and self._key.shape == q.shape and self.frame - self.key_frame < self.keyframe_every:
+            delta = q - self._key
+            if not len(delta) or np.abs(delta).max() <= _INT16:
+                head = DELTA_HEAD.pack(self.frame, self.key_frame, day, count)
+                return message(DELTA, head + delta.astype("<i2").tobytes()), False
+        self._key = q
+        self.key_frame = self.frame
+        head = KEY_HEAD.pack(self.frame, day, self.quantum, count)
+        return message(KEYFRAME, head + q.astype("<i4").tobytes()), True
+
+
+class FrameDecoder:
+    """Rebuilds positions, scene and state from a stream's messages"""
+
+    def __init__(self):
+        self.scene = None
+        self.state = {}
+        self.positions = None      # latest (N, 2) world positions
+        self.day = 0.0
+        self.frame = 0
+        self.frames = 0            # frames decoded (keyframes included)
+        self.skipped = 0           # deltas whose keyframe we don't have
+        self._key = None
+        self._key_frame = None
+        self._quantum = QUANTUM
+
+    def apply(self, kind, payload):
+        """Decode one message; returns its kind"""
+        if kind == SCENE:
+            self.scene = json.loads(payload)
+            self._key = self.positions = None
+        elif kind == STATE:
+            self.state = json.loads(payload)
+        elif kind == KEYFRAME:
+            self.frame, self.day, self._quantum, count = KEY_HEAD.unpack_from(payload)
+            self._key = np.frombuffer(payload, "<i4", count * 2, KEY_HEAD.size).reshape(count, 2)
+            self._key_frame = self.frame
+            self.positions = self._key * self._quantum
+            self.frames += 1
+        elif kind == DELTA:
+            frame, key_frame, day, count = DELTA_HEAD.unpack_from(payload)
+            if key_frame != self._key_frame or self._key is None or len(self._key) != count:
+                self.skipped += 1
+                return kind
+            delta = np.frombuffer(payload, "<i2", count * 2, DELTA_HEAD.size).reshape(count, 2)
+            self.frame, self.day = frame, day
+            self.positions = (self._key + delta) * self._quantum
+            self.frames += 1
+        return kind
+
+
+async def read_message(reader):
+    """(kind, payload) of the next message on an asyncio stream"""
+    kind, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return kind, await reader.readexactly(length)
+
+
+class _Viewer:
+    __slots__ = ("writer", "key_frame", "sent", "skipped")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.key_frame = None      # the newest keyframe this viewer was sent
+        self.sent = 0
+        self.skipped = 0
+
+
+class StreamServer:
+    """Broadcasts frames and view state to every connected viewer"""
+
+    def __init__(self, host="127.0.0.1", port=8766, quantum=QUANTUM, keyframe_every=KEYFRAME_EVERY,
+                 max_buffer=MAX_BUFFER):
+        self.host = host
+        self.port = port
+        self.max_buffer = max_buffer
+        self.encoder = FrameEncoder(quantum, keyframe_every)
+        self.viewers = []
+        self.bytes_out = 0
+        self.server = None
+        self._scene = json_message(SCENE, {})
+        self._state = None
+        self._state_message = json_message(STATE, {})
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]    # the real one when port was 0
+        return self
+
+    async def close(self):
+        for viewer in list(self.viewers):
+            self._drop(viewer)
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _handle(self, reader, writer):
+        viewer = _Viewer(writer)
+        writer.write(MAGIC + self._scene + self._state_message)
+        self.viewers.append(viewer)
+        self.encoder.reset()           # a keyframe for the newcomer on the next frame
+        try:
+            while await reader.read(4096):   # viewers only talk to hang up
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self._drop(viewer)
+
+    def _drop(self, viewer):
+        if viewer in self.viewers:
+            self.viewers.remove(viewer)
+            viewer.writer.close()
+
+    # ---- publishing ----
+    def set_scene(self, scene):
+        """Names, labels, colours and radii of the bodies, as a JSON-ready dict"""
+        self._scene = json_message(SCENE, scene)
+        self.encoder.reset()
+        self._send_all(self._scene)
+
+    def publish(self, positions, day, state=None):
+        """Send one frame (and the view state if it changed) to every viewer"""
+        if not self.viewers:
+            return
+        if state is not None and state != self._state:
+            self._state = state
+            self._state_message = json_message(STATE, state)
+            self._send_all(self._state_message)
+        data, keyframe = self.encoder.encode(positions, day)
+        if data is None:
+            return
+        for viewer in list(self.viewers):
+            backlog = viewer.writer.transport.get_write_buffer_size()
+            if backlog > DROP_BUFFER:
+                self._drop(viewer)
+            elif backlog > self.max_buffer or (not keyframe and viewer.key_frame != self.encoder.key_frame):
+                viewer.skipped += 1
+            else:
+                viewer.writer.write(data)
+                viewer.sent += 1
+                self.bytes_out += len(data)
+                if keyframe:
+                    viewer.key_frame = self.encoder.key_frame
+
+    def _send_all(self, data):
+        for viewer in self.viewers:
+            viewer.writer.write(data)
+            self.bytes_out += len(data)
+
+    def stats(self):
+        return {
+            "viewers": len(self.viewers),
+            "frames": self.encoder.frame,
+            "bytes_out": self.bytes_out,
+            "skipped": sum(v.skipped for v in self.viewers),
+        }
+
+
+# ==== Thin viewer ====
+VIEWER_FRAME_SECONDS = 0.015
+RECONNECT_SECONDS = 1.0
+
+
+class StreamViewer:
+    """A Tk window drawing what a StreamServer sends: discs, names and the selection"""
+
+    def __init__(self, host="127.0.0.1", port=8766, width=1400, height=900):
+        import tkinter as tk
+        from camera import Camera
+
+        self.host = host
+        self.port = port
+        self.root = tk.Tk()
+        self.root.title(f"🌌 Solar System — {host}:{port}")
+        self.root.protocol("WM_DELETE_WINDOW", self.stop)
+        self.canvas = tk.Canvas(self.root, width=width, height=height, bg="black", highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.half = (width / 2, height / 2)
+        # Turtle-style coordinates: origin in the middle, canvas y = -world y
+        self.canvas.configure(scrollregion=(-width / 2, -height / 2, width / 2, height / 2))
+        self.camera = Camera()
+        self.decoder = FrameDecoder()
+        self.running = True
+        self.items = []
+        self.labels = None
+        self.sun = self.canvas.create_oval(-20, -20, 20, 20, fill="yellow", outline="")
+        self.info = self.canvas.create_text(0, -height / 2 + 20, anchor="n", fill="white",
+                                            font=("Arial", 12, "normal"), justify="center")
+        self._scene = None
+        self._state = None
+        self._shown = np.zeros(0, dtype=bool)
+
+    def stop(self):
+        self.running = False
+
+    def _build(self, scene):
+        from labels import LabelLayer
+
+        for item in self.items:
+            self.canvas.delete(item)
+        if self.labels is not None:
+            for item in self.labels.items:
+                if item is not None:
+                    self.canvas.delete(item)
+        self.items = [self.canvas.create_oval(0, 0, 0, 0, fill=color, outline="", state="hidden")
+                      for color in scene.get("colors", [])]
+        self.radii = np.asarray(scene.get("radii", [3.0] * len(self.items)), dtype=float)
+        self.labels = LabelLayer(self.canvas, scene.get("labels", [None] * len(self.items)), dy=25)
+        self._shown = np.zeros(len(self.items), dtype=bool)
+        self._scene = scene
+
+    def _show_state(self, state):
+        # The app sends its camera as it glides, so the view is simply copied
+        self.camera.zoom = self.camera.target_zoom = state.get("zoom", self.camera.zoom)
+        self.camera.center[:] = state.get("center", self.camera.center)
+        info = state.get("info")
+        lines = []
+        if info:
+            lines = [f"🌌 {info['name']}", f"{info.get('type', '')} · {info.get('diameter', '')}",
+                     info.get("description", "")]
+        elif state.get("selected"):
+            lines = [f"🌌 {state['selected']}"]
+        if not state.get("running", True):
+            lines.append("⏸️ Paused")
+        self.canvas.itemconfigure(self.info, text="\n".join(lines))
+        self._state = state
+
+    def draw(self):
+        """Draw the newest decoded frame"""
+        d = self.decoder
+        if d.scene is not self._scene:
+            self._build(d.scene)
+        if d.state is not self._state:
+            self._show_state(d.state)
+        x, y = self.camera.to_screen((0.0, 0.0))
+        self.canvas.coords(self.sun, x - 20, -y - 20, x + 20, -y + 20)
+        if d.positions is None or len(d.positions) != len(self.items):
+            return
+        from viewport import visible_mask
+
+        screen = self.camera.to_screen(d.positions)
+        visible = visible_mask(screen, self.radii, *self.half)
+        for i in np.flatnonzero(visible != self._shown):
+            self.canvas.itemconfigure(self.items[i], state="normal" if visible[i] else "hidden")
+        for i in np.flatnonzero(visible):
+            (x, y), r = screen[i], self.radii[i]
+            self.canvas.coords(self.items[i], x - r, -y - r, x + r, -y + r)
+        self._shown = visible
+        self.labels.update(screen, shown=visible)
+
+    async def _receive(self):
+        while self.running:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            except OSError:
+                await asyncio.sleep(RECONNECT_SECONDS)
+                continue
+            try:
+                if await reader.readexactly(len(MAGIC)) != MAGIC:
+                    raise ValueError("not a solar system stream")
+                while self.running:
+                    self.decoder.apply(*await read_message(reader))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                await asyncio.sleep(RECONNECT_SECONDS)     # the app went away; wait for it
+            finally:
+                writer.close()
+
+    async def run(self):
+        """Receive in the background and redraw until the window closes"""
+        import tkinter as tk
+
+        receiver = asyncio.get_running_loop().create_task(self._receive())
+        try:
+            while self.running and not receiver.done():
+                self.draw()
+                try:
+                    self.root.update()
+                except tk.TclError:
+                    break
+                await asyncio.sleep(VIEWER_FRAME_SECONDS)
+        finally:
+            self.running = False
+            receiver.cancel()
+            try:
+                self.root.destroy()
+            except tk.TclError:
+                pass
+        if receiver.done() and not receiver.cancelled() and receiver.exception():
+            raise receiver.exception()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mirror a running solar system (started with --stream-port)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--width", type=int, default=1400)
+    parser.add_argument("--height", type=int, default=900)
+    args = parser.parse_args()
+    asyncio.run(StreamViewer(args.host, args.port, args.width, args.height).run())
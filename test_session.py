@@ -0,0 +1,44 @@
+# =====================================================================
+# 🧪 SESSION REPLAY TESTS
+# =====================================================================
+# A recorded session has to replay bit for bit, including the inputs
+# whose live handlers do more than the replay handlers (the Kepler
+# toggle also rebuilds the ephemeris).
+#
+#   python -m pytest -q test_session.py
+# =====================================================================
+
+import numpy as np
+
+import solarSystem1 as app
+from orbit_engine import OrbitEngine
+from session import EventLog, engine_handlers, positions_digest, read_log, replay
+from solar_data import SOLAR_BODIES, planet_info
+
+
+def test_replay_matches_after_kepler_toggle(tmp_path, monkeypatch):
+    engine = OrbitEngine.from_specs(SOLAR_BODIES, info=planet_info)
+    monkeypatch.setattr(app, "engine", engine)
+    path = str(tmp_path / "run.jsonl")
+    log = EventLog(path, {"bodies": engine.count})
+    try:
+        for frame in range(90):
+            steps = 1 + frame % 3
+            for _ in range(steps):
+                engine.step()
+            log.frame(steps)
+            if frame in (30, 60):
+                # What toggle_orbit_mode() does to the engine
+                on = not engine.kepler.any()
+                log.event(engine.time, "kepler", on=on)
+                engine.set_kepler(on)
+                app.rebuild_ephemeris()
+        log.close(engine.time, engine.positions)
+    finally:
+        app.remove_ephemeris()
+
+    header, records = read_log(path)
+    replayed = OrbitEngine.from_specs(SOLAR_BODIES, info=planet_info)
+    assert replay(replayed, records, engine_handlers(replayed)) == 90
+    assert np.array_equal(replayed.angle, engine.angle)
+    assert positions_digest(replayed.positions) == records[-1]["digest"]
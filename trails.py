@@ -0,0 +1,129 @@
+# =====================================================================
+# 🌀 ORBIT TRAILS
+# =====================================================================
+# Bounded orbit trails for the solar system app.
+#
+# A pen-down turtle adds a new canvas line segment every frame and never
+# removes one, so the canvas keeps growing for as long as the app runs.
+# Here every body keeps its last N positions in a fixed-size ring
+# buffer, and owns exactly ONE canvas line item whose coordinates are
+# replaced from that buffer each frame. Memory and redraw cost stay flat
+# no matter how long the session lasts.
+#
+# Trail length can be given in points or in seconds of animation.
+# Points are stored in world coordinates and projected through the
+# camera at draw time, so zooming never invalidates a trail.
+# =====================================================================
+
+import numpy as np
+
+from viewport import trail_mask
+
+# One animation tick, matching the app's 15 ms frame task
+TICK_MS = 15
+
+
+def points_for_seconds(seconds, tick_ms=TICK_MS):
+    """Number of trail points that covers the given seconds of animation"""
+    return max(2, int(round(seconds * 1000.0 / tick_ms)))
+
+
+class TrailBuffer:
+    """Fixed-size ring buffer holding the recent positions of many bodies"""
+
+    def __init__(self, bodies, max_points):
+        self.max_points = max(2, int(max_points))
+        self.points = np.zeros((bodies, self.max_points, 2))
+        self.head = 0          # slot the next push writes to
+        self.filled = 0        # how many slots hold real points
+
+    def push(self, positions):
+        """Record one position per body"""
+        self.points[:, self.head] = positions
+        self.head = (self.head + 1) % self.max_points
+        self.filled = min(self.filled + 1, self.max_points)
+
+    def ordered(self):
+        """All trails as a (bodies, filled, 2) array, oldest point first"""
+        start = (self.head - self.filled) % self.max_points
+        order = (start + np.arange(self.filled)) % self.max_points
+        return self.points[:, order]
+
+    def clear(self, index=None, position=None):
+        """Forget every trail, or collapse one body's trail onto a point"""
+        if index is None:
+            self.head = 0
+            self.filled = 0
+        else:
+            self.points[index] = position if position is not None else self.points[index, self.head - 1]
+
+
+class CanvasTrails:
+    """One reusable Tk canvas line per body, redrawn from a TrailBuffer"""
+
+    def __init__(self, canvas, colors, max_points=None, seconds=None, width=1, tick_ms=TICK_MS):
+        if max_points is None:
+            max_points = points_for_seconds(seconds if seconds is not None else 4.0, tick_ms)
+        self.canvas = canvas
+        self.colors = list(colors)
+        self.width = width
+        self.buffer = TrailBuffer(len(self.colors), max_points)
+        self.items = [None] * len(self.colors)
+        self.visible = True
+        self._shown = np.ones(len(self.colors), dtype=bool)
+
+    def _item(self, i):
+        # Lines are created on first use and then only ever re-coordinated
+        if self.items[i] is None and self.colors[i]:
+            self.items[i] = self.canvas.create_line(0, 0, 0, 0, fill=self.colors[i], width=self.width)
+        return self.items[i]
+
+    def push(self, positions):
+        """Record this frame's world positions"""
+        self.buffer.push(positions)
+
+    def draw(self, camera=None, viewport=None):
+        """Redraw the trail lines, projecting world points through the camera
+
+        viewport=(half_width, half_height) skips trails that lie entirely
+        off screen; their lines are hidden rather than re-coordinated.
+        """
+        if not self.visible or self.buffer.filled < 2:
+            return
+
+        trails = self.buffer.ordered()
+        if camera is not None:
+            trails = camera.to_screen(trails)
+        shown = np.ones(len(self.colors), dtype=bool) if viewport is None else trail_mask(trails, *viewport)
+        for i in np.flatnonzero(shown != self._shown):
+            if self.items[i] is not None:
+                self.canvas.itemconfigure(self.items[i], state="normal" if shown[i] else "hidden")
+        self._shown = shown
+
+        # Turtle coordinates have y pointing up; the canvas has y pointing down
+        trails[:, :, 1] *= -1
+        flat = trails.reshape(len(self.colors), -1)
+        for i in np.flatnonzero(shown):
+            item = self._item(i)
+            if item is not None:
+                self.canvas.coords(item, flat[i].tolist())
+
+    def update(self, positions, camera=None):
+        """Push this frame's positions and redraw"""
+        self.push(positions)
+        self.draw(camera)
+
+    def clear(self, index=None, position=None):
+        """Drop trail history (all bodies, or just one) without deleting items"""
+        self.buffer.clear(index, position)
+        if index is None:
+            for item in self.items:
+                if item is not None:
+                    self.canvas.coords(item, 0, 0, 0, 0)
+
+    def set_visible(self, visible):
+        """Show or hide every trail line"""
+        self.visible = visible
+        for item, shown in zip(self.items, self._shown):
+            if item is not None:
+                self.canvas.itemconfigure(item, state="normal" if visible and shown else "hidden")
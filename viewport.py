@@ -0,0 +1,82 @@
+# =====================================================================
+# 🔭 VIEWPORT CULLING & LEVEL OF DETAIL
+# =====================================================================
+# Per-frame decisions about what is worth drawing.
+#
+#   • visible_mask   — bodies whose drawn disc touches the window
+#   • trail_mask     — trails whose bounding box touches the window
+#   • dot_mask       — bodies that should drop to a cheap dot (zoomed
+#                      far out, or squeezed against their parent)
+#   • declutter      — hide labels that would overlap, giving bigger
+#                      bodies priority
+#
+# The masks work on whole NumPy arrays, so deciding is cheap and the
+# renderer only spends time on what is actually on screen.
+# =====================================================================
+
+import numpy as np
+
+
+def visible_mask(screen_positions, radii, half_width, half_height, margin=0.0):
+    """True for bodies whose drawn disc overlaps the window"""
+    pos = np.asarray(screen_positions)
+    reach = np.asarray(radii) + margin
+    return (np.abs(pos[:, 0]) <= half_width + reach) & (np.abs(pos[:, 1]) <= half_height + reach)
+
+
+def trail_mask(screen_trails, half_width, half_height):
+    """True for trails ((bodies, points, 2) screen array) whose bounding box overlaps the window"""
+    if screen_trails.shape[1] == 0:
+        return np.zeros(len(screen_trails), dtype=bool)
+    lo = screen_trails.min(axis=1)
+    hi = screen_trails.max(axis=1)
+    return ((hi[:, 0] >= -half_width) & (lo[:, 0] <= half_width)
+            & (hi[:, 1] >= -half_height) & (lo[:, 1] <= half_height))
+
+
+def dot_mask(screen_positions, radii, parent, zoom, dot_zoom=0.45):
+    """True for bodies that should be drawn as plain dots instead of images"""
+    far = np.full(len(radii), zoom < dot_zoom)
+    # A satellite whose parent is closer than its own size gets a dot too
+    parent = np.asarray(parent)
+    moons = np.flatnonzero(parent >= 0)
+    if len(moons):
+        gap = np.hypot(*(screen_positions[moons] - screen_positions[parent[moons]]).T)
+        far[moons] |= gap < np.asarray(radii)[moons] + np.asarray(radii)[parent[moons]]
+    return far
+
+
+def declutter(screen_positions, priority, shown, box=(60.0, 22.0), max_labels=300):
+    """Pick labels that do not overlap, highest priority first
+
+    Two labels clash when their centres are closer than one box in both
+    x and y. At most max_labels are placed; beyond that a screen full of
+    text is unreadable anyway, and the cap bounds the cost per frame.
+    """
+    shown = np.asarray(shown, dtype=bool)
+    keep = np.zeros(len(shown), dtype=bool)
+    candidates = np.flatnonzero(shown)
+    if not len(candidates):
+        return keep
+    candidates = candidates[np.argsort(-np.asarray(priority)[candidates], kind="stable")]
+
+    w, h = box
+    placed = {}     # grid cell -> centres of labels already placed there
+    kept = 0
+    for i, (x, y) in zip(candidates.tolist(), screen_positions[candidates].tolist()):
+        cx, cy = int(x // w), int(y // h)
+        clash = False
+        for gx in (cx - 1, cx, cx + 1):
+            for gy in (cy - 1, cy, cy + 1):
+                for px, py in placed.get((gx, gy), ()):
+                    if abs(px - x) < w and abs(py - y) < h:
+                        clash = True
+                        break
+        if clash:
+            continue
+        placed.setdefault((cx, cy), []).append((x, y))
+        keep[i] = True
+        kept += 1
+        if kept >= max_labels:
+            break
+    return keep